@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QAction, QColor, QPalette
+from PySide6.QtGui import QAction
 
 
 try:
@@ -23,12 +23,18 @@ try:
     from gui_layer.src.login_dialog import LoginDialog
     from gui_layer.src.side_edit_panel import SideEditPanel
     from gui_layer.src.sync_handler import run_sync_with_timeout
+    from gui_layer.src.theme import ThemeEngine, contrast_color
+    from local_db_layer.repository import close_repositories
+    from local_db_layer.setup_db import setup_database
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     from gui_layer.src.question_panel import InspectionPanel
     from gui_layer.src.login_dialog import LoginDialog
     from gui_layer.src.side_edit_panel import SideEditPanel
     from gui_layer.src.sync_handler import run_sync_with_timeout
+    from gui_layer.src.theme import ThemeEngine, contrast_color
+    from local_db_layer.repository import close_repositories
+    from local_db_layer.setup_db import setup_database
 
 
 class Settings:
@@ -39,33 +45,29 @@ class Settings:
     def __init__(self):
         self.contrast = 100  # Default contrast level (100%)
         self.font_size = 12
+        self.theme = ThemeEngine()
 
-    def apply_settings(self, widget):
+    def apply_settings(self):
         """
-        Apply the settings to a widget and its children recursively.
-        :param widget: QWidget or QMainWindow to apply settings to.
+        Apply the settings to the application, so every window inherits
+        them, dialogs and message boxes included.
         """
-        font = widget.font()
-        font.setPointSize(self.font_size)
-        widget.setFont(font)
-
-        palette = widget.palette()
-        palette.setColor(widget.backgroundRole(), self.get_contrast_color())
-        widget.setPalette(palette)
+        self.theme.apply(
+            QApplication.instance(), self.font_size, self.contrast
+        )
 
-        for child in widget.findChildren(QWidget):
-            self.apply_settings(child)
+    def schedule_apply(self):
+        """
+        Apply the settings to the application at the next frame, once
+        however many times the settings change until then.
+        """
+        self.theme.schedule(
+            QApplication.instance(), self.font_size, self.contrast
+        )
 
     def get_contrast_color(self):
         """Adjust the contrast color based on the contrast setting."""
-        if self.contrast >= 100:
-            # For contrast values >= 100, the color becomes brighter, whiter
-            brightness = int(255 * (self.contrast / 150))  # Scale max to 150%
-        else:
-            # For contrast values < 100, the color becomes darker, more black
-            brightness = int(255 * (self.contrast / 100))
-        color = QColor(brightness, brightness, brightness)
-        return color
+        return contrast_color(self.contrast)
 
 
 class ContrastDialog(QDialog):
@@ -91,9 +93,9 @@ class ContrastDialog(QDialog):
         layout.addWidget(self.contrast_slider)
 
     def update_contrast(self, value):
-        """Update the contrast setting."""
+        """Update the contrast setting, applied once per frame."""
         self.settings.contrast = value
-        self.settings.apply_settings(self.parent())
+        self.settings.schedule_apply()
 
 
 class FontSizeDialog(QDialog):
@@ -122,7 +124,7 @@ class FontSizeDialog(QDialog):
     def update_font_size(self, value):
         """Update the font size setting."""
         self.settings.font_size = int(value.split(" ")[0])
-        self.settings.apply_settings(self.parent())
+        self.settings.schedule_apply()
 
 
 class MainWindow(QMainWindow):
@@ -203,13 +205,13 @@ class MainWindow(QMainWindow):
 
         # Connect signal to refresh InspectionPanel when a site is changed
         self.side_edit_panel.site_changed.connect(
-            self.inspection_panel.load_sides
+            self.inspection_panel.on_site_changed
         )
 
         # Logout functionality
         self.logout_button.clicked.connect(self.logout)
         # Apply initial settings
-        self.settings.apply_settings(self)
+        self.settings.apply_settings()
 
     def trigger_sync(self):
         """
@@ -280,7 +282,10 @@ class MainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
+    # Creates or upgrades the local DB; a no-op once the schema is current
+    setup_database()
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_repositories)
     settings = Settings()
     window = MainWindow(settings)
     window.show()
@@ -0,0 +1,160 @@
+"""
+Cost of applying the settings to a large widget tree.
+
+Builds a synthetic tree of labels, buttons and inputs, then times
+applying a font size and contrast the way
+:meth:`~gui_layer.src.app.Settings.apply_settings` used to (every widget
+restyled, recursing into each child's descendants again) and through the
+:class:`~gui_layer.src.theme.ThemeEngine`. Also counts the applications
+caused by dragging the contrast slider over its whole range:
+
+    QT_QPA_PLATFORM=offscreen python gui_layer/src/benchmark.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+from PySide6.QtWidgets import (
+    QApplication,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+try:
+    from gui_layer.src.theme import FRAME_INTERVAL, ThemeEngine, contrast_color
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from gui_layer.src.theme import FRAME_INTERVAL, ThemeEngine, contrast_color
+
+
+def build_tree(depth, breadth):
+    """
+    Build a widget tree.
+
+    :param depth: Levels of container widgets below the root
+    :param breadth: Containers per container; each container also holds
+                    a label, a button and an input
+    :return: Tuple of the root QWidget and the number of widgets
+    """
+    root = QWidget()
+    count = 1
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            layout = QVBoxLayout(parent)
+            for leaf in (QLabel("Question?"), QPushButton("OK"), QLineEdit()):
+                layout.addWidget(leaf)
+            for _ in range(breadth):
+                child = QWidget()
+                layout.addWidget(child)
+                next_level.append(child)
+            count += 3 + breadth
+        level = next_level
+    return root, count
+
+
+def legacy_apply(widget, font_size, contrast):
+    """The former Settings.apply_settings, for comparison."""
+    font = widget.font()
+    font.setPointSize(font_size)
+    widget.setFont(font)
+
+    palette = widget.palette()
+    palette.setColor(widget.backgroundRole(), contrast_color(contrast))
+    widget.setPalette(palette)
+
+    for child in widget.findChildren(QWidget):
+        legacy_apply(child, font_size, contrast)
+
+
+def _time(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _wait(milliseconds):
+    loop = QEventLoop()
+    QTimer.singleShot(milliseconds, loop.quit)
+    loop.exec()
+
+
+def count_slider_applies(root, values=range(50, 151)):
+    """
+    Count the themes applied while a slider sweeps its range, one value
+    per millisecond.
+
+    :param root: Widget themed
+    :param values: Contrast values set in turn
+    :return: Tuple of the number of values and of applications
+    """
+    engine = ThemeEngine()
+    applied = []
+    apply = engine.apply
+    engine.apply = lambda *args: applied.append(apply(*args))
+    for value in values:
+        engine.schedule(root, 12, value)
+        _wait(1)
+    _wait(FRAME_INTERVAL * 2)
+    return len(values), len(applied)
+
+
+def run_benchmark(depth=3, breadth=5):
+    """
+    Time both ways of applying the settings.
+
+    :param depth: Depth of the widget tree
+    :param breadth: Containers per container
+    :return: Dict of results
+    """
+    engine = ThemeEngine()
+    engine.palette(100)  # Sets the style up, outside of the timings
+
+    root, widgets = build_tree(depth, breadth)
+    legacy = _time(legacy_apply, root, 14, 120)
+
+    root, _ = build_tree(depth, breadth)
+    first = _time(engine.apply, root, 14, 120)
+    cached = _time(engine.apply, root, 16, 120)
+
+    values, applies = count_slider_applies(root)
+    return {
+        "widgets": widgets,
+        "legacy_seconds": legacy,
+        "engine_seconds": first,
+        "engine_cached_seconds": cached,
+        "slider_values": values,
+        "slider_applies": applies,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--depth", type=int, default=3, help="Depth of the widget tree."
+    )
+    parser.add_argument(
+        "--breadth", type=int, default=5, help="Containers per container."
+    )
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QApplication(sys.argv)
+    result = run_benchmark(args.depth, args.breadth)
+    print(f"{result['widgets']} widgets")
+    print(f"legacy apply:        {result['legacy_seconds'] * 1000:10.1f} ms")
+    print(f"theme engine:        {result['engine_seconds'] * 1000:10.1f} ms")
+    print(
+        f"theme engine cached: "
+        f"{result['engine_cached_seconds'] * 1000:10.1f} ms"
+    )
+    print(
+        f"slider sweep: {result['slider_values']} values, "
+        f"{result['slider_applies']} applications"
+    )
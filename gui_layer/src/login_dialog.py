@@ -1,3 +1,6 @@
+import os
+import sys
+
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -6,7 +9,12 @@ from PySide6.QtWidgets import (
     QPushButton,
     QMessageBox,
 )
-import sqlite3
+
+try:
+    from local_db_layer.repository import get_repository
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.repository import get_repository
 
 
 class LoginDialog(QDialog):
@@ -14,8 +22,9 @@ class LoginDialog(QDialog):
     Login dialog to authenticate admin users.
     """
 
-    def __init__(self):
+    def __init__(self, repository=None):
         super().__init__()
+        self.repository = repository or get_repository()
         self.setWindowTitle("Admin Login")
         self.setGeometry(300, 300, 300, 150)
 
@@ -45,16 +54,7 @@ class LoginDialog(QDialog):
         username = self.username_input.text()
         password = self.password_input.text()
 
-        conn = sqlite3.connect("inspection_data.db")
-        c = conn.cursor()
-        c.execute(
-            "SELECT * FROM users WHERE username=? AND password=?",
-            (username, password),
-        )
-        result = c.fetchone()
-        conn.close()
-
-        if result:
+        if self.repository.check_credentials(username, password):
             self.accept()  # Close dialog and return success
         else:
             QMessageBox.warning(
@@ -1,5 +1,6 @@
-import sqlite3
+import os
 import sys
+from PySide6.QtCore import QSignalBlocker
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
@@ -10,6 +11,14 @@ from PySide6.QtWidgets import (
     QFormLayout,
 )
 
+try:
+    from local_db_layer.question_catalog import QuestionCatalog
+    from local_db_layer.repository import get_repository
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.question_catalog import QuestionCatalog
+    from local_db_layer.repository import get_repository
+
 
 class InspectionPanel(QWidget):
     """
@@ -21,7 +30,9 @@ class InspectionPanel(QWidget):
     layout : QVBoxLayout
         Main layout of the panel.
     side_dropdown : QComboBox
-        Dropdown to select the inspection side.
+        Dropdown to select the inspection side, with side ids as item data.
+    catalog : QuestionCatalog
+        Sides and their questions, held in memory.
     form_layout : QFormLayout
         Layout to display the questions dynamically.
     question_labels : list
@@ -30,9 +41,16 @@ class InspectionPanel(QWidget):
         List of QLineEdit widgets for answers.
     """
 
-    def __init__(self):
-        """Initialize the inspection panel."""
+    def __init__(self, repository=None):
+        """
+        Initialize the inspection panel.
+
+        :param repository: :class:`~local_db_layer.repository.LocalRepository`
+                           to read from, the shared default one if not given
+        """
         super().__init__()
+        self.repository = repository or get_repository()
+        self.catalog = QuestionCatalog(self.repository)
         self.setWindowTitle("Inspection Panel")
         self.setGeometry(100, 100, 400, 300)
 
@@ -60,61 +78,82 @@ class InspectionPanel(QWidget):
         Load available inspection sides from the SQLite database into
         the dropdown.
 
-        This method fetches side names from the 'sides' table and adds
-        them as items in the dropdown. Clears the dropdown first to
-        avoid duplications.
+        This method reloads the question catalog, which fetches every side
+        with its questions in one query, and adds the sides as items in
+        the dropdown.
         """
-        conn = sqlite3.connect("inspection_data.db")
-        c = conn.cursor()
+        self.catalog.load()
+        self.fill_dropdown()
 
-        # Clear the dropdown first to avoid duplicates
-        self.side_dropdown.clear()
-        self.side_dropdown.addItem("Select Side")
+    def on_site_changed(self, side_id):
+        """
+        Reload a side that was added, edited or deleted.
 
-        c.execute("SELECT side_name FROM sides")
-        sides = c.fetchall()
-        conn.close()
+        Only the dropdown item of that side is inserted, renamed or
+        removed, so the current selection and the answers typed for it
+        are kept, unless it is the side deleted.
 
-        for side in sides:
-            self.side_dropdown.addItem(side[0])
+        :param side_id: Id of the side
+        """
+        self.catalog.invalidate(side_id)
+        side_name = self.catalog.side_name(side_id)
+        index = self.side_dropdown.findData(side_id)
+
+        if side_name is None:
+            if index == -1:
+                return
+            if index == self.side_dropdown.currentIndex():
+                # The selected side is gone, back to "Select Side"
+                self.side_dropdown.setCurrentIndex(0)
+                self.clear_questions()
+            with QSignalBlocker(self.side_dropdown):
+                self.side_dropdown.removeItem(index)
+        elif index != -1:
+            self.side_dropdown.setItemText(index, side_name)
+        else:
+            # Keep the sides in id order, as fill_dropdown lists them
+            index = self.side_dropdown.count()
+            for i in range(1, self.side_dropdown.count()):
+                if self.side_dropdown.itemData(i) > side_id:
+                    index = i
+                    break
+            with QSignalBlocker(self.side_dropdown):
+                self.side_dropdown.insertItem(index, side_name, side_id)
+
+    def fill_dropdown(self):
+        """
+        Show the sides of the catalog in the dropdown. Clears the dropdown
+        first to avoid duplications.
+        """
+        self.side_dropdown.clear()
+        self.side_dropdown.addItem("Select Side")
+        for side_id, side_name in self.catalog.sides():
+            self.side_dropdown.addItem(side_name, side_id)
 
     def update_questions(self):
         """
         Update the panel with dynamic questions based on the selected side.
 
-        This method fetches the questions from the database for the
-        selected side and adds corresponding fields to the form layout.
+        This method takes the questions of the selected side from the
+        catalog, without touching the database, and adds corresponding
+        fields to the form layout.
         """
-        side_name = self.side_dropdown.currentText()
-
-        if side_name != "Select Side":
-            conn = sqlite3.connect("inspection_data.db")
-            c = conn.cursor()
+        side_id = self.side_dropdown.currentData()
 
-            # Fetch side_id
-            c.execute("SELECT id FROM sides WHERE side_name=?", (side_name,))
-            side_data = c.fetchone()
-
-            if side_data is None:
+        if side_id is not None:
+            if self.catalog.side_name(side_id) is None:
                 # Handle case where the side no longer exists
                 self.clear_questions()
                 return
 
-            side_id = side_data[0]
-
-            # Fetch questions for this side
-            c.execute(
-                "SELECT question FROM questions WHERE side_id=?", (side_id,)
-            )
-            questions = c.fetchall()
-            conn.close()
+            questions = self.catalog.questions(side_id)
 
             # Clear previous questions and answers
             self.clear_questions()
 
             # Dynamically add new questions
             for question in questions:
-                label = QLabel(question[0])
+                label = QLabel(question)
                 answer_field = QLineEdit()
 
                 self.form_layout.addRow(label, answer_field)
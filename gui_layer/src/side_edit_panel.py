@@ -1,35 +1,56 @@
-from PySide6.QtCore import Signal
+import os
+import sys
+
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QWidget,
     QVBoxLayout,
     QLineEdit,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHBoxLayout,
+    QHeaderView,
     QInputDialog,
 )
-import sqlite3
+
+try:
+    from gui_layer.src.side_table_model import SideTableModel
+    from local_db_layer.repository import get_repository
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from gui_layer.src.side_table_model import SideTableModel
+    from local_db_layer.repository import get_repository
+
+# Milliseconds of typing pause before the search runs
+SEARCH_DELAY = 150
 
 
 class SideEditPanel(QWidget):
     """
     Panel for adding, editing, and deleting sides in the SQLite database.
 
-    This panel provides a table view of all sides and allows the user
-    to search, add, edit, and delete sides.
+    This panel provides a table view of all sides, loaded page by page as
+    it is scrolled, and allows the user to search, add, edit, and delete
+    sides.
 
     Signals
     -------
-    site_changed : Signal
-        Emitted when a site is added, edited, or deleted.
+    site_changed : Signal(int)
+        Emitted with the side id when a site is added, edited, or deleted.
     """
 
-    site_changed = Signal()  # Signal to notify when a site is modified
+    site_changed = Signal(int)  # Signal to notify when a site is modified
+
+    def __init__(self, repository=None):
+        """
+        Initialize the SideEditPanel.
 
-    def __init__(self):
-        """Initialize the SideEditPanel."""
+        :param repository: :class:`~local_db_layer.repository.LocalRepository`
+                           to edit, the shared default one if not given
+        """
         super().__init__()
+        self.repository = repository or get_repository()
         self.setWindowTitle("Side Edit Panel")
         self.setGeometry(100, 100, 600, 400)
 
@@ -39,13 +60,24 @@ class SideEditPanel(QWidget):
         # Search bar
         self.search_bar = QLineEdit(self)
         self.search_bar.setPlaceholderText("Search for a side...")
-        self.search_bar.textChanged.connect(self.search_sides)
         self.layout.addWidget(self.search_bar)
 
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.search_sides)
+        self.search_bar.textChanged.connect(self.search_timer.start)
+
         # Table for displaying sides
-        self.sides_table = QTableWidget(self)
-        self.sides_table.setColumnCount(1)
-        self.sides_table.setHorizontalHeaderLabels(["Side Name"])
+        self.sides_model = SideTableModel(self.repository, self)
+        self.sides_table = QTableView(self)
+        self.sides_table.setModel(self.sides_model)
+        self.sides_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.sides_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.sides_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
         self.layout.addWidget(self.sides_table)
 
         # Buttons to add, edit, and delete sides
@@ -71,24 +103,19 @@ class SideEditPanel(QWidget):
         self.load_sides()
 
     def load_sides(self):
-        """Load all sides from the database and display them in the table."""
-        conn = sqlite3.connect("inspection_data.db")
-        c = conn.cursor()
-        c.execute("SELECT side_name FROM sides")
-        sides = c.fetchall()
-        conn.close()
-
-        self.sides_table.setRowCount(0)  # Clear the table
-        for row, side in enumerate(sides):
-            self.sides_table.insertRow(row)
-            self.sides_table.setItem(row, 0, QTableWidgetItem(side[0]))
+        """
+        Reload the sides from the database; only the first page is
+        fetched until the table is scrolled.
+        """
+        self.sides_model.reload(self.search_bar.text())
 
     def search_sides(self):
-        """Filter sides in the table based on the search query."""
-        query = self.search_bar.text().lower()
-        for row in range(self.sides_table.rowCount()):
-            side_name = self.sides_table.item(row, 0).text().lower()
-            self.sides_table.setRowHidden(row, query not in side_name)
+        """
+        Filter sides in the table based on the search query: sides whose
+        name or one of whose questions contains it.
+        """
+        self.search_timer.stop()
+        self.load_sides()
 
     def add_side(self):
         """Open a dialog to add a new side."""
@@ -96,51 +123,38 @@ class SideEditPanel(QWidget):
             self, "Add Side", "Enter side name:"
         )
         if ok and side_name:
-            conn = sqlite3.connect("inspection_data.db")
-            c = conn.cursor()
-            c.execute("INSERT INTO sides (side_name) VALUES (?)", (side_name,))
-            conn.commit()
-            conn.close()
-            self.load_sides()  # Reload sides after adding
-            self.site_changed.emit()  # Emit the signal
+            side_id = self.repository.add_side(side_name)
+            self.sides_model.side_added(side_id, side_name)
+            self.site_changed.emit(side_id)  # Emit the signal
 
     def edit_side(self):
         """Edit the currently selected side."""
-        current_row = self.sides_table.currentRow()
+        current_row = self.sides_table.currentIndex().row()
         if current_row == -1:
             return  # No side selected
 
-        side_name = self.sides_table.item(current_row, 0).text()
+        side_id = self.sides_model.side_id(current_row)
+        side_name = self.sides_model.side_name(current_row)
         new_name, ok = QInputDialog.getText(
             self, "Edit Side", "Edit side name:", text=side_name
         )
         if ok and new_name:
-            conn = sqlite3.connect("inspection_data.db")
-            c = conn.cursor()
-            c.execute(
-                "UPDATE sides SET side_name=? WHERE side_name=?",
-                (new_name, side_name),
-            )
-            conn.commit()
-            conn.close()
-            self.load_sides()  # Reload sides after editing
-            self.site_changed.emit()  # Emit the signal
+            self.repository.rename_side(side_id, new_name)
+            self.sides_model.side_renamed(side_id, new_name)
+            self.site_changed.emit(side_id)  # Emit the signal
 
     def delete_side(self):
         """Delete the currently selected side."""
-        current_row = self.sides_table.currentRow()
+        current_row = self.sides_table.currentIndex().row()
         if current_row == -1:
             return  # No side selected
 
-        side_name = self.sides_table.item(current_row, 0).text()
+        side_id = self.sides_model.side_id(current_row)
+        side_name = self.sides_model.side_name(current_row)
         confirm, ok = QInputDialog.getText(
             self, "Delete Side", f"Delete side: {side_name}? (yes/no)"
         )
         if ok and confirm.lower() == "yes":
-            conn = sqlite3.connect("inspection_data.db")
-            c = conn.cursor()
-            c.execute("DELETE FROM sides WHERE side_name=?", (side_name,))
-            conn.commit()
-            conn.close()
-            self.load_sides()  # Reload sides after deleting
-            self.site_changed.emit()  # Emit the signal
+            self.repository.delete_side(side_id)
+            self.sides_model.side_deleted(side_id)
+            self.site_changed.emit(side_id)  # Emit the signal
@@ -0,0 +1,174 @@
+"""
+Table model of the sides, fetched page by page.
+"""
+
+import bisect
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# Sides fetched from the database at a time
+PAGE_SIZE = 200
+
+
+class SideTableModel(QAbstractTableModel):
+    """
+    Sides of the local database, in id order, optionally filtered by a
+    search text.
+
+    Only the pages the view scrolls to are fetched (see
+    :meth:`canFetchMore` and :meth:`fetchMore`), each with a keyset query
+    starting after the last side loaded. A search first looks up the ids
+    of the matching sides in the search index; pages then load the names
+    of the next ids. Edits made through the panel are applied to the
+    affected row only.
+
+    The side id of a row is available under ``Qt.UserRole``.
+    """
+
+    def __init__(self, repository, parent=None):
+        """
+        :param repository: :class:`~local_db_layer.repository.LocalRepository`
+                           to read from
+        :param parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.repository = repository
+        self.pattern = None
+        self._ids = []  # Sorted, so rows are found by bisection
+        self._names = []
+        self._has_more = True  # Nothing is fetched until asked for
+        self._matches = []  # Ids found by the search, not loaded yet
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._names[index.row()]
+        if role == Qt.UserRole:
+            return self._ids[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return "Side Name"
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self.pattern:
+            side_ids = self._matches[:PAGE_SIZE]
+            del self._matches[:PAGE_SIZE]
+            page = self.repository.sides_by_id(side_ids)
+            self._has_more = bool(self._matches)
+        else:
+            after_id = self._ids[-1] if self._ids else 0
+            page = self.repository.side_page(after_id, PAGE_SIZE)
+            self._has_more = len(page) == PAGE_SIZE
+        if not page:
+            return
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        for side_id, side_name in page:
+            self._ids.append(side_id)
+            self._names.append(side_name)
+        self.endInsertRows()
+
+    def reload(self, pattern=None):
+        """
+        Drop the rows loaded and fetch the first page again.
+
+        :param pattern: Only show sides whose name or questions contain
+                        this text
+        """
+        self.beginResetModel()
+        self.pattern = pattern or None
+        self._ids, self._names = [], []
+        self._matches = []
+        if self.pattern:
+            self._matches = self.repository.search_side_ids(self.pattern)
+        self._has_more = True
+        self.endResetModel()
+        self.fetchMore()
+
+    def side_id(self, row):
+        """
+        :param row: Row number
+        :return: Id of the side shown in the row
+        """
+        return self._ids[row]
+
+    def side_name(self, row):
+        """
+        :param row: Row number
+        :return: Name of the side shown in the row
+        """
+        return self._names[row]
+
+    def row_of(self, side_id):
+        """
+        :param side_id: Id of a side
+        :return: Row showing the side, or -1 if it is not loaded
+        """
+        row = bisect.bisect_left(self._ids, side_id)
+        if row < len(self._ids) and self._ids[row] == side_id:
+            return row
+        return -1
+
+    def side_added(self, side_id, side_name):
+        """
+        Show a side just inserted, if it belongs to the rows loaded.
+
+        A new side has the highest id, so it is appended once every page
+        is loaded, and otherwise comes with the last page.
+
+        :param side_id: Id of the new side
+        :param side_name: Name of the new side
+        """
+        if self._has_more or (self._ids and side_id < self._ids[-1]):
+            return
+        pattern = (self.pattern or "").lower()
+        if pattern not in side_name.lower():
+            return
+        row = len(self._ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(side_id)
+        self._names.append(side_name)
+        self.endInsertRows()
+
+    def side_renamed(self, side_id, side_name):
+        """
+        Update the row of a side just renamed.
+
+        :param side_id: Id of the side
+        :param side_name: New name
+        """
+        row = self.row_of(side_id)
+        if row == -1:
+            return
+        self._names[row] = side_name
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def side_deleted(self, side_id):
+        """
+        Remove the row of a side just deleted.
+
+        :param side_id: Id of the side
+        """
+        row = self.row_of(side_id)
+        if row == -1:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        del self._names[row]
+        self.endRemoveRows()
@@ -10,9 +10,11 @@ from PySide6.QtCore import QObject, QTimer, Signal, QThread
 from PySide6.QtWidgets import QMessageBox
 
 try:
+    from sync_layer.pipeline import PipelineCancelled
     from sync_layer.sync_db import sync_databases
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer.pipeline import PipelineCancelled
     from sync_layer.sync_db import sync_databases
 
 SYNC_TIMEOUT = 20  # Timeout in seconds
@@ -22,10 +24,23 @@ class SyncThread(QThread):
     """
     QThread to run the sync process in a separate thread.
     Emits signals for sync success or failure.
+
+    The sync is never terminated: :meth:`cancel` asks it to stop at its
+    next chunk, so it rolls back to its last checkpoint and returns its
+    pooled Oracle sessions before the thread ends.
     """
 
     sync_success = Signal()
     sync_failed = Signal(str)
+    sync_cancelled = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the sync to stop; the thread finishes shortly after."""
+        self.cancel_event.set()
 
     def run(self):
         """
@@ -34,9 +49,11 @@ class SyncThread(QThread):
         """
         try:
             # Perform the sync operation
-            sync_databases()
+            sync_databases(cancel=self.cancel_event)
             # Emit success if no exceptions
             self.sync_success.emit()
+        except PipelineCancelled:
+            self.sync_cancelled.emit()
         except Exception as e:
             # Emit failure if an exception occurs
             self.sync_failed.emit(str(e))
@@ -52,7 +69,7 @@ class SyncHandler(QObject):
     sync_timeout = Signal()
 
     def __init__(self, window):
-        super().__init__()
+        super().__init__(window)  # Kept alive by the window while syncing
         self.window = window
         self.sync_thread = None
         self.timeout_timer = QTimer(self)
@@ -66,18 +83,19 @@ class SyncHandler(QObject):
         self.timeout_timer.setSingleShot(True)
 
         def on_timeout():
-            """Handle the timeout by emitting a signal."""
+            """Handle the timeout by cancelling the sync."""
             if self.sync_thread and self.sync_thread.isRunning():
-                self.sync_thread.terminate()  # Force terminate (not ideal)
+                self.sync_thread.cancel()
             self.sync_timeout.emit()
 
         # Connect the timeout timer to the on_timeout function
         self.timeout_timer.timeout.connect(on_timeout)
 
         # Create the sync thread and connect its signals
-        self.sync_thread = SyncThread()
+        self.sync_thread = SyncThread(self)
         self.sync_thread.sync_success.connect(self.on_sync_success)
         self.sync_thread.sync_failed.connect(self.on_sync_failed)
+        self.sync_thread.finished.connect(self.deleteLater)
 
         # Start the sync thread and the timer
         self.sync_thread.start()
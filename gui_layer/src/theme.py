@@ -0,0 +1,112 @@
+"""
+Font and contrast theme of the application.
+
+Qt propagates a widget's font and palette to its children, so a theme is
+set once, on a window or on the whole application, instead of on every
+widget. Palettes are built once per contrast level and cached, and
+changes made in quick succession (a contrast slider being dragged) are
+coalesced into one application per frame.
+"""
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QApplication
+
+# Milliseconds between two applications of a changing theme (one frame)
+FRAME_INTERVAL = 16
+
+# Palette roles widgets paint their background with (windows, buttons,
+# inputs and views)
+BACKGROUND_ROLES = (
+    QPalette.Window,
+    QPalette.Button,
+    QPalette.Base,
+    QPalette.AlternateBase,
+)
+
+
+def contrast_color(contrast):
+    """
+    Background color for a contrast level.
+
+    :param contrast: Contrast in percent, 50 to 150
+    :return: QColor, grey scaled with the contrast
+    """
+    if contrast >= 100:
+        # For contrast values >= 100, the color becomes brighter, whiter
+        brightness = int(255 * (contrast / 150))  # Scale max to 150%
+    else:
+        # For contrast values < 100, the color becomes darker, more black
+        brightness = int(255 * (contrast / 100))
+    return QColor(brightness, brightness, brightness)
+
+
+class ThemeEngine:
+    """
+    Applies a font size and a contrast level to top-level targets.
+    """
+
+    def __init__(self):
+        self._palettes = {}  # Contrast level to QPalette
+        self._timer = None
+        self._pending = {}  # Target to (font size, contrast), by id
+
+    def palette(self, contrast):
+        """
+        Return the palette of a contrast level, built on first use.
+
+        :param contrast: Contrast in percent
+        :return: QPalette
+        """
+        palette = self._palettes.get(contrast)
+        if palette is None:
+            palette = QPalette(QApplication.palette())
+            color = contrast_color(contrast)
+            for role in BACKGROUND_ROLES:
+                palette.setColor(role, color)
+            self._palettes[contrast] = palette
+        return palette
+
+    def apply(self, target, font_size, contrast):
+        """
+        Set the font size and palette of a target; its children inherit
+        them.
+
+        :param target: Top-level QWidget, or the QApplication to theme
+                       every window
+        :param font_size: Font size in points
+        :param contrast: Contrast in percent
+        """
+        font = target.font()
+        if font.pointSize() != font_size:
+            font.setPointSize(font_size)
+            target.setFont(font)
+        target.setPalette(self.palette(contrast))
+
+    def schedule(self, target, font_size, contrast):
+        """
+        Apply a theme at the next frame; later calls before then replace
+        it, so a burst of changes is applied once.
+
+        :param target: Top-level QWidget, or the QApplication
+        :param font_size: Font size in points
+        :param contrast: Contrast in percent
+        """
+        self._pending[id(target)] = (target, font_size, contrast)
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.setInterval(FRAME_INTERVAL)
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """
+        Apply the scheduled themes now.
+        """
+        if self._timer is not None:
+            self._timer.stop()
+        pending, self._pending = self._pending, {}
+        for target, font_size, contrast in pending.values():
+            self.apply(target, font_size, contrast)
@@ -68,7 +68,8 @@ def adjust_contrast(main_window):
     """
     settings = main_window.settings
     settings.contrast = 150
-    settings.apply_settings(main_window)
+    settings.apply_settings()
+    QApplication.processEvents()  # Existing windows update from the loop
 
 
 @then("the colors of the application should whiten")
@@ -96,7 +97,8 @@ def adjust_font_size(main_window):
     """
     settings = main_window.settings
     settings.font_size = 20
-    settings.apply_settings(main_window)
+    settings.apply_settings()
+    QApplication.processEvents()  # Existing windows update from the loop
 
 
 @then("the font size across the application should increase")
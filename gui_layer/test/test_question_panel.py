@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import sys
 
 import pytest
@@ -6,9 +7,13 @@ from PySide6.QtWidgets import QApplication
 
 try:
     from gui_layer.src.question_panel import InspectionPanel
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.repository import LocalRepository
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     from gui_layer.src.question_panel import InspectionPanel
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.repository import LocalRepository
 
 
 # Ensure there is only one QApplication instance for the test session
@@ -54,3 +59,87 @@ def test_update_questions(app, qtbot):
     # Check that at least one question is added to the form layout
     assert len(panel.question_labels) > 0
     assert len(panel.answer_fields) > 0
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Generated database with 5 sides and their questions."""
+    db_path = str(tmp_path / "inspection_data.db")
+    generate_database(db_path, sides=5, questions=20)
+    yield db_path
+
+
+@pytest.fixture
+def panel(app, qtbot, db_path):
+    """Panel on the generated database, with side 3 selected and answered."""
+    repository = LocalRepository(db_path)
+    panel = InspectionPanel(repository)
+    qtbot.addWidget(panel)
+    panel.side_dropdown.setCurrentIndex(panel.side_dropdown.findData(3))
+    panel.answer_fields[0].setText("Crack at the weld")
+    yield panel
+    repository.close()
+
+
+def dropdown(panel):
+    return [
+        (panel.side_dropdown.itemData(i), panel.side_dropdown.itemText(i))
+        for i in range(1, panel.side_dropdown.count())
+    ]
+
+
+def test_side_added_keeps_the_selection(panel):
+    side_id = panel.repository.add_side("New side")
+
+    panel.on_site_changed(side_id)
+
+    assert dropdown(panel)[-1] == (side_id, "New side")
+    assert dropdown(panel) == panel.catalog.sides()
+    assert panel.side_dropdown.currentData() == 3
+    assert panel.answer_fields[0].text() == "Crack at the weld"
+
+
+def test_side_restored_with_its_id_is_inserted_in_order(panel, db_path):
+    panel.repository.delete_side(1)
+    panel.on_site_changed(1)
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (1, 'Restored')")
+    conn.commit()
+    conn.close()
+
+    panel.on_site_changed(1)
+
+    assert dropdown(panel)[0] == (1, "Restored")
+    assert dropdown(panel) == panel.catalog.sides()
+    assert panel.side_dropdown.currentData() == 3
+    assert panel.answer_fields[0].text() == "Crack at the weld"
+
+
+def test_side_renamed_keeps_the_selection(panel):
+    panel.repository.rename_side(3, "Renamed")
+
+    panel.on_site_changed(3)
+
+    assert panel.side_dropdown.currentText() == "Renamed"
+    assert panel.side_dropdown.currentData() == 3
+    assert panel.answer_fields[0].text() == "Crack at the weld"
+
+
+def test_other_side_deleted_keeps_the_selection(panel):
+    panel.repository.delete_side(2)
+
+    panel.on_site_changed(2)
+
+    assert 2 not in [side_id for side_id, _ in dropdown(panel)]
+    assert panel.side_dropdown.currentData() == 3
+    assert panel.answer_fields[0].text() == "Crack at the weld"
+
+
+def test_selected_side_deleted_clears_the_selection(panel):
+    panel.repository.delete_side(3)
+
+    panel.on_site_changed(3)
+
+    assert dropdown(panel) == panel.catalog.sides()
+    assert panel.side_dropdown.currentIndex() == 0
+    assert panel.form_layout.count() == 0
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+try:
+    from gui_layer.src.side_edit_panel import SideEditPanel
+    from gui_layer.src.side_table_model import PAGE_SIZE, SideTableModel
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.repository import LocalRepository
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from gui_layer.src.side_edit_panel import SideEditPanel
+    from gui_layer.src.side_table_model import PAGE_SIZE, SideTableModel
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.repository import LocalRepository
+
+
+# Ensure there is only one QApplication instance for the test session
+@pytest.fixture(scope="session")
+def app():
+    """Set up a Qt application for testing."""
+    app = QApplication.instance()  # Reuse existing instance if it exists
+    if app is None:
+        app = QApplication([])  # Create a new instance if not
+    yield app  # Yield it for use across tests
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Repository of a generated database with 1000 sides."""
+    db_path = str(tmp_path / "inspection_data.db")
+    generate_database(db_path, sides=1000, questions=0)
+    repository = LocalRepository(db_path)
+    yield repository
+    repository.close()
+
+
+def test_sides_are_fetched_page_by_page(app, repository):
+    model = SideTableModel(repository)
+    assert model.rowCount() == 0
+
+    model.reload()
+    assert model.rowCount() == PAGE_SIZE
+    assert model.canFetchMore()
+    while model.canFetchMore():
+        model.fetchMore()
+
+    assert model.rowCount() == 1000
+    assert model.data(model.index(999, 0), Qt.UserRole) == 1000
+
+
+def test_edits_update_single_rows(app, repository, qtbot):
+    model = SideTableModel(repository)
+    model.reload()
+    side_id = model.side_id(10)
+
+    with qtbot.waitSignal(model.dataChanged):
+        model.side_renamed(side_id, "Renamed")
+    assert model.data(model.index(10, 0)) == "Renamed"
+
+    with qtbot.waitSignal(model.rowsRemoved):
+        model.side_deleted(side_id)
+    assert model.row_of(side_id) == -1
+    assert model.rowCount() == PAGE_SIZE - 1
+
+    model.side_added(1001, "New side")  # Comes with the last page
+    assert model.rowCount() == PAGE_SIZE - 1
+
+
+def test_search_queries_matching_sides(app, repository, qtbot):
+    repository.add_side("Needle in a haystack")
+    panel = SideEditPanel(repository)
+    qtbot.addWidget(panel)
+
+    panel.search_bar.setText("ne")
+    panel.search_bar.setText("needle")
+    assert panel.search_timer.isActive()  # Debounced
+
+    qtbot.waitUntil(lambda: panel.sides_model.rowCount() == 1)
+    assert panel.sides_model.side_name(0) == "Needle in a haystack"
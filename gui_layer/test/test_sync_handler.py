@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+from PySide6.QtWidgets import QApplication, QWidget
+
+try:
+    from gui_layer.src import sync_handler
+    from gui_layer.src.sync_handler import SyncHandler
+    from sync_layer.pipeline import check_cancelled
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from gui_layer.src import sync_handler
+    from gui_layer.src.sync_handler import SyncHandler
+    from sync_layer.pipeline import check_cancelled
+
+
+# Ensure there is only one QApplication instance for the test session
+@pytest.fixture(scope="session")
+def app():
+    """Set up a Qt application for testing."""
+    app = QApplication.instance()  # Reuse existing instance if it exists
+    if app is None:
+        app = QApplication([])  # Create a new instance if not
+    yield app  # Yield it for use across tests
+
+
+@pytest.fixture
+def window(app):
+    window = QWidget()
+    yield window
+    window.deleteLater()
+
+
+def test_timeout_cancels_sync_instead_of_terminating(
+    qtbot, window, monkeypatch
+):
+    """
+    A sync still running at the timeout is asked to stop and winds down
+    on its own, reporting the timeout only.
+    """
+    calls = []
+
+    def slow_sync(cancel=None):
+        calls.append(cancel)
+        assert cancel.wait(5)
+        check_cancelled(cancel)
+
+    monkeypatch.setattr(sync_handler, "sync_databases", slow_sync)
+    monkeypatch.setattr(sync_handler, "SYNC_TIMEOUT", 0.05)
+    handler = SyncHandler(window)
+    outcomes = []
+    handler.sync_success.connect(lambda: outcomes.append("success"))
+    handler.sync_failed.connect(lambda error: outcomes.append(error))
+    handler.sync_timeout.connect(lambda: outcomes.append("timeout"))
+
+    handler.run_sync_with_timeout()
+    thread = handler.sync_thread
+    with qtbot.waitSignals(
+        [thread.sync_cancelled, thread.finished], timeout=2000
+    ):
+        pass  # Both arrive after the 50 ms timeout
+
+    assert calls[0].is_set()
+    assert outcomes == ["timeout"]
+
+
+def test_sync_success_stops_timer(qtbot, window, monkeypatch):
+    monkeypatch.setattr(sync_handler, "sync_databases", lambda cancel: None)
+    handler = SyncHandler(window)
+    timer_active = []
+    handler.sync_success.connect(
+        lambda: timer_active.append(handler.timeout_timer.isActive())
+    )
+
+    with qtbot.waitSignal(handler.sync_success, timeout=2000):
+        handler.run_sync_with_timeout()
+
+    assert timer_active == [False]
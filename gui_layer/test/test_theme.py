@@ -0,0 +1,101 @@
+import os
+import sys
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPalette
+from PySide6.QtWidgets import (
+    QApplication,
+    QDialog,
+    QLabel,
+    QMessageBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+try:
+    from gui_layer.src.app import Settings
+    from gui_layer.src.theme import ThemeEngine, contrast_color
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from gui_layer.src.app import Settings
+    from gui_layer.src.theme import ThemeEngine, contrast_color
+
+
+# Ensure there is only one QApplication instance for the test session
+@pytest.fixture(scope="session")
+def app():
+    """Set up a Qt application for testing."""
+    app = QApplication.instance()  # Reuse existing instance if it exists
+    if app is None:
+        app = QApplication([])  # Create a new instance if not
+    yield app  # Yield it for use across tests
+
+
+@pytest.fixture
+def window(app):
+    """Window holding a container with a label."""
+    window = QWidget()
+    container = QWidget()
+    QVBoxLayout(container).addWidget(QLabel("Question?"))
+    QVBoxLayout(window).addWidget(container)
+    yield window
+    window.deleteLater()
+
+
+@pytest.fixture
+def settings(app):
+    """Settings whose theme is removed from the application afterwards."""
+    palette, font = QApplication.palette(), QApplication.font()
+    yield Settings()
+    QApplication.setPalette(palette)
+    QApplication.setFont(font)
+
+
+def test_palette_cached_per_contrast(app):
+    """Each contrast level builds its palette once."""
+    engine = ThemeEngine()
+    assert engine.palette(120) is engine.palette(120)
+    assert engine.palette(80) is not engine.palette(120)
+    assert engine.palette(80).color(QPalette.Window) == contrast_color(80)
+
+
+def test_children_inherit_theme(window):
+    """The theme is set on the window only and reaches every child."""
+    ThemeEngine().apply(window, 17, 70)
+
+    label = window.findChild(QLabel)
+    assert label.font().pointSize() == 17
+    assert label.palette().color(QPalette.Window) == contrast_color(70)
+    assert not label.testAttribute(Qt.WA_SetFont)
+
+
+def test_schedule_coalesces_changes(qtbot, window):
+    """A burst of changes is applied once, with the last values."""
+    engine = ThemeEngine()
+    applied = []
+    apply = engine.apply
+    engine.apply = lambda *args: applied.append(args) or apply(*args)
+
+    for contrast in range(50, 100):
+        engine.schedule(window, 12, contrast)
+    qtbot.waitUntil(lambda: bool(applied))
+    qtbot.wait(50)
+
+    assert applied == [(window, 12, 99)]
+    assert window.palette().color(QPalette.Window) == contrast_color(99)
+
+
+def test_settings_reach_dialogs(qtbot, settings, window):
+    """Open windows, dialogs and message boxes get the application theme."""
+    settings.contrast, settings.font_size = 60, 19
+    settings.apply_settings()
+
+    label = window.findChild(QLabel)
+    qtbot.waitUntil(lambda: label.font().pointSize() == 19)
+    assert label.palette().color(QPalette.Window) == contrast_color(60)
+
+    for dialog in (QDialog(), QMessageBox()):
+        assert dialog.palette().color(QPalette.Window) == contrast_color(60)
+        assert dialog.font().pointSize() == 19
+        dialog.deleteLater()
@@ -0,0 +1,153 @@
+"""
+Latency of the GUI's database calls, per call.
+
+Times each call the panels make, once the way they used to (connect, run
+the query, close) and once through the shared
+:class:`~local_db_layer.repository.LocalRepository`, on a database
+generated by :mod:`~local_db_layer.generate_data`. Switching the
+inspection panel to another side is timed against the
+:class:`~local_db_layer.question_catalog.QuestionCatalog`:
+
+    python local_db_layer/benchmark.py --sides 10000 --questions 100000
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+try:
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.question_catalog import QuestionCatalog
+    from local_db_layer.repository import LocalRepository
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.question_catalog import QuestionCatalog
+    from local_db_layer.repository import LocalRepository
+
+# Calls timed per operation
+CALLS = 200
+
+
+def _connect_per_call(db_path):
+    """The panels' former access: a new connection for every query."""
+
+    def query(statement, parameters=()):
+        conn = sqlite3.connect(db_path)
+        c = conn.cursor()
+        c.execute(statement, parameters)
+        rows = c.fetchall()
+        conn.close()
+        return rows
+
+    def switch_side(side):
+        # Side id by name, then its questions, on one connection
+        conn = sqlite3.connect(db_path)
+        c = conn.cursor()
+        c.execute("SELECT id FROM sides WHERE side_name=?", (side[1],))
+        side_id = c.fetchone()[0]
+        c.execute("SELECT question FROM questions WHERE side_id=?", (side_id,))
+        rows = c.fetchall()
+        conn.close()
+        return rows
+
+    return {
+        "side_names": lambda side: query("SELECT side_name FROM sides"),
+        "side_id": lambda side: query(
+            "SELECT id FROM sides WHERE side_name=?", (side[1],)
+        ),
+        "questions": lambda side: query(
+            "SELECT question FROM questions WHERE side_id=?", (side[0],)
+        ),
+        "check_credentials": lambda side: query(
+            "SELECT * FROM users WHERE username=? AND password=?",
+            ("admin", "pass"),
+        ),
+        "switch_side": switch_side,
+    }
+
+
+def _repository(db_path):
+    repository = LocalRepository(db_path)
+    catalog = QuestionCatalog(repository)
+    catalog.load()
+    return {
+        "side_names": lambda side: repository.side_names(),
+        "side_id": lambda side: repository.side_id(side[1]),
+        "questions": lambda side: repository.questions(side[0]),
+        "check_credentials": lambda side: repository.check_credentials(
+            "admin", "pass"
+        ),
+        "switch_side": lambda side: catalog.questions(side[0]),
+    }
+
+
+def time_calls(call, sides, calls=CALLS):
+    """
+    Median latency of a call.
+
+    :param call: Function taking a side as an (id, name) tuple
+    :param sides: List of sides to cycle through
+    :param calls: Number of calls timed
+    :return: Median latency in microseconds
+    """
+    latencies = []
+    for i in range(calls):
+        side = sides[i % len(sides)]
+        start = time.perf_counter()
+        call(side)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1e6
+
+
+def run_benchmark(sides=1000, questions=10000, calls=CALLS):
+    """
+    Time every operation with both kinds of access.
+
+    :param sides: Number of sides of the generated database
+    :param questions: Number of questions of the generated database
+    :param calls: Number of calls timed per operation
+    :return: Dict of operation name to (before, after) median latencies
+             in microseconds
+    """
+    with tempfile.TemporaryDirectory(prefix="local_db_benchmark_") as tmp:
+        db_path = os.path.join(tmp, "inspection_data.db")
+        generate_database(db_path, sides=sides, questions=questions)
+        conn = sqlite3.connect(db_path)
+        side_rows = conn.execute("SELECT id, side_name FROM sides").fetchall()
+        conn.close()
+        before = _connect_per_call(db_path)
+        after = _repository(db_path)
+        return {
+            name: (
+                time_calls(before[name], side_rows, calls),
+                time_calls(after[name], side_rows, calls),
+            )
+            for name in before
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sides", type=int, default=1000, help="Number of sides."
+    )
+    parser.add_argument(
+        "--questions", type=int, default=10000, help="Number of questions."
+    )
+    parser.add_argument(
+        "--calls", type=int, default=CALLS, help="Calls per operation."
+    )
+    args = parser.parse_args()
+
+    print(f"{'operation':<18} {'before':>12} {'after':>12} {'speed-up':>9}")
+    results = run_benchmark(args.sides, args.questions, args.calls)
+    for name, (before, after) in results.items():
+        print(
+            f"{name:<18} {before:>10.1f}us {after:>10.1f}us "
+            f"{before / after:>8.1f}x"
+        )
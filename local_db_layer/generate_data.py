@@ -0,0 +1,258 @@
+"""
+Generation of large synthetic inspection databases.
+
+Builds an ``inspection_data.db`` with the schema of
+:func:`~local_db_layer.setup_db.setup_database` and as many sides,
+questions and users as asked for, to measure the GUI and the sync on
+realistic volumes. Rows are inserted with ``executemany`` in a single
+transaction; the changelog triggers log them all as pending inserts, as if
+they had been entered on the device:
+
+    python local_db_layer/generate_data.py --sides 100000 --questions 500000
+
+Questions are spread over the sides by a distribution: ``uniform`` gives
+every side the same number, ``normal`` varies it around the mean and
+``zipf`` gives a few sides most of the questions.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+
+try:
+    from local_db_layer.setup_db import search_index_suspended, setup_database
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from local_db_layer.setup_db import search_index_suspended, setup_database
+
+DISTRIBUTIONS = ("uniform", "normal", "zipf")
+
+# Rows handed to one executemany call, bounding the memory used
+INSERT_BATCH_ROWS = 50000
+
+_SITE_KINDS = [
+    "Substation",
+    "Pump Station",
+    "Transformer",
+    "Pipeline Section",
+    "Tower",
+    "Valve Chamber",
+    "Switch Room",
+    "Reservoir",
+]
+_REGIONS = ["North", "South", "East", "West", "Central", "Coastal", "Upland"]
+_QUESTIONS = [
+    "What is the site name?",
+    "What is the elevation?",
+    "What is the noise level?",
+    "What is the area size?",
+    "What is the wind direction?",
+    "Are there terrain changes?",
+    "What is the station type?",
+    "Is there visible corrosion?",
+    "Are there signs of condensation?",
+    "Is the perimeter fence intact?",
+    "Are the warning signs legible?",
+    "What is the reading on the main gauge?",
+    "Is there vegetation encroaching on the equipment?",
+    "Are the access roads passable in all weather?",
+    "Describe any damage found since the last inspection.",
+]
+
+
+def side_weights(sides, distribution, rng):
+    """
+    Relative number of questions of each side.
+
+    :param sides: Number of sides
+    :param distribution: One of :data:`DISTRIBUTIONS`
+    :param rng: :class:`random.Random` instance
+    :return: List of weights, one per side
+    """
+    if distribution == "uniform":
+        return [1.0] * sides
+    if distribution == "normal":
+        return [max(rng.gauss(1.0, 0.35), 0.05) for _ in range(sides)]
+    if distribution == "zipf":
+        weights = [1.0 / rank**1.1 for rank in range(1, sides + 1)]
+        rng.shuffle(weights)  # The busy sides are not the first ones
+        return weights
+    raise ValueError(
+        f"Unknown distribution {distribution!r}, expected one of "
+        f"{', '.join(DISTRIBUTIONS)}"
+    )
+
+
+def question_sides(sides, questions, distribution, rng):
+    """
+    Side id of each question, sorted so each side's questions are
+    contiguous, as when they are entered side by side.
+
+    :param sides: Number of sides, with ids 1 to ``sides``
+    :param questions: Number of questions
+    :param distribution: One of :data:`DISTRIBUTIONS`
+    :param rng: :class:`random.Random` instance
+    :return: List of side ids
+    """
+    if distribution == "uniform":
+        return [i * sides // questions + 1 for i in range(questions)]
+    weights = side_weights(sides, distribution, rng)
+    side_ids = rng.choices(
+        range(1, sides + 1),
+        cum_weights=list(itertools.accumulate(weights)),
+        k=questions,
+    )
+    side_ids.sort()
+    return side_ids
+
+
+def _side_rows(sides, rng):
+    for side_id in range(1, sides + 1):
+        region = rng.choice(_REGIONS)
+        kind = rng.choice(_SITE_KINDS)
+        yield side_id, f"{region} {kind} {side_id}"
+
+
+def _question_rows(side_ids, rng):
+    for question_id, side_id in enumerate(side_ids, start=1):
+        question = rng.choice(_QUESTIONS)
+        if rng.random() < 0.3:
+            question = f"{question} (point {rng.randint(1, 99)})"
+        yield question_id, side_id, question
+
+
+def _user_rows(users):
+    # The first user is the admin the GUI logs in with
+    for user_id in range(1, users + 1):
+        name = "admin" if user_id == 1 else f"inspector{user_id}"
+        yield user_id, name, "pass"
+
+
+def _insert(cursor, statement, rows):
+    for batch in iter(
+        lambda: list(itertools.islice(rows, INSERT_BATCH_ROWS)), []
+    ):
+        cursor.executemany(statement, batch)
+
+
+def generate_database(
+    db_path="inspection_data.db",
+    sides=1000,
+    questions=10000,
+    users=10,
+    distribution="uniform",
+    seed=0,
+    overwrite=False,
+):
+    """
+    Create a database filled with synthetic sides, questions and users.
+
+    :param db_path: Path of the SQLite database to create
+    :param sides: Number of sides
+    :param questions: Number of questions, spread over the sides
+    :param users: Number of users, the first one being the admin
+    :param distribution: Spread of the questions over the sides, one of
+                         :data:`DISTRIBUTIONS`
+    :param seed: Seed of the random generator, so runs are reproducible
+    :param overwrite: Replace ``db_path`` if it exists
+    :raises FileExistsError: If ``db_path`` exists and ``overwrite`` is
+                             not set
+    :raises ValueError: If questions are requested without any sides,
+                        or ``distribution`` is unknown
+    :return: Dict of the number of rows inserted per table
+    """
+    if questions and not sides:
+        raise ValueError("Questions need at least one side")
+    rng = random.Random(seed)
+    side_ids = question_sides(sides, questions, distribution, rng)
+
+    if os.path.exists(db_path):
+        if not overwrite:
+            raise FileExistsError(db_path)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    setup_database(db_path, seed_data=False)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # A generated file can be rebuilt, so durability is traded for speed
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    try:
+        _insert(
+            cursor,
+            "INSERT INTO users (id, username, password) VALUES (?, ?, ?)",
+            _user_rows(users),
+        )
+        with search_index_suspended(cursor):
+            _insert(
+                cursor,
+                "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+                _side_rows(sides, rng),
+            )
+            _insert(
+                cursor,
+                "INSERT INTO questions (id, side_id, question) "
+                "VALUES (?, ?, ?)",
+                _question_rows(side_ids, rng),
+            )
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return {"sides": sides, "questions": questions, "users": users}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--output", default="inspection_data.db", help="Database to create."
+    )
+    parser.add_argument(
+        "--sides", type=int, default=1000, help="Number of sides."
+    )
+    parser.add_argument(
+        "--questions", type=int, default=10000, help="Number of questions."
+    )
+    parser.add_argument(
+        "--users", type=int, default=10, help="Number of users."
+    )
+    parser.add_argument(
+        "--distribution",
+        choices=DISTRIBUTIONS,
+        default="uniform",
+        help="Spread of the questions over the sides.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed, for reproducibility."
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace the database if it exists.",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate_database(
+        args.output,
+        sides=args.sides,
+        questions=args.questions,
+        users=args.users,
+        distribution=args.distribution,
+        seed=args.seed,
+        overwrite=args.overwrite,
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Generated {counts['sides']} sides, {counts['questions']} questions "
+        f"and {counts['users']} users in {args.output} in {elapsed:.1f} s."
+    )
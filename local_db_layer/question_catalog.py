@@ -0,0 +1,96 @@
+"""
+In-memory catalog of the sides and their questions.
+
+The inspection panel used to query the database twice on every side it
+switched to. A :class:`QuestionCatalog` loads every side with its
+questions in one grouped query and then answers from memory; when a side
+is added, renamed or deleted, only that side is reloaded.
+"""
+
+import itertools
+
+
+class QuestionCatalog:
+    """
+    Sides and their questions, indexed by side id.
+
+    Meant to be used from the GUI thread only.
+    """
+
+    def __init__(self, repository):
+        """
+        :param repository: :class:`~local_db_layer.repository.LocalRepository`
+                           to load from
+        """
+        self.repository = repository
+        self._names = {}  # Side id to name, in side id order
+        self._questions = {}  # Side id to tuple of questions
+        self._loaded = False
+
+    def _index(self, rows):
+        for side_id, group in itertools.groupby(rows, key=lambda r: r[0]):
+            group = list(group)
+            self._names[side_id] = group[0][1]
+            self._questions[side_id] = tuple(
+                question for _, _, question in group if question is not None
+            )
+
+    def load(self):
+        """
+        (Re)load every side and its questions.
+        """
+        self._names.clear()
+        self._questions.clear()
+        self._index(self.repository.sides_with_questions())
+        self._loaded = True
+
+    def invalidate(self, side_id):
+        """
+        Reload one side after it was added, renamed or deleted.
+
+        :param side_id: Id of the side
+        """
+        if not self._loaded:
+            return  # Loaded in full on first use
+        rows = self.repository.sides_with_questions(side_id)
+        if not rows:
+            self._names.pop(side_id, None)
+            self._questions.pop(side_id, None)
+            return
+        is_new = side_id not in self._names
+        last = next(reversed(self._names), side_id)
+        self._index(rows)  # A known side keeps its place
+        if is_new and side_id < last:
+            # E.g. restored with its old id; sides are kept in id order
+            self._names = dict(sorted(self._names.items()))
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def sides(self):
+        """
+        Return every side.
+
+        :return: List of (side id, side name) tuples, in side id order
+        """
+        self._ensure_loaded()
+        return list(self._names.items())
+
+    def side_name(self, side_id):
+        """
+        :param side_id: Id of the side
+        :return: Name of the side, or None if there is no such side
+        """
+        self._ensure_loaded()
+        return self._names.get(side_id)
+
+    def questions(self, side_id):
+        """
+        Return the questions of a side.
+
+        :param side_id: Id of the side
+        :return: Tuple of question texts, empty for an unknown side
+        """
+        self._ensure_loaded()
+        return self._questions.get(side_id, ())
@@ -0,0 +1,312 @@
+"""
+Shared access to the local inspection database.
+
+Opening SQLite costs a file open, a schema parse and a round of locking,
+which used to be paid on every click. A :class:`LocalRepository` instead
+keeps one long-lived connection per thread, tuned by :data:`PRAGMAS`, and
+runs a fixed set of statements on it, so they stay in the connection's
+prepared statement cache. Panels share one repository per database file
+through :func:`get_repository`.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+
+# Database used when no path is given, relative to the working directory
+DB_PATH = os.getenv("INSPECTION_DB", "inspection_data.db")
+
+# Milliseconds a statement waits for a lock held by another connection
+BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+
+# Set on every connection; WAL lets the sync read while the GUI writes,
+# and with WAL synchronous=NORMAL only skips the fsync on each commit
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16384),  # KiB
+    ("mmap_size", 256 * 2**20),
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", BUSY_TIMEOUT),
+)
+
+# Prepared statements kept per connection
+CACHED_STATEMENTS = 256
+
+# Length of the shortest text the trigram search indexes can find
+TRIGRAM = 3
+
+
+class LocalRepository:
+    """
+    Queries of the GUI on the local database, each thread on its own
+    long-lived connection.
+
+    Connections are in autocommit mode: every statement is its own
+    transaction, so no read snapshot outlives a call.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        :param db_path: Path of the SQLite database, :data:`DB_PATH` by
+                        default
+        """
+        self.db_path = os.path.abspath(db_path or DB_PATH)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._search_indexed = None  # Whether the search indexes exist
+
+    def connection(self):
+        """
+        Return the calling thread's connection, opening it on first use.
+
+        :return: SQLite connection object
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT / 1000,
+                isolation_level=None,
+                check_same_thread=False,  # Closed from any thread
+                cached_statements=CACHED_STATEMENTS,
+            )
+            for name, value in PRAGMAS:
+                conn.execute(f"PRAGMA {name}={value}").fetchall()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """
+        Close the connections of all threads; later calls reopen them.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _fetch_one(self, statement, parameters=()):
+        cursor = self.connection().execute(statement, parameters)
+        try:
+            return cursor.fetchone()
+        finally:
+            cursor.close()  # Ends the statement, and its read transaction
+
+    def _fetch_all(self, statement, parameters=()):
+        return self.connection().execute(statement, parameters).fetchall()
+
+    def sides_with_questions(self, side_id=None):
+        """
+        Return sides joined with their questions, in one query.
+
+        :param side_id: Id of the only side to return, all sides if None
+        :return: List of (side id, side name, question) rows ordered by
+                 side and question, the question being None for a side
+                 without questions
+        """
+        statement = """
+            SELECT s.id, s.side_name, q.question
+            FROM sides s LEFT JOIN questions q ON q.side_id = s.id
+            {}
+            ORDER BY s.id, q.id"""
+        if side_id is None:
+            return self._fetch_all(statement.format(""))
+        return self._fetch_all(
+            statement.format("WHERE s.id = ?"), (side_id,)
+        )
+
+    def side_names(self):
+        """
+        Return the names of all sides.
+
+        :return: List of side names, in insertion order
+        """
+        rows = self._fetch_all("SELECT side_name FROM sides ORDER BY id")
+        return [side_name for side_name, in rows]
+
+    def side_id(self, side_name):
+        """
+        Look up a side by name.
+
+        :param side_name: Name of the side
+        :return: Side id, or None if there is no such side
+        """
+        row = self._fetch_one(
+            "SELECT id FROM sides WHERE side_name = ? LIMIT 1", (side_name,)
+        )
+        return None if row is None else row[0]
+
+    def questions(self, side_id):
+        """
+        Return the questions of a side.
+
+        :param side_id: Id of the side
+        :return: List of question texts
+        """
+        rows = self._fetch_all(
+            "SELECT question FROM questions WHERE side_id = ? ORDER BY id",
+            (side_id,),
+        )
+        return [question for question, in rows]
+
+    def add_side(self, side_name):
+        """
+        Insert a side.
+
+        :param side_name: Name of the new side
+        :return: Id of the new side
+        """
+        cursor = self.connection().execute(
+            "INSERT INTO sides (side_name) VALUES (?)", (side_name,)
+        )
+        return cursor.lastrowid
+
+    def side_page(self, after_id=0, limit=200):
+        """
+        Return a page of sides, in id order.
+
+        Pages are keyed by the last id of the previous one, so each page
+        costs the same however deep it is.
+
+        :param after_id: Id of the last side of the previous page
+        :param limit: Maximum number of sides returned
+        :return: List of (side id, side name) tuples
+        """
+        return self._fetch_all(
+            "SELECT id, side_name FROM sides WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        )
+
+    def sides_by_id(self, side_ids):
+        """
+        Return the sides with the given ids.
+
+        :param side_ids: Sequence of side ids
+        :return: List of (side id, side name) tuples, in id order
+        """
+        if not side_ids:
+            return []
+        placeholders = ", ".join("?" * len(side_ids))
+        return self._fetch_all(
+            f"SELECT id, side_name FROM sides WHERE id IN ({placeholders}) "
+            "ORDER BY id",
+            tuple(side_ids),
+        )
+
+    def search_side_ids(self, text):
+        """
+        Find the sides whose name or one of whose questions contains a
+        text, case-insensitively.
+
+        Texts of :data:`TRIGRAM` characters or more are looked up in the
+        trigram indexes created by
+        :func:`~local_db_layer.setup_db.create_search_index`; shorter ones,
+        which the indexes cannot answer, are matched by a scan, as is every
+        text when the SQLite version could not create the indexes.
+
+        :param text: Text searched for
+        :return: List of side ids, in id order
+        """
+        if self._search_indexed is None:
+            self._search_indexed = (
+                self._fetch_one(
+                    "SELECT COUNT(*) FROM sqlite_master "
+                    "WHERE name IN ('search_sides', 'search_questions')"
+                )[0]
+                == 2
+            )
+        if len(text) >= TRIGRAM and self._search_indexed:
+            phrase = '"{}"'.format(text.replace('"', '""'))
+            matches = """
+                SELECT rowid FROM search_sides WHERE search_sides MATCH ?1
+                UNION
+                SELECT side_id FROM search_questions
+                WHERE search_questions MATCH ?1"""
+            parameter = phrase
+        else:
+            matches = """
+                SELECT id FROM sides WHERE side_name LIKE ?1 ESCAPE '\\'
+                UNION
+                SELECT side_id FROM questions
+                WHERE question LIKE ?1 ESCAPE '\\'"""
+            parameter = "%{}%".format(re.sub(r"([\\%_])", r"\\\1", text))
+        # Questions may still refer to deleted sides
+        rows = self._fetch_all(
+            f"SELECT id FROM sides WHERE id IN ({matches}) ORDER BY id",
+            (parameter,),
+        )
+        return [side_id for side_id, in rows]
+
+    def rename_side(self, side_id, new_name):
+        """
+        Rename a side.
+
+        :param side_id: Id of the side
+        :param new_name: New name
+        :return: True if the side exists
+        """
+        cursor = self.connection().execute(
+            "UPDATE sides SET side_name = ? WHERE id = ?", (new_name, side_id)
+        )
+        return cursor.rowcount > 0
+
+    def delete_side(self, side_id):
+        """
+        Delete a side.
+
+        :param side_id: Id of the side
+        :return: True if the side existed
+        """
+        cursor = self.connection().execute(
+            "DELETE FROM sides WHERE id = ?", (side_id,)
+        )
+        return cursor.rowcount > 0
+
+    def check_credentials(self, username, password):
+        """
+        Check a username and password against the users table.
+
+        :param username: Entered username
+        :param password: Entered password
+        :return: True if a user matches
+        """
+        row = self._fetch_one(
+            "SELECT 1 FROM users WHERE username = ? AND password = ? LIMIT 1",
+            (username, password),
+        )
+        return row is not None
+
+
+_repositories = {}
+_repositories_lock = threading.Lock()
+
+
+def get_repository(db_path=None):
+    """
+    Return the repository shared by every caller using a database.
+
+    :param db_path: Path of the SQLite database, :data:`DB_PATH` by default
+    :return: :class:`LocalRepository`
+    """
+    key = os.path.abspath(db_path or DB_PATH)
+    with _repositories_lock:
+        repository = _repositories.get(key)
+        if repository is None:
+            repository = _repositories[key] = LocalRepository(key)
+        return repository
+
+
+def close_repositories():
+    """
+    Close the connections of every shared repository.
+    """
+    with _repositories_lock:
+        repositories = list(_repositories.values())
+        _repositories.clear()
+    for repository in repositories:
+        repository.close()
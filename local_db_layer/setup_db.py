@@ -1,10 +1,242 @@
+import contextlib
+import os
 import sqlite3
+import sys
+import uuid
 
+try:
+    from core_functionalities.app_logging import get_logger
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
 
-def setup_database():
-    conn = sqlite3.connect("inspection_data.db")
+logger = get_logger(__name__)
+
+# Tables whose changes are captured for synchronisation, with primary keys
+TRACKED_TABLES = {"sides": "id", "questions": "id", "users": "id"}
+
+# Stored in PRAGMA user_version once the schema is set up; bump it with
+# every schema change so existing databases are brought up to date
+SCHEMA_VERSION = 3
+
+# Sides and their questions inserted into a new database
+DUMMY_SIDES = {
+    "Side A": [
+        "What is the site name?",
+        "What is the elevation?",
+        "What is the noise level?",
+    ],
+    "Side B": [
+        "What is the area size?",
+        "What is the wind direction?",
+        "Are there terrain changes?",
+    ],
+    "Side C": [
+        "What is the station type?",
+        "Is there visible corrosion?",
+        "Are there signs of condensation?",
+    ],
+}
+
+
+def create_changelog(c):
+    """
+    Create the change-data-capture table and the triggers maintaining it.
+
+    Every insert, update and delete on a tracked table appends a row to
+    ``sync_changelog`` so the sync only has to read what changed. When the
+    changelog is created for an existing database, the rows already present
+    are logged as inserts so they are picked up by the next sync.
+
+    :param c: SQLite cursor object
+    """
+    c.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        ("sync_changelog",),
+    )
+    is_new = c.fetchone() is None
+
+    c.execute(
+        """CREATE TABLE IF NOT EXISTS sync_changelog (
+                 seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                 table_name TEXT NOT NULL,
+                 row_id INTEGER NOT NULL,
+                 op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D')),
+                 changed_at TEXT DEFAULT CURRENT_TIMESTAMP)"""
+    )
+    c.execute(
+        """CREATE INDEX IF NOT EXISTS idx_sync_changelog_table_seq
+                 ON sync_changelog (table_name, seq)"""
+    )
+
+    for table, pk in TRACKED_TABLES.items():
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_changelog_insert
+                 AFTER INSERT ON {table}
+                 BEGIN
+                     INSERT INTO sync_changelog (table_name, row_id, op)
+                     VALUES ('{table}', NEW.{pk}, 'I');
+                 END"""
+        )
+        # A primary key change is logged as a delete of the old key
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_changelog_update
+                 AFTER UPDATE ON {table}
+                 BEGIN
+                     INSERT INTO sync_changelog (table_name, row_id, op)
+                     SELECT '{table}', OLD.{pk}, 'D'
+                     WHERE OLD.{pk} IS NOT NEW.{pk};
+                     INSERT INTO sync_changelog (table_name, row_id, op)
+                     VALUES ('{table}', NEW.{pk}, 'U');
+                 END"""
+        )
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_changelog_delete
+                 AFTER DELETE ON {table}
+                 BEGIN
+                     INSERT INTO sync_changelog (table_name, row_id, op)
+                     VALUES ('{table}', OLD.{pk}, 'D');
+                 END"""
+        )
+        if is_new:
+            c.execute(
+                f"""INSERT INTO sync_changelog (table_name, row_id, op)
+                     SELECT '{table}', {pk}, 'I' FROM {table}"""
+            )
+
+
+# FTS5 tokenizer of the search indexes, available from SQLite 3.34
+SEARCH_TOKENIZER = "trigram"
+
+# Full-text indexes kept up to date by triggers: table name to the
+# indexed table, its key and the indexed columns (the first one searched)
+SEARCH_INDEXES = {
+    "search_sides": ("sides", "id", ["side_name"]),
+    "search_questions": ("questions", "id", ["question", "side_id"]),
+}
+
+
+def create_search_index(c, rebuild=False):
+    """
+    Create the full-text indexes of side names and question texts.
+
+    The indexes are FTS5 tables with the trigram tokenizer, reading their
+    content from the indexed tables, so any substring of three characters
+    or more is found without a scan. Triggers keep them in step with every
+    insert, update and delete; indexes created for an existing database
+    are built from the rows already present.
+
+    Where SQLite lacks FTS5 or its trigram tokenizer (before 3.34), no
+    index is created and the search scans the tables instead.
+
+    :param c: SQLite cursor object
+    :param rebuild: Rebuild existing indexes from the indexed tables too
+    :return: True if the indexes exist
+    """
+    for index, (table, key, columns) in SEARCH_INDEXES.items():
+        c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+            (index,),
+        )
+        is_new = c.fetchone() is None
+
+        # Only the first column is searched, the others are stored with it
+        indexed = ", ".join(
+            [columns[0]] + [f"{column} UNINDEXED" for column in columns[1:]]
+        )
+        try:
+            c.execute(
+                f"""CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5(
+                         {indexed}, content='{table}', content_rowid='{key}',
+                         tokenize='{SEARCH_TOKENIZER}')"""
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(
+                f"SQLite {sqlite3.sqlite_version} cannot create the search "
+                f"indexes, searching by scan instead: {e}"
+            )
+            return False
+
+        names = ", ".join(columns)
+        new_values = ", ".join(f"NEW.{column}" for column in columns)
+        old_values = ", ".join(f"OLD.{column}" for column in columns)
+        insert = f"""INSERT INTO {index} (rowid, {names})
+                     VALUES (NEW.{key}, {new_values});"""
+        delete = f"""INSERT INTO {index} ({index}, rowid, {names})
+                     VALUES ('delete', OLD.{key}, {old_values});"""
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {index}_insert
+                 AFTER INSERT ON {table}
+                 BEGIN
+                     {insert}
+                 END"""
+        )
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {index}_update
+                 AFTER UPDATE ON {table}
+                 BEGIN
+                     {delete}
+                     {insert}
+                 END"""
+        )
+        c.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS {index}_delete
+                 AFTER DELETE ON {table}
+                 BEGIN
+                     {delete}
+                 END"""
+        )
+        if is_new or rebuild:
+            c.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+    return True
+
+
+@contextlib.contextmanager
+def search_index_suspended(c):
+    """
+    Stop maintaining the search indexes row by row during a bulk load,
+    and rebuild them in one pass at the end.
+
+    :param c: SQLite cursor object, in the transaction of the load
+    """
+    for index in SEARCH_INDEXES:
+        for event in ("insert", "update", "delete"):
+            c.execute(f"DROP TRIGGER IF EXISTS {index}_{event}")
+    yield
+    create_search_index(c, rebuild=True)
+
+
+def schema_is_current(conn):
+    """
+    Check if a database was set up with the current schema.
+
+    :param conn: SQLite connection object
+    :return: True if ``PRAGMA user_version`` matches :data:`SCHEMA_VERSION`
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION
+
+
+def setup_database(db_path="inspection_data.db", seed_data=True):
+    """
+    Create the local schema, unless it is already current.
+
+    Safe to run on every start: a database whose ``user_version`` is
+    current is left untouched, and the dummy data is only inserted into a
+    database without sides.
+
+    :param db_path: Path of the SQLite database
+    :param seed_data: Insert the admin user and the dummy sides
+    :return: True if the database was set up, False if it was current
+    """
+    conn = sqlite3.connect(db_path)
+    if schema_is_current(conn):
+        conn.close()
+        return False
     c = conn.cursor()
 
+    # Write-ahead logging lets a sync read while the GUI writes
+    c.execute("PRAGMA journal_mode=WAL")
+
     # Create a table for sides and their questions
     c.execute(
         """CREATE TABLE IF NOT EXISTS sides (
@@ -19,6 +251,10 @@ def setup_database():
                  question TEXT,
                  FOREIGN KEY (side_id) REFERENCES sides(id))"""
     )
+    c.execute(
+        """CREATE INDEX IF NOT EXISTS idx_questions_side_id
+                 ON questions (side_id)"""
+    )
 
     # Create a table for users
     c.execute(
@@ -28,49 +264,58 @@ def setup_database():
                  password TEXT)"""
     )
 
-    # Insert admin user
-    c.execute(
-        "INSERT OR IGNORE INTO users (username, password) VALUES ('admin', 'pass')"
-    )
+    # Change-data-capture used by the sync layer
+    create_changelog(c)
 
-    # Insert some dummy data
-    c.execute("INSERT INTO sides (side_name) VALUES ('Side A')")
-    c.execute("INSERT INTO sides (side_name) VALUES ('Side B')")
-    c.execute("INSERT INTO sides (side_name) VALUES ('Side C')")
+    # Search of sides by name and question text
+    create_search_index(c)
 
-    # Add questions for each side
+    # Content hash of each row as last committed to the central DB, used by
+    # the sync to skip rows touched without being changed
     c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (1, 'What is the site name?')"
-    )
-    c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (1, 'What is the elevation?')"
-    )
-    c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (1, 'What is the noise level?')"
+        """CREATE TABLE IF NOT EXISTS sync_row_hash (
+                 table_name TEXT NOT NULL,
+                 row_id INTEGER NOT NULL,
+                 row_hash TEXT NOT NULL,
+                 PRIMARY KEY (table_name, row_id)) WITHOUT ROWID"""
     )
 
+    # Stable identity of this device in the central sync watermarks
     c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (2, 'What is the area size?')"
+        """CREATE TABLE IF NOT EXISTS sync_device (
+                 device_id TEXT PRIMARY KEY)"""
     )
     c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (2, 'What is the wind direction?')"
-    )
-    c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (2, 'Are there terrain changes?')"
+        "INSERT INTO sync_device (device_id) SELECT ? "
+        "WHERE NOT EXISTS (SELECT 1 FROM sync_device)",
+        (str(uuid.uuid4()),),
     )
 
-    c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (3, 'What is the station type?')"
-    )
-    c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (3, 'Is there visible corrosion?')"
-    )
-    c.execute(
-        "INSERT INTO questions (side_id, question) VALUES (3, 'Are there signs of condensation?')"
-    )
+    if seed_data:
+        # Insert admin user
+        c.execute(
+            "INSERT INTO users (username, password) SELECT 'admin', 'pass' "
+            "WHERE NOT EXISTS (SELECT 1 FROM users WHERE username = 'admin')"
+        )
+
+        # Insert some dummy data, once
+        c.execute("SELECT 1 FROM sides LIMIT 1")
+        if c.fetchone() is None:
+            for side_name, questions in DUMMY_SIDES.items():
+                c.execute(
+                    "INSERT INTO sides (side_name) VALUES (?)", (side_name,)
+                )
+                side_id = c.lastrowid
+                c.executemany(
+                    "INSERT INTO questions (side_id, question) VALUES (?, ?)",
+                    [(side_id, question) for question in questions],
+                )
 
+    c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
     conn.close()
+    return True
 
 
-setup_database()
+if __name__ == "__main__":
+    setup_database()
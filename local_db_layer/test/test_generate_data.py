@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+import pytest
+
+try:
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.setup_db import SCHEMA_VERSION, setup_database
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.setup_db import SCHEMA_VERSION, setup_database
+
+
+def count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return rows
+
+
+def test_setup_is_skipped_once_schema_is_current(tmp_path):
+    db_path = str(tmp_path / "inspection_data.db")
+
+    assert setup_database(db_path)
+    assert not setup_database(db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone() == (SCHEMA_VERSION,)
+    conn.close()
+    assert count(db_path, "sides") == 3
+    assert count(db_path, "questions") == 9
+    assert count(db_path, "users") == 1
+
+
+def test_setup_upgrades_database_without_duplicating_data(tmp_path):
+    """A database set up before versioning keeps its data as it is."""
+    db_path = str(tmp_path / "inspection_data.db")
+    setup_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    assert setup_database(db_path)
+    assert count(db_path, "sides") == 3
+    assert count(db_path, "users") == 1
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "normal", "zipf"])
+def test_generated_questions_follow_distribution(tmp_path, distribution):
+    db_path = str(tmp_path / "generated.db")
+
+    counts = generate_database(
+        db_path, sides=100, questions=5000, distribution=distribution
+    )
+
+    assert counts == {"sides": 100, "questions": 5000, "users": 10}
+    assert count(db_path, "questions") == 5000
+    assert count(db_path, "sync_changelog") == 5110  # All pending
+    conn = sqlite3.connect(db_path)
+    per_side = Counter(
+        side_id for side_id, in conn.execute("SELECT side_id FROM questions")
+    )
+    conn.close()
+    assert set(per_side) <= set(range(1, 101))
+    if distribution == "uniform":
+        assert set(per_side.values()) == {50}
+    if distribution == "zipf":
+        assert max(per_side.values()) > 500  # A few sides get most
+
+
+def test_generation_is_reproducible(tmp_path):
+    first, second = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    generate_database(first, sides=10, questions=100, distribution="zipf")
+    generate_database(second, sides=10, questions=100, distribution="zipf")
+
+    query = "SELECT * FROM questions ORDER BY id"
+    rows = [
+        sqlite3.connect(path).execute(query).fetchall()
+        for path in (first, second)
+    ]
+    assert rows[0] == rows[1]
+
+
+def test_existing_database_is_kept_unless_overwritten(tmp_path):
+    db_path = str(tmp_path / "inspection_data.db")
+    setup_database(db_path)
+
+    with pytest.raises(FileExistsError):
+        generate_database(db_path, sides=10, questions=10)
+    generate_database(db_path, sides=10, questions=10, overwrite=True)
+    assert count(db_path, "sides") == 10
+
+
+def test_search_index_is_built_after_bulk_load(tmp_path):
+    db_path = str(tmp_path / "generated.db")
+    generate_database(db_path, sides=200, questions=1000)
+
+    conn = sqlite3.connect(db_path)
+    for index in ("search_sides", "search_questions"):
+        conn.execute(
+            f"INSERT INTO {index} ({index}) VALUES ('integrity-check')"
+        )
+    indexed = conn.execute(
+        "SELECT COUNT(*) FROM search_questions "
+        "WHERE search_questions MATCH 'corrosion'"
+    ).fetchone()
+    scanned = conn.execute(
+        "SELECT COUNT(*) FROM questions WHERE question LIKE '%corrosion%'"
+    ).fetchone()
+    triggers = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master "
+        "WHERE type = 'trigger' AND name LIKE 'search_%'"
+    ).fetchone()
+    conn.close()
+    assert indexed == scanned
+    assert triggers == (6,)  # Maintained again
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import pytest
+
+try:
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.question_catalog import QuestionCatalog
+    from local_db_layer.repository import LocalRepository
+    from local_db_layer.setup_db import setup_database
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.generate_data import generate_database
+    from local_db_layer.question_catalog import QuestionCatalog
+    from local_db_layer.repository import LocalRepository
+    from local_db_layer.setup_db import setup_database
+
+
+class CountingRepository(LocalRepository):
+    """Repository counting the catalog's queries."""
+
+    queries = 0
+
+    def sides_with_questions(self, side_id=None):
+        self.queries += 1
+        return super().sides_with_questions(side_id)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    db_path = str(tmp_path / "inspection_data.db")
+    setup_database(db_path)
+    repository = CountingRepository(db_path)
+    yield repository
+    repository.close()
+
+
+def test_catalog_loads_in_one_query(repository):
+    catalog = QuestionCatalog(repository)
+
+    names = [side_name for _, side_name in catalog.sides()]
+    assert names == ["Side A", "Side B", "Side C"]
+    side_id = repository.side_id("Side C")
+    assert catalog.questions(side_id) == (
+        "What is the station type?",
+        "Is there visible corrosion?",
+        "Are there signs of condensation?",
+    )
+    assert catalog.questions(-1) == ()
+    assert repository.queries == 1
+
+
+def test_changed_sides_are_reloaded_one_by_one(repository):
+    catalog = QuestionCatalog(repository)
+    catalog.load()
+    side_a, side_b = repository.side_id("Side A"), repository.side_id("Side B")
+
+    side_d = repository.add_side("Side D")
+    catalog.invalidate(side_d)
+    repository.rename_side(side_a, "Side Z")
+    catalog.invalidate(side_a)
+    repository.delete_side(side_b)
+    catalog.invalidate(side_b)
+
+    assert catalog.sides()[0] == (side_a, "Side Z")  # Keeps its place
+    assert catalog.sides()[-1] == (side_d, "Side D")
+    assert catalog.questions(side_d) == ()
+    assert catalog.side_name(side_b) is None
+    assert len(catalog.questions(side_a)) == 3
+    assert repository.queries == 4
+
+
+def test_switching_sides_touches_no_disk(tmp_path):
+    db_path = str(tmp_path / "generated.db")
+    generate_database(db_path, sides=5000, questions=50000)
+    repository = CountingRepository(db_path)
+    catalog = QuestionCatalog(repository)
+    catalog.load()
+    repository.close()
+
+    assert sum(len(catalog.questions(i)) for i in range(1, 5001)) == 50000
+    assert repository.queries == 1
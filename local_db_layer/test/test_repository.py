@@ -0,0 +1,154 @@
+import os
+import sys
+import threading
+
+import pytest
+
+try:
+    from local_db_layer.repository import (
+        LocalRepository,
+        close_repositories,
+        get_repository,
+    )
+    from local_db_layer import setup_db
+    from local_db_layer.setup_db import setup_database
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.repository import (
+        LocalRepository,
+        close_repositories,
+        get_repository,
+    )
+    from local_db_layer import setup_db
+    from local_db_layer.setup_db import setup_database
+
+
+@pytest.fixture
+def repository(tmp_path):
+    db_path = str(tmp_path / "inspection_data.db")
+    setup_database(db_path)
+    repository = LocalRepository(db_path)
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def unindexed(tmp_path, monkeypatch):
+    """Repository of a database set up where trigram FTS5 is missing."""
+    monkeypatch.setattr(setup_db, "SEARCH_TOKENIZER", "unavailable")
+    db_path = str(tmp_path / "unindexed.db")
+    setup_database(db_path)
+    repository = LocalRepository(db_path)
+    yield repository
+    repository.close()
+
+
+def test_connection_is_kept_per_thread(repository):
+    conn = repository.connection()
+    assert repository.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert conn.execute("PRAGMA synchronous").fetchone() == (1,)  # NORMAL
+
+    others = []
+    thread = threading.Thread(
+        target=lambda: others.append(repository.connection())
+    )
+    thread.start()
+    thread.join()
+    assert others[0] is not conn
+
+
+def test_side_queries(repository):
+    assert repository.side_names() == ["Side A", "Side B", "Side C"]
+    side_id = repository.side_id("Side B")
+    assert repository.questions(side_id) == [
+        "What is the area size?",
+        "What is the wind direction?",
+        "Are there terrain changes?",
+    ]
+    assert repository.side_id("Side D") is None
+
+
+def test_side_edits(repository):
+    side_id = repository.add_side("Side D")
+    assert repository.side_id("Side D") == side_id
+
+    assert repository.rename_side(side_id, "Side E")
+    assert repository.side_id("Side E") == side_id
+    assert repository.delete_side(side_id)
+    assert not repository.delete_side(side_id)
+    assert repository.side_names() == ["Side A", "Side B", "Side C"]
+
+
+def test_side_pages(repository):
+    for i in range(10):
+        repository.add_side(f"Extra {i}")
+
+    first = repository.side_page(limit=5)
+    second = repository.side_page(after_id=first[-1][0], limit=5)
+    assert [name for _, name in first + second][2:5] == [
+        "Side C",
+        "Extra 0",
+        "Extra 1",
+    ]
+    assert len(repository.side_page(after_id=second[-1][0])) == 3
+    assert repository.sides_by_id([second[0][0], first[0][0]]) == [
+        first[0],
+        second[0],
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, names",
+    [
+        ("side b", ["Side B"]),  # Indexed, case-insensitive
+        ("CORROS", ["Side C"]),  # In a question
+        ("ide", ["Side A", "Side B", "Side C", "100%_ide"]),
+        ("%_", ["100%_ide"]),  # Scanned, not wildcards
+        ("zz", []),
+    ],
+)
+def test_search_side_ids(repository, unindexed, text, names):
+    for repo in (repository, unindexed):
+        repo.add_side("100%_ide")
+
+        side_ids = repo.search_side_ids(text)
+
+        assert [name for _, name in repo.sides_by_id(side_ids)] == names
+
+
+def test_search_index_follows_edits(repository):
+    side_id = repository.side_id("Side A")
+    repository.rename_side(side_id, "Harbour")
+    assert repository.search_side_ids("harb") == [side_id]
+    assert repository.search_side_ids("side a") == []
+
+    repository.delete_side(side_id)
+    assert repository.search_side_ids("harb") == []
+    assert repository.search_side_ids("noise level") == []  # Orphaned
+
+
+def test_setup_without_trigram_search(unindexed):
+    tables = unindexed.connection().execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE 'search_%'"
+    )
+    assert tables.fetchall() == []
+    assert unindexed.side_names() == ["Side A", "Side B", "Side C"]
+    side_id = unindexed.side_id("Side A")
+    unindexed.rename_side(side_id, "Harbour")
+    assert unindexed.search_side_ids("harb") == [side_id]
+
+
+def test_credentials(repository):
+    assert repository.check_credentials("admin", "pass")
+    assert not repository.check_credentials("admin", "wrong")
+
+
+def test_shared_repository_per_database(tmp_path):
+    db_path = str(tmp_path / "inspection_data.db")
+    repository = get_repository(db_path)
+
+    assert get_repository(os.path.relpath(db_path)) is repository
+    close_repositories()
+    assert get_repository(db_path) is not repository
+    close_repositories()
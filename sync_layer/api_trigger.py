@@ -1,32 +1,105 @@
-from flask import Flask, request
-import subprocess
 import os
+import sys
+import threading
+
+from flask import Flask, jsonify, request, url_for
+
+try:
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.sync_daemon import SyncDaemon, connect, load_authkey
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.sync_daemon import SyncDaemon, connect, load_authkey
+
+logger = get_logger(__name__)
 
 app = Flask(__name__)
 
+_daemon = None
+_daemon_lock = threading.Lock()
+
+
+def get_daemon():
+    """
+    Return the sync worker jobs are submitted to.
+
+    A worker started with ``python sync_layer/sync_daemon.py`` is used when
+    one is running and its key file can be read; otherwise a worker is
+    started inside this process.
+
+    :return: :class:`~sync_layer.sync_daemon.SyncDaemon` or a proxy to it
+    :raises ValueError: If the configured daemon key is too short
+    """
+    global _daemon
+
+    with _daemon_lock:
+        if _daemon is None:
+            try:
+                _daemon = connect()
+                logger.info("Using the running sync daemon.")
+            except ValueError as e:
+                # A key that is too short is a setup error, not a reason
+                # to run without the daemon
+                logger.error(f"Sync daemon key unusable: {e}")
+                raise
+            except OSError as e:
+                # No worker running, no key file, or a key file others
+                # could read: the in-process worker needs no socket
+                _daemon = SyncDaemon()
+                _daemon.start()
+                logger.info(
+                    f"No sync daemon reachable ({e}), started one in-process."
+                )
+        return _daemon
+
+
+def _reset_daemon():
+    global _daemon
+
+    with _daemon_lock:
+        _daemon = None
+
 
 @app.route("/trigger-sync", methods=["GET", "POST"])
 def trigger_sync():
     # Only trigger sync if it's a POST request
     if request.method == "POST":
-        # Expand the tilde to the full path
-        python_path = os.path.expanduser(
-            "~/workspace_interview/mo_proof_of_concept/venv/vMO_3.12/bin/python"
-        )
-        sync_script_path = os.path.expanduser(
-            "~/workspace_interview/mo_proof_of_concept/sync_layer/sync_db.py"
+        # Queue a job on the long-lived worker and answer straight away;
+        # concurrent triggers are coalesced into the same job
+        try:
+            job_id = get_daemon().submit()
+        except Exception as e:
+            _reset_daemon()  # e.g. the daemon process went away
+            return f"Sync could not be queued: {e}", 503
+        return (
+            jsonify(
+                job_id=job_id,
+                status_url=url_for("sync_status", job_id=job_id),
+            ),
+            202,
         )
-
-        result = subprocess.run(
-            [python_path, sync_script_path], capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            return "Sync successful", 200
-        else:
-            return f"Sync failed: {result.stderr}", 500
     else:
         return "This endpoint accepts POST requests to trigger sync.", 200
 
 
+@app.route("/sync-status/<job_id>", methods=["GET"])
+def sync_status(job_id):
+    try:
+        job = get_daemon().status(job_id)
+    except Exception as e:
+        _reset_daemon()
+        return f"Sync daemon unavailable: {e}", 503
+    if job is None:
+        return "Unknown sync job.", 404
+    return jsonify(job), 200
+
+
 if __name__ == "__main__":
+    # Fail at startup on a daemon key that is too short; a missing or
+    # unreadable key file only means the API runs its own worker
+    try:
+        load_authkey()
+    except OSError:
+        pass
     app.run(debug=True, port=10000)
@@ -0,0 +1,231 @@
+"""
+Sync and verification benchmark on the local Oracle stand-in.
+
+For each fixture size, a local DB holding that many sides and questions
+(all pending in the changelog) is generated once by
+:mod:`~local_db_layer.generate_data`. Each sync mode then runs in a fresh
+process against a fresh :mod:`~sync_layer.local_oracle` file: a full sync
+followed by a range-checksum verification. Reported per size and mode are
+the sync and verify throughput, the process's peak memory and the Oracle
+round trips, optionally with injected latency:
+
+    python sync_layer/benchmark.py --rows 10000 100000 --latency 20
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ModuleNotFoundError:  # Windows
+    resource = None
+
+try:
+    from local_db_layer.generate_data import generate_database
+    from sync_layer.db_connection import (
+        LOCAL_DB_VARIABLE,
+        LOCAL_LATENCY_VARIABLE,
+    )
+    from sync_layer.sync_db import MODE_INITIAL, MODE_ROW, MODE_STAGING
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from local_db_layer.generate_data import generate_database
+    from sync_layer.db_connection import (
+        LOCAL_DB_VARIABLE,
+        LOCAL_LATENCY_VARIABLE,
+    )
+    from sync_layer.sync_db import MODE_INITIAL, MODE_ROW, MODE_STAGING
+
+SIZES = (10000, 100000, 1000000)
+MODES = (MODE_ROW, MODE_STAGING, MODE_INITIAL)
+
+# One side per this many rows, the others are questions
+ROWS_PER_SIDE = 10
+
+
+def create_fixture(path, rows):
+    """
+    Generate a local DB with ``rows`` sides and questions, all pending.
+
+    :param path: Path of the SQLite file to create
+    :param rows: Total number of rows
+    """
+    sides = max(rows // ROWS_PER_SIDE, 1)
+    generate_database(
+        path, sides=sides, questions=rows - sides, users=0, overwrite=True
+    )
+
+
+def _peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024  # Kilobytes on Linux
+    return round(peak / 2**20, 1)
+
+
+def run_case(fixture, workdir, rows, mode, latency=0.0, parallelism=1):
+    """
+    Sync and verify one fixture in one mode; run in a fresh process.
+
+    :param fixture: Path of the generated local DB, copied before use
+    :param workdir: Directory for the copy and the stand-in file
+    :param rows: Number of rows in the fixture
+    :param mode: :data:`~sync_layer.sync_db.MODE_ROW`,
+                 :data:`~sync_layer.sync_db.MODE_STAGING` or
+                 :data:`~sync_layer.sync_db.MODE_INITIAL`
+    :param latency: Milliseconds added to every Oracle round trip
+    :param parallelism: Maximum number of tables synced concurrently
+    :return: Dict of results
+    """
+    local_db = os.path.join(workdir, f"local_{mode}.db")
+    central_db = os.path.join(workdir, f"central_{mode}.db")
+    shutil.copy(fixture, local_db)
+    os.environ[LOCAL_DB_VARIABLE] = central_db
+    os.environ[LOCAL_LATENCY_VARIABLE] = "0"
+
+    # Imported here, so the pool is created in this process
+    from sync_layer.db_connection import close_oracle_pool
+    from sync_layer.setup_oracle import setup_oracle_db
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_sync import verify_sync_ranges
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup_oracle_db(seed_data=False)
+    close_oracle_pool()
+    os.environ[LOCAL_LATENCY_VARIABLE] = str(latency)
+
+    if mode == MODE_INITIAL:
+        options = {"initial_load": True}
+    else:
+        options = {
+            "initial_load": False,
+            "modes": {"sides": mode, "questions": mode},
+        }
+    start = time.perf_counter()
+    report = sync_databases(
+        db_path=local_db, parallelism=parallelism, **options
+    )
+    sync_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        diffs = verify_sync_ranges(db_path=local_db)
+    verify_seconds = time.perf_counter() - start
+    close_oracle_pool()
+
+    return {
+        "rows": rows,
+        "mode": mode,
+        "sync_seconds": round(sync_seconds, 3),
+        "sync_rows_per_sec": round(rows / sync_seconds),
+        "verify_seconds": round(verify_seconds, 3),
+        "verify_rows_per_sec": round(rows / verify_seconds),
+        "round_trips": report["oracle"]["round_trips"],
+        "peak_memory_mb": _peak_memory_mb(),
+        "consistent": not any(
+            diff.missing or diff.extra or diff.changed for diff in diffs
+        ),
+    }
+
+
+def run_benchmark(
+    sizes=SIZES, modes=MODES, latency=0.0, parallelism=1, workdir=None
+):
+    """
+    Run every mode on fixtures of every size.
+
+    :param sizes: Numbers of rows of the fixtures
+    :param modes: Sync modes to run
+    :param latency: Milliseconds added to every Oracle round trip
+    :param parallelism: Maximum number of tables synced concurrently
+    :param workdir: Directory for the generated files, a temporary one
+                    (removed afterwards) by default
+    :return: List of result dicts, see :func:`run_case`
+    """
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="sync_benchmark_")
+    # The runs' metrics reports go with the generated files
+    os.environ.setdefault("SYNC_METRICS_DIR", workdir)
+    context = multiprocessing.get_context("spawn")
+    results = []
+    try:
+        for rows in sizes:
+            fixture = os.path.join(workdir, f"fixture_{rows}.db")
+            create_fixture(fixture, rows)
+            for mode in modes:
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    result = executor.submit(
+                        run_case,
+                        fixture,
+                        workdir,
+                        rows,
+                        mode,
+                        latency,
+                        parallelism,
+                    ).result()
+                print(format_result(result), flush=True)
+                results.append(result)
+            os.remove(fixture)
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def format_result(result):
+    """
+    Render one result as a table row.
+
+    :param result: Result dict from :func:`run_case`
+    :return: Text line
+    """
+    return (
+        f"{result['rows']:>9} {result['mode']:<8} "
+        f"{result['sync_rows_per_sec']:>11}/s "
+        f"{result['verify_rows_per_sec']:>11}/s "
+        f"{result['round_trips']:>8} {result['peak_memory_mb']:>9} "
+        f"{'yes' if result['consistent'] else 'NO':>10}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=SIZES, help="Fixture sizes."
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=MODES, default=MODES, help="Sync modes."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Milliseconds added to every Oracle round trip.",
+    )
+    parser.add_argument(
+        "--parallelism", type=int, default=1, help="Tables synced at once."
+    )
+    parser.add_argument("--output", help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>9} {'mode':<8} {'sync':>13} {'verify':>13} "
+        f"{'trips':>8} {'peak MB':>9} {'consistent':>10}"
+    )
+    results = run_benchmark(
+        args.rows, args.modes, args.latency, args.parallelism
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -1,18 +1,52 @@
 import os
 import sqlite3
 import sys
+import threading
 
 import cx_Oracle
 from dotenv import load_dotenv
 
 try:
     from core_functionalities.app_logging import get_logger
+    from sync_layer import local_oracle
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     from core_functionalities.app_logging import get_logger
+    from sync_layer import local_oracle
 
 logger = get_logger(__name__)
 
+# Process-wide Oracle session pool, created on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+# Pool settings, overridable through the environment / .env file
+POOL_DEFAULTS = {
+    "ORACLE_POOL_MIN": 1,
+    "ORACLE_POOL_MAX": 4,
+    "ORACLE_POOL_INCREMENT": 1,
+    "ORACLE_STMT_CACHE_SIZE": 50,
+    # Seconds a session may sit idle before it is pinged on acquire
+    "ORACLE_POOL_PING_INTERVAL": 60,
+    # Seconds after which idle sessions above the minimum are closed
+    "ORACLE_POOL_TIMEOUT": 300,
+    # Milliseconds to wait for a free session when the pool is exhausted
+    "ORACLE_POOL_WAIT_TIMEOUT": 60000,
+    # Milliseconds a single round trip may take, e.g. waiting on row locks
+    # held by another device's sync, before it fails with DPI-1067
+    "ORACLE_CALL_TIMEOUT": 300000,
+}
+
+# File of the local Oracle stand-in (see sync_layer/local_oracle.py), used
+# instead of the Oracle instance when set, and the milliseconds of latency
+# it adds to every round trip
+LOCAL_DB_VARIABLE = "ORACLE_LOCAL_DB"
+LOCAL_LATENCY_VARIABLE = "ORACLE_LOCAL_LATENCY"
+
+# Seconds a SQLite statement waits for a lock held by another connection
+# (e.g. a GUI write) before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+
 
 def load_environment():
     """
@@ -48,52 +82,157 @@ def load_environment():
     os.environ["ORACLE_SERVICE_NAME"] = os.getenv("ORACLE_SERVICE_NAME", "")
 
 
+def _pool_setting(name):
+    """
+    Read an integer pool setting from the environment.
+
+    :param name: Environment variable name, a key of ``POOL_DEFAULTS``
+    :return: Configured value or its default
+    """
+    return int(os.getenv(name, POOL_DEFAULTS[name]))
+
+
+def _log_session_diagnostics(connection):
+    """
+    Log who and where the pool's sessions are connected to.
+
+    Runs once per pool instead of once per connection or table.
+
+    :param connection: cx_Oracle connection object
+    """
+    cursor = connection.cursor()
+    cursor.execute(
+        """
+        SELECT user,
+               sys_context('USERENV', 'CURRENT_SCHEMA'),
+               sys_context('USERENV', 'CON_NAME')
+        FROM dual
+        """
+    )
+    user, schema, pdb_name = cursor.fetchone()
+    cursor.close()
+    logger.info(f"Connected to Oracle DB as user: {user}, schema: {schema}")
+    logger.info(f"Connected to PDB: {pdb_name}")
+
+
+def get_oracle_pool():
+    """
+    Return the process-wide Oracle session pool, creating it on first use.
+
+    The environment is loaded and the session diagnostics are logged only
+    when the pool is created. Idle sessions are pinged before being handed
+    out again, so dropped connections are replaced transparently. When all
+    sessions are busy, acquiring waits up to ``ORACLE_POOL_WAIT_TIMEOUT``
+    milliseconds.
+
+    With ``ORACLE_LOCAL_DB`` set, the pool hands out sessions of the
+    :mod:`~sync_layer.local_oracle` stand-in file instead.
+
+    :return: cx_Oracle SessionPool object
+    :raises cx_Oracle.Error: If the pool cannot be created.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+
+        local_db = os.getenv(LOCAL_DB_VARIABLE)
+        try:
+            if local_db:
+                pool = local_oracle.SessionPool(
+                    local_db,
+                    min=_pool_setting("ORACLE_POOL_MIN"),
+                    max=_pool_setting("ORACLE_POOL_MAX"),
+                    latency=float(os.getenv(LOCAL_LATENCY_VARIABLE, "0"))
+                    / 1000,
+                    wait_timeout=_pool_setting("ORACLE_POOL_WAIT_TIMEOUT"),
+                )
+            else:
+                load_environment()  # Load environment variables
+                dsn = cx_Oracle.makedsn(
+                    os.getenv("ORACLE_HOST"),
+                    os.getenv("ORACLE_PORT"),
+                    service_name=os.getenv("ORACLE_SERVICE_NAME"),
+                )
+                pool = cx_Oracle.SessionPool(
+                    user=os.getenv("ORACLE_USER"),
+                    password=os.getenv("ORACLE_PASSWORD"),
+                    dsn=dsn,
+                    min=_pool_setting("ORACLE_POOL_MIN"),
+                    max=_pool_setting("ORACLE_POOL_MAX"),
+                    increment=_pool_setting("ORACLE_POOL_INCREMENT"),
+                    threaded=True,
+                    getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,
+                    wait_timeout=_pool_setting("ORACLE_POOL_WAIT_TIMEOUT"),
+                    stmtcachesize=_pool_setting("ORACLE_STMT_CACHE_SIZE"),
+                    ping_interval=_pool_setting("ORACLE_POOL_PING_INTERVAL"),
+                    timeout=_pool_setting("ORACLE_POOL_TIMEOUT"),
+                )
+
+            connection = pool.acquire()
+            try:
+                _log_session_diagnostics(connection)
+            finally:
+                pool.release(connection)
+
+            logger.info(
+                f"Oracle session pool created "
+                f"(min={pool.min}, max={pool.max})."
+            )
+            _pool = pool
+            return _pool
+        except cx_Oracle.Error as e:
+            logger.error(f"Error connecting to Oracle DB: {e}")
+            raise
+
+
+def close_oracle_pool():
+    """
+    Close the process-wide Oracle session pool, if it was created.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close(force=True)
+            _pool = None
+            logger.info("Oracle session pool closed.")
+
+
 def get_oracle_connection():
     """
-    Establish a connection to the Oracle database using environment variables.
+    Acquire a connection to the Oracle database from the session pool.
+
+    Closing the returned connection releases it back to the pool. Each
+    round trip is bounded by ``ORACLE_CALL_TIMEOUT`` milliseconds, so a
+    statement blocked on locks fails (and is rolled back by the caller)
+    instead of hanging the sync.
 
     :return: cx_Oracle connection object
     :raises cx_Oracle.Error: If Oracle DB connection fails.
     """
-    load_environment()  # Load environment variables
     try:
-        dsn = cx_Oracle.makedsn(
-            os.getenv("ORACLE_HOST"),
-            os.getenv("ORACLE_PORT"),
-            service_name=os.getenv("ORACLE_SERVICE_NAME"),
-        )
-        connection = cx_Oracle.connect(
-            user=os.getenv("ORACLE_USER"),
-            password=os.getenv("ORACLE_PASSWORD"),
-            dsn=dsn,
-        )
-        cursor = connection.cursor()
-
-        # Log the connection details for confirmation
-        cursor.execute(
-            "SELECT user, sys_context('USERENV', 'CURRENT_SCHEMA') FROM dual"
-        )
-        user_info = cursor.fetchone()
-        logger.info(
-            f"Connected to Oracle DB as user: {user_info[0]}, schema: {user_info[1]}"
-        )
-
-        cursor.execute("SELECT sys_context('USERENV', 'CON_NAME') FROM dual")
-        pdb_name = cursor.fetchone()
-        logger.info(f"Connected to PDB: {pdb_name[0]}")
-
-        logger.info("Connected to Oracle DB successfully.")
+        connection = get_oracle_pool().acquire()
+        connection.call_timeout = _pool_setting("ORACLE_CALL_TIMEOUT")
         return connection
     except cx_Oracle.Error as e:
-        logger.error(f"Error connecting to Oracle DB: {e}")
+        logger.error(f"Error acquiring Oracle DB connection: {e}")
         raise
 
 
-def get_sqlite_connection(db_path=None):
+def get_sqlite_connection(db_path=None, check_same_thread=True):
     """
     Establish a connection to the SQLite database.
 
+    The database is switched to write-ahead logging, so readers (a sync
+    streaming out) and the writer (the GUI) no longer block each other,
+    and statements wait up to :data:`SQLITE_BUSY_TIMEOUT` seconds for
+    locks held by other connections.
+
     :param db_path: Path to the SQLite database file.
+    :param check_same_thread: Restrict the connection to the thread that
+                              created it
     :return: SQLite connection object
     """
     if db_path is None:
@@ -103,9 +242,40 @@ def get_sqlite_connection(db_path=None):
 
     db_full_path = os.path.abspath(db_path)
     try:
-        conn = sqlite3.connect(db_full_path)
+        conn = sqlite3.connect(
+            db_full_path,
+            timeout=SQLITE_BUSY_TIMEOUT,
+            check_same_thread=check_same_thread,
+        )
         logger.info(f"Connected successfully to SQLite DB at {db_full_path}.")
-        return conn
     except sqlite3.Error as e:
         logger.error(f"Error connecting to SQLite DB: {e}")
         raise
+
+    # Persistent once set; a no-op for databases already in WAL mode
+    try:
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    except sqlite3.OperationalError as e:
+        mode = str(e)
+    if mode.lower() != "wal":
+        logger.warning(f"SQLite DB not in WAL mode ({mode}).")
+    return conn
+
+
+def get_sqlite_snapshot(db_path=None, shared=False):
+    """
+    Open a SQLite connection holding a read transaction.
+
+    Every query on the connection sees the database as it was when the
+    transaction started, until the connection is closed. In WAL mode the
+    snapshot does not block writers.
+
+    :param db_path: Path to the SQLite database file.
+    :param shared: Allow the connection to be used from several threads
+    :return: SQLite connection object
+    """
+    conn = get_sqlite_connection(db_path, check_same_thread=not shared)
+    conn.execute("BEGIN")
+    # The snapshot is taken by the first read of the transaction
+    conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+    return conn
@@ -0,0 +1,799 @@
+"""
+Local stand-in for the central Oracle DB.
+
+Implements the part of the cx_Oracle API used by the sync layer (session
+pool, connections, cursors with array DML and batch errors) on top of a
+SQLite file, and translates the Oracle SQL the sync layer issues: MERGE
+from ``dual`` or from a staging table (with ``LOG ERRORS``), global
+temporary tables, ``DBMS_ERRLOG``, the data dictionary views read by the
+schema catalog and the hash functions of the range verification.
+
+It lets the sync be run, tested and benchmarked without an Oracle
+instance: with ``ORACLE_LOCAL_DB`` set to a file path,
+:func:`~sync_layer.db_connection.get_oracle_pool` hands out sessions of
+the stand-in, and ``ORACLE_LOCAL_LATENCY`` adds the given milliseconds to
+every round trip to mimic a field device's link. Provision the schema
+with ``python sync_layer/setup_oracle.py --no-seed`` as for Oracle.
+
+Round trips follow Oracle's protocol: one per execute, commit and
+rollback, query rows arriving ``prefetchrows`` with the execute and
+``arraysize`` per fetch after that. Row locking is not emulated: a
+session holds the database from its first write until it commits.
+"""
+
+import collections
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+
+import cx_Oracle
+
+# Schema prefix of the sync layer's statements; the file has a single one
+SCHEMA = "SYSTEM"
+
+# Rows returned with the execute round trip of a query, and per fetch
+DEFAULT_PREFETCH_ROWS = 2
+DEFAULT_ARRAY_SIZE = 100
+
+# Seconds a session waits for the write lock held by another session
+BUSY_TIMEOUT = 60
+
+# Registry of the global temporary tables, created per session as TEMP
+# tables shadowing their (empty) definition in the file
+TEMPORARY_TABLES = "standin_temporary_tables"
+
+# Columns DBMS_ERRLOG adds in front of the logged table's columns
+ERROR_LOG_COLUMNS = (
+    "ora_err_number$",
+    "ora_err_mesg$",
+    "ora_err_rowid$",
+    "ora_err_optyp$",
+    "ora_err_tag$",
+)
+
+# Statement kinds
+QUERY = "query"
+DML = "dml"
+DDL = "ddl"
+MERGE_LOGGED = "merge_logged"
+CREATE_TEMPORARY = "create_temporary"
+DROP = "drop"
+ERROR_LOG = "error_log"
+NOOP = "noop"
+
+Translation = collections.namedtuple(
+    "Translation", ["kind", "sql", "details"], defaults=[None]
+)
+Translation.__doc__ = """
+SQLite rendering of an Oracle statement.
+
+``details`` holds what the kinds executed by the stand-in itself need,
+e.g. the table name of :data:`DROP`.
+"""
+
+BatchError = collections.namedtuple(
+    "BatchError", ["offset", "code", "message"]
+)
+BatchError.__doc__ = """
+Row rejected by ``executemany(..., batcherrors=True)``, as returned by
+``cursor.getbatcherrors()``.
+"""
+
+_DICTIONARY_VIEWS = (
+    # Tables of the file, as Oracle reports them (upper case)
+    f"""
+    CREATE TEMP VIEW IF NOT EXISTS user_tables AS
+    SELECT upper(name) AS table_name FROM main.sqlite_master
+    WHERE type = 'table' AND name NOT LIKE 'sqlite%'
+        AND name NOT IN ('dual', '{TEMPORARY_TABLES}')
+    """,
+    f"""
+    CREATE TEMP VIEW IF NOT EXISTS all_tab_columns AS
+    SELECT '{SCHEMA}' AS owner, t.table_name,
+           upper(p.name) AS column_name, p.cid + 1 AS column_id
+    FROM user_tables t, pragma_table_info(t.table_name) p
+    """,
+    f"""
+    CREATE TEMP VIEW IF NOT EXISTS all_tab_identity_cols AS
+    SELECT '{SCHEMA}' AS owner, t.table_name, upper(p.name) AS column_name
+    FROM user_tables t, pragma_table_info(t.table_name) p
+    WHERE p.pk = 1 AND upper(p.type) = 'INTEGER'
+    """,
+    # Any DDL bumps the schema version, standing in for last_ddl_time
+    f"""
+    CREATE TEMP VIEW IF NOT EXISTS all_objects AS
+    SELECT '{SCHEMA}' AS owner, table_name AS object_name,
+           'TABLE' AS object_type,
+           (SELECT schema_version FROM pragma_schema_version)
+               AS last_ddl_time
+    FROM user_tables
+    """,
+)
+
+_translations = {}
+_translations_lock = threading.Lock()
+
+_POSITIONAL_BIND = re.compile(r":(\d+)\b")
+_SCHEMA_PREFIX = re.compile(rf"\b{SCHEMA}\.", re.I)
+_ROWNUM = re.compile(r"\s+WHERE\s+ROWNUM\s*=\s*1\b", re.I)
+_SYSTIMESTAMP = re.compile(r"\bSYSTIMESTAMP\b", re.I)
+_IDENTITY = re.compile(
+    r"\bNUMBER\s+GENERATED\s+(?:ALWAYS|BY\s+DEFAULT(?:\s+ON\s+NULL)?)"
+    r"\s+AS\s+IDENTITY\b",
+    re.I,
+)
+_MERGE = re.compile(
+    r"""
+    MERGE\s+INTO\s+(?P<target>\w+)\s+(?P<d>\w+)\s+
+    USING\s+(?P<source>\(.*?\)|\w+)\s+(?P<s>\w+)\s+
+    ON\s*\((?P<on>.*?)\)\s+
+    WHEN\s+MATCHED\s+THEN\s+UPDATE\s+SET\s+(?P<set>.*?)
+    (?:\s+WHERE\s+(?P<guard>.*?))?\s+
+    WHEN\s+NOT\s+MATCHED\s+THEN\s+
+    INSERT\s*\((?P<columns>[^)]*)\)\s*VALUES\s*\((?P<values>[^)]*)\)
+    (?:\s+LOG\s+ERRORS\s+INTO\s+(?P<errors>\w+)\s*\([^)]*\)
+        \s+REJECT\s+LIMIT\s+UNLIMITED)?
+    \s*$
+    """,
+    re.I | re.S | re.X,
+)
+_CREATE_TEMPORARY = re.compile(
+    r"CREATE\s+GLOBAL\s+TEMPORARY\s+TABLE\s+(?P<table>\w+)\s+"
+    r"ON\s+COMMIT\s+(?P<on_commit>DELETE|PRESERVE)\s+ROWS\s+"
+    r"AS\s+(?P<query>SELECT.*)$",
+    re.I | re.S,
+)
+_DROP = re.compile(
+    r"DROP\s+TABLE\s+(?P<table>\w+)"
+    r"(?:\s+CASCADE\s+CONSTRAINTS)?(?:\s+PURGE)?\s*$",
+    re.I,
+)
+_RESET_IDENTITY = re.compile(r"ALTER\s+TABLE\s+.*\bIDENTITY\b", re.I | re.S)
+_ERROR_LOG = re.compile(
+    r"BEGIN\s+DBMS_ERRLOG\.CREATE_ERROR_LOG\s*\(\s*\?1\s*,\s*\?2\s*\)\s*;"
+    r"\s*END\s*;?$",
+    re.I,
+)
+
+
+def _qualify(expression, alias, prefix):
+    return re.sub(rf"\b{alias}\.(\w+)", rf"{prefix}\1", expression)
+
+
+def _translate_merge(match):
+    target, d, s = match["target"], match["d"], match["s"]
+    conflict = [
+        _qualify(condition.split("=")[0], d, "").strip()
+        for condition in re.split(r"\s+AND\s+", match["on"], flags=re.I)
+    ]
+    assignments = []
+    for assignment in match["set"].split(","):
+        column, value = assignment.split("=", 1)
+        value = _qualify(value.strip(), s, "excluded.")
+        value = _qualify(value, d, f"{target}.")
+        assignments.append(f"{_qualify(column, d, '').strip()} = {value}")
+
+    source = match["source"]
+    sql = (
+        f"INSERT INTO {target} ({match['columns']}) "
+        f"SELECT {match['values']} FROM {source} {s} WHERE true "
+        f"ON CONFLICT ({', '.join(conflict)}) "
+        f"DO UPDATE SET {', '.join(assignments)}"
+    )
+    if match["guard"]:
+        guard = _qualify(_qualify(match["guard"], s, "excluded."), d, "")
+        sql += f" WHERE {guard}"
+    if not match["errors"]:
+        return Translation(DML, sql)
+    # Re-run row by row from a one-row source when a row is rejected
+    row_sql = sql.replace(f"FROM {source} {s}", f"FROM ({{row}}) {s}", 1)
+    return Translation(
+        MERGE_LOGGED, sql, (source, match["errors"], row_sql)
+    )
+
+
+def translate(statement):
+    """
+    Translate an Oracle statement of the sync layer to SQLite.
+
+    Translations are cached by statement text, like Oracle's statement
+    cache.
+
+    :param statement: Oracle SQL or PL/SQL block
+    :return: :data:`Translation`
+    :raises cx_Oracle.NotSupportedError: For statements the stand-in does
+                                         not understand
+    :raises cx_Oracle.DatabaseError: For SQL repeating a positional bind
+    """
+    with _translations_lock:
+        translation = _translations.get(statement)
+    if translation is not None:
+        return translation
+
+    sql = statement.strip()
+    if not sql.upper().startswith("BEGIN"):
+        sql = sql.rstrip(";")  # Only PL/SQL blocks end with one
+        # SQL binds positional placeholders by occurrence, so a repeated
+        # one needs a value per occurrence; SQLite's ?N would reuse it
+        positional = _POSITIONAL_BIND.findall(sql)
+        if len(positional) != len(set(positional)):
+            raise cx_Oracle.DatabaseError(
+                f"ORA-01008: not all variables bound, repeated positional "
+                f"placeholder in: {sql}"
+            )
+    sql = _SCHEMA_PREFIX.sub("", sql)
+    sql = _ROWNUM.sub(" LIMIT 1", sql)
+    sql = _SYSTIMESTAMP.sub("CURRENT_TIMESTAMP", sql)
+    sql = _POSITIONAL_BIND.sub(r"?\1", sql)
+    keyword = re.sub(r"/\*.*?\*/", " ", sql, flags=re.S).split(None, 1)[0]
+    keyword = keyword.upper()
+
+    if keyword in ("SELECT", "WITH"):
+        translation = Translation(QUERY, sql)
+    elif keyword == "MERGE":
+        match = _MERGE.match(sql)
+        if match is None:
+            raise cx_Oracle.NotSupportedError(f"Unsupported MERGE: {sql}")
+        translation = _translate_merge(match)
+    elif keyword in ("INSERT", "UPDATE", "DELETE"):
+        translation = Translation(DML, sql)
+    elif _CREATE_TEMPORARY.match(sql):
+        match = _CREATE_TEMPORARY.match(sql)
+        translation = Translation(
+            CREATE_TEMPORARY,
+            f"CREATE TABLE {match['table']} AS {match['query']}",
+            (match["table"], match["on_commit"].upper()),
+        )
+    elif _DROP.match(sql):
+        translation = Translation(DROP, None, _DROP.match(sql)["table"])
+    elif _RESET_IDENTITY.match(sql):
+        # INTEGER PRIMARY KEY always continues after the highest key
+        translation = Translation(NOOP, None)
+    elif keyword in ("CREATE", "ALTER", "TRUNCATE"):
+        translation = Translation(DDL, _IDENTITY.sub("INTEGER", sql))
+    elif _ERROR_LOG.match(sql):
+        translation = Translation(ERROR_LOG, None)
+    else:
+        raise cx_Oracle.NotSupportedError(f"Unsupported statement: {sql}")
+
+    with _translations_lock:
+        _translations[statement] = translation
+    return translation
+
+
+def _oracle_error(error):
+    """
+    Map a SQLite error to the cx_Oracle exception Oracle would raise.
+    """
+    message = str(error)
+    if "NOT NULL" in message:
+        return cx_Oracle.IntegrityError(f"ORA-01400: {message}")
+    if "FOREIGN KEY" in message:
+        return cx_Oracle.IntegrityError(f"ORA-02291: {message}")
+    if isinstance(error, sqlite3.IntegrityError):
+        return cx_Oracle.IntegrityError(f"ORA-00001: {message}")
+    if "locked" in message or "busy" in message:
+        return cx_Oracle.DatabaseError(f"ORA-00054: {message}")
+    return cx_Oracle.DatabaseError(f"ORA-00900: {message}")
+
+
+def _bind_value(value):
+    # Oracle stores empty strings as NULL
+    return None if value == "" else value
+
+
+def _parameters(parameters=None, keyword_parameters=None):
+    if keyword_parameters:
+        parameters = dict(parameters or {}, **keyword_parameters)
+    if parameters is None:
+        return ()
+    if isinstance(parameters, dict):
+        return {k: _bind_value(v) for k, v in parameters.items()}
+    return tuple(_bind_value(value) for value in parameters)
+
+
+def _to_char(value):
+    # Oracle's || skips NULLs where SQLite's yields NULL; TO_CHAR is only
+    # concatenated by the sync layer, so NULL renders as ''
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _to_number(value, number_format=None):
+    if value is None:
+        return None
+    if number_format and set(number_format.upper()) == {"X"}:
+        return int(value, 16)
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _standard_hash(value, algorithm="SHA1"):
+    if value is None:
+        return None
+    return hashlib.new(algorithm.lower(), str(value).encode("utf-8")).digest()
+
+
+def _sys_context(namespace, parameter):
+    return {"CURRENT_SCHEMA": SCHEMA, "CON_NAME": "LOCAL"}.get(
+        parameter.upper()
+    )
+
+
+_FUNCTIONS = (
+    ("to_char", 1, _to_char),
+    ("to_number", 1, _to_number),
+    ("to_number", 2, _to_number),
+    ("standard_hash", 1, _standard_hash),
+    ("standard_hash", 2, _standard_hash),
+    ("rawtohex", 1, lambda raw: None if raw is None else raw.hex().upper()),
+    ("chr", 1, chr),
+    ("floor", 1, lambda value: None if value is None else math.floor(value)),
+)
+
+
+class _Session:
+    """
+    SQLite connection standing in for one Oracle session.
+    """
+
+    def __init__(self, db_path):
+        conn = sqlite3.connect(
+            db_path,
+            timeout=BUSY_TIMEOUT,
+            isolation_level=None,  # Transactions are managed below
+            check_same_thread=False,  # Sessions move between threads
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        for name, arguments, function in _FUNCTIONS:
+            conn.create_function(name, arguments, function, deterministic=True)
+        conn.create_function("sys_context", 2, _sys_context)
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("CREATE TABLE IF NOT EXISTS dual (dummy TEXT, user TEXT)")
+        conn.execute(
+            f"INSERT INTO dual SELECT 'X', '{SCHEMA}' "
+            f"WHERE NOT EXISTS (SELECT 1 FROM dual)"
+        )
+        conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {TEMPORARY_TABLES} (
+                     table_name TEXT PRIMARY KEY,
+                     on_commit TEXT NOT NULL)"""
+        )
+        conn.execute("COMMIT")
+        for view in _DICTIONARY_VIEWS:
+            conn.execute(view)
+
+        self.conn = conn
+        self.temporary = {}  # Temporary table name -> "DELETE"/"PRESERVE"
+        self.refresh_temporary_tables()
+
+    def refresh_temporary_tables(self):
+        """Create the session's copies of new global temporary tables."""
+        rows = self.conn.execute(
+            f"SELECT table_name, on_commit FROM {TEMPORARY_TABLES}"
+        ).fetchall()
+        for table, on_commit in rows:
+            if table.lower() not in self.temporary:
+                self.conn.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {table} AS "
+                    f"SELECT * FROM main.{table} WHERE 0"
+                )
+                self.temporary[table.lower()] = on_commit
+
+    def begin(self):
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+
+    def end(self, statement):
+        if self.conn.in_transaction:
+            self.conn.execute(statement)
+        for table, on_commit in self.temporary.items():
+            if on_commit == "DELETE":
+                self.conn.execute(f"DELETE FROM temp.{table}")
+
+    def close(self):
+        self.conn.close()
+
+
+class Cursor:
+    """
+    Stand-in for a cx_Oracle cursor.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.arraysize = DEFAULT_ARRAY_SIZE
+        self.prefetchrows = DEFAULT_PREFETCH_ROWS
+        self.description = None
+        self.rowcount = 0
+        self._cursor = None
+        self._rows = collections.deque()
+        self._exhausted = True
+        self._batch_errors = []
+
+    @property
+    def _session(self):
+        return self.connection._active_session()
+
+    def _read_ahead(self, rows):
+        block = self._cursor.fetchmany(rows) if rows else []
+        self._rows.extend(block)
+        self._exhausted = len(block) < rows
+
+    def execute(self, statement, parameters=None, **keyword_parameters):
+        """
+        Execute a statement, with positional or named bind values.
+
+        :return: The cursor for queries, None otherwise
+        """
+        translation = translate(statement)
+        parameters = _parameters(parameters, keyword_parameters)
+        self.connection._round_trip()
+        self.description = None
+        self._rows.clear()
+        self._exhausted = True
+        try:
+            self._execute(translation, parameters)
+        except sqlite3.Error as e:
+            raise _oracle_error(e) from e
+        if translation.kind != QUERY:
+            return None
+        self.description = [
+            (column[0].upper(),) + tuple(column[1:])
+            for column in self._cursor.description
+        ]
+        self._read_ahead(self.prefetchrows)  # Same round trip
+        return self
+
+    def _execute(self, translation, parameters):
+        session = self._session
+        conn = session.conn
+        kind = translation.kind
+        if kind == QUERY:
+            self._cursor = conn.execute(translation.sql, parameters)
+        elif kind == DML:
+            session.begin()
+            self._cursor = conn.execute(translation.sql, parameters)
+            self.rowcount = self._cursor.rowcount
+        elif kind == MERGE_LOGGED:
+            session.begin()
+            self.rowcount = self._merge_logged(conn, translation, parameters)
+        elif kind in (DDL, CREATE_TEMPORARY, DROP, ERROR_LOG):
+            session.end("COMMIT")  # DDL commits, as in Oracle
+            self._execute_ddl(session, translation, parameters)
+        # NOOP: nothing to do beyond the round trip
+
+    def _execute_ddl(self, session, translation, parameters):
+        conn = session.conn
+        if translation.kind == DDL:
+            conn.execute(translation.sql)
+        elif translation.kind == CREATE_TEMPORARY:
+            table, on_commit = translation.details
+            conn.execute(translation.sql)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {TEMPORARY_TABLES} VALUES (?, ?)",
+                (table, on_commit),
+            )
+            session.refresh_temporary_tables()
+        elif translation.kind == DROP:
+            table = translation.details
+            conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+            conn.execute(f"DROP TABLE main.{table}")
+            conn.execute(
+                f"DELETE FROM {TEMPORARY_TABLES} "
+                f"WHERE lower(table_name) = lower(?)",
+                (table,),
+            )
+            session.temporary.pop(table.lower(), None)
+        else:
+            table, error_table = parameters
+            columns = [
+                row[1]
+                for row in conn.execute(f"PRAGMA main.table_info({table})")
+            ]
+            definitions = [
+                "ora_err_number$ INTEGER",
+                "ora_err_mesg$ TEXT",
+                "ora_err_rowid$ TEXT",
+                "ora_err_optyp$ TEXT",
+                "ora_err_tag$ TEXT",
+            ] + [f"{column} TEXT" for column in columns]
+            conn.execute(
+                f"CREATE TABLE {error_table} ({', '.join(definitions)})"
+            )
+
+    def _merge_logged(self, conn, translation, parameters):
+        """
+        Run a set-based MERGE, logging the rows it rejects.
+
+        The MERGE runs in one statement; only when it fails is it rolled
+        back and re-run row by row, rejected rows going to the error log.
+        """
+        source, error_table, row_sql = translation.details
+        (tag,) = parameters
+        conn.execute("SAVEPOINT merge_logged")
+        try:
+            count = conn.execute(translation.sql).rowcount
+            conn.execute("RELEASE merge_logged")
+            return count
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO merge_logged")
+            conn.execute("RELEASE merge_logged")
+
+        rows = conn.execute(f"SELECT * FROM {source}")
+        columns = [column[0] for column in rows.description]
+        row_source = "SELECT " + ", ".join(
+            f"?{i + 1} AS {column}" for i, column in enumerate(columns)
+        )
+        logged = {
+            row[1].lower()
+            for row in conn.execute(f"PRAGMA table_info({error_table})")
+        }
+        log_columns = [c for c in columns if c.lower() in logged]
+        log_sql = (
+            f"INSERT INTO {error_table} (ora_err_number$, ora_err_mesg$, "
+            f"ora_err_optyp$, ora_err_tag$, {', '.join(log_columns)}) "
+            f"VALUES (?, ?, 'I', ?, "
+            f"{', '.join('?' for _ in log_columns)})"
+        )
+        count = 0
+        for row in rows.fetchall():
+            try:
+                count += conn.execute(
+                    row_sql.format(row=row_source), row
+                ).rowcount
+            except sqlite3.Error as e:
+                error = _oracle_error(e)
+                number = int(str(error)[4:9])
+                values = [row[columns.index(c)] for c in log_columns]
+                conn.execute(log_sql, [number, str(error), tag] + values)
+        return count
+
+    def executemany(
+        self, statement, parameters, batcherrors=False, **keyword_parameters
+    ):
+        """
+        Execute a DML statement once per row of bind values, in one round
+        trip. With ``batcherrors``, rejected rows are reported by
+        :meth:`getbatcherrors` instead of stopping the batch.
+        """
+        translation = translate(statement)
+        rows = [_parameters(row) for row in parameters]
+        self.connection._round_trip()
+        self.description = None
+        self._batch_errors = []
+        session = self._session
+        conn = session.conn
+        if translation.kind != DML:
+            raise cx_Oracle.NotSupportedError(
+                f"executemany() of a {translation.kind} statement"
+            )
+        session.begin()
+        if not batcherrors:
+            try:
+                cursor = conn.executemany(translation.sql, rows)
+            except sqlite3.Error as e:
+                raise _oracle_error(e) from e
+            self.rowcount = cursor.rowcount
+            return
+
+        conn.execute("SAVEPOINT batch")
+        try:
+            self.rowcount = conn.executemany(translation.sql, rows).rowcount
+            conn.execute("RELEASE batch")
+            return
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO batch")
+            conn.execute("RELEASE batch")
+
+        self.rowcount = 0
+        for offset, row in enumerate(rows):
+            try:
+                self.rowcount += conn.execute(translation.sql, row).rowcount
+            except sqlite3.Error as e:
+                error = _oracle_error(e)
+                self._batch_errors.append(
+                    BatchError(offset, int(str(error)[4:9]), str(error))
+                )
+
+    def getbatcherrors(self):
+        """
+        Return the rows rejected by the last :meth:`executemany`.
+
+        :return: List of :data:`BatchError`
+        """
+        return list(self._batch_errors)
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        while len(self._rows) < size and not self._exhausted:
+            self.connection._round_trip()
+            self._read_ahead(self.arraysize)
+        size = min(size, len(self._rows))
+        return [self._rows.popleft() for _ in range(size)]
+
+    def fetchall(self):
+        while not self._exhausted:
+            self.connection._round_trip()
+            self._read_ahead(self.arraysize)
+        rows = list(self._rows)
+        self._rows.clear()
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._rows.clear()
+        self._cursor = None
+
+
+class Connection:
+    """
+    Stand-in for a cx_Oracle connection; closing it releases its session
+    to the pool it was acquired from.
+    """
+
+    def __init__(self, session, latency=0.0, pool=None):
+        self._session = session
+        self._pool = pool
+        self.latency = latency
+        self.call_timeout = 0  # Accepted for compatibility, not enforced
+
+    def _active_session(self):
+        if self._session is None:
+            raise cx_Oracle.InterfaceError("DPI-1010: not connected")
+        return self._session
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        session = self._active_session()
+        self._round_trip()
+        try:
+            session.end("COMMIT")
+        except sqlite3.Error as e:
+            raise _oracle_error(e) from e
+
+    def rollback(self):
+        session = self._active_session()
+        self._round_trip()
+        session.end("ROLLBACK")
+
+    def ping(self):
+        self._active_session()
+        self._round_trip()
+
+    def close(self):
+        session = self._active_session()
+        self._session = None
+        if self._pool is not None:
+            self._pool.release_session(session)
+        else:
+            session.end("ROLLBACK")
+            session.close()
+
+
+class SessionPool:
+    """
+    Stand-in for a cx_Oracle session pool of a stand-in file.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        min=1,
+        max=4,
+        increment=1,
+        latency=0.0,
+        wait_timeout=0,
+        **kwargs,
+    ):
+        """
+        :param db_path: Path of the SQLite file standing in for Oracle
+        :param min: Sessions opened up front
+        :param max: Maximum number of sessions
+        :param increment: Accepted for compatibility
+        :param latency: Seconds added to every round trip
+        :param wait_timeout: Milliseconds :meth:`acquire` waits for a free
+                             session, 0 to wait indefinitely
+        :param kwargs: Other cx_Oracle pool options, ignored
+        """
+        self.db_path = db_path
+        self.min = min
+        self.max = max
+        self.increment = increment
+        self.latency = latency
+        self.wait_timeout = wait_timeout
+        self._idle = [_Session(db_path) for _ in range(min)]
+        self._busy = 0
+        self._available = threading.Condition()
+
+    @property
+    def busy(self):
+        return self._busy
+
+    @property
+    def opened(self):
+        return self._busy + len(self._idle)
+
+    def acquire(self):
+        """
+        Hand out a session, waiting while all ``max`` sessions are busy.
+
+        :return: :class:`Connection`
+        """
+        timeout = self.wait_timeout / 1000 if self.wait_timeout else None
+        with self._available:
+            if not self._available.wait_for(
+                lambda: self._idle or self._busy < self.max, timeout
+            ):
+                raise cx_Oracle.DatabaseError(
+                    "ORA-24457: pool could not provide a session in time"
+                )
+            session = self._idle.pop() if self._idle else None
+            self._busy += 1
+        try:
+            if session is None:
+                session = _Session(self.db_path)
+            else:
+                session.refresh_temporary_tables()
+        except sqlite3.Error as e:
+            self.release_session(None)
+            raise _oracle_error(e) from e
+        return Connection(session, self.latency, self)
+
+    def release(self, connection):
+        """Release a connection, like ``connection.close()``."""
+        connection.close()
+
+    def release_session(self, session):
+        if session is not None:
+            session.end("ROLLBACK")  # Uncommitted work is discarded
+        with self._available:
+            self._busy -= 1
+            if session is not None:
+                self._idle.append(session)
+            self._available.notify()
+
+    def close(self, force=False):
+        """
+        Close the idle sessions.
+
+        :param force: Accepted for compatibility
+        """
+        with self._available:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+
+def connect(db_path, latency=0.0):
+    """
+    Open a standalone connection to a stand-in file.
+
+    :param db_path: Path of the SQLite file standing in for Oracle
+    :param latency: Seconds added to every round trip
+    :return: :class:`Connection`
+    """
+    try:
+        return Connection(_Session(db_path), latency)
+    except sqlite3.Error as e:
+        raise _oracle_error(e) from e
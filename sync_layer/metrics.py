@@ -0,0 +1,357 @@
+"""
+Timing and volume instrumentation of sync runs.
+
+A :class:`SyncMetrics` collects, per table, the time spent in each phase
+of the pipeline, the rows and bytes moved, the Oracle round trips made
+and a histogram of Oracle batch latencies. At the end of a run it is
+written as a JSON report and as a Prometheus text-format file (for the
+node exporter's textfile collector), both replaced atomically so a
+scraper never reads a partial file.
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    from sync_layer.round_trips import COUNTS, RoundTripCounter
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from sync_layer.round_trips import COUNTS, RoundTripCounter
+
+# Directory the reports are written to
+METRICS_DIR = os.getenv(
+    "SYNC_METRICS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs"),
+)
+JSON_REPORT = "sync_metrics.json"
+PROMETHEUS_REPORT = "sync_metrics.prom"
+
+# Phases of a table's sync
+CONNECT = "connect"  # Opening SQLite connections, acquiring sessions
+READ = "read"  # Reading changes or rows from SQLite
+TRANSFORM = "transform"  # Shaping rows into bound batches
+WRITE = "write"  # Array DML and MERGE round trips to Oracle
+COMMIT = "commit"  # Oracle commits with their watermarks, local acks
+PHASES = (CONNECT, READ, TRANSFORM, WRITE, COMMIT)
+
+# Upper bounds (seconds) of the batch latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Run-level entries (connecting, catalog) are reported under this name
+RUN = "_run"
+
+
+def payload_size(rows):
+    """
+    Estimate the bytes bound for a batch of rows.
+
+    Text counts its UTF-8 length, numbers and other values eight bytes.
+
+    :param rows: List of record tuples
+    :return: Number of bytes
+    """
+    size = 0
+    for row in rows:
+        for value in row:
+            if isinstance(value, str):
+                size += len(value.encode("utf-8"))
+            elif isinstance(value, bytes):
+                size += len(value)
+            elif value is not None:
+                size += 8
+    return size
+
+
+class _TableMetrics:
+    def __init__(self):
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.rows = 0
+        self.bytes = 0
+        self.duration = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Last is +Inf
+        self.latency_sum = 0.0
+        self.oracle = RoundTripCounter()
+
+    def as_dict(self):
+        batches = sum(self.buckets)
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets):
+            cumulative += count
+            histogram[str(bound)] = cumulative
+        return {
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "batches": batches,
+            "duration": round(self.duration, 6),
+            "rows_per_sec": (
+                round(self.rows / self.duration, 1) if self.duration else 0.0
+            ),
+            "phases": {
+                name: round(seconds, 6)
+                for name, seconds in self.phases.items()
+            },
+            "batch_latency": {
+                "buckets": histogram,
+                "sum": round(self.latency_sum, 6),
+                "count": batches,
+            },
+            "oracle": self.oracle.as_dict(),
+        }
+
+
+class SyncMetrics:
+    """
+    Metrics of one sync run; safe to update from parallel table workers.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.finished = None
+        self.status = None
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _table(self, table):
+        # Callers hold the lock
+        metrics = self._tables.get(table)
+        if metrics is None:
+            metrics = self._tables[table] = _TableMetrics()
+        return metrics
+
+    def add_time(self, table, phase, seconds):
+        """
+        Add time spent in a phase.
+
+        :param table: Table name, or :data:`RUN` for run-level work
+        :param phase: Phase name, e.g. :data:`READ`
+        :param seconds: Elapsed seconds
+        """
+        with self._lock:
+            phases = self._table(table).phases
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def phase(self, table, phase):
+        """
+        Time the enclosed block as part of a phase.
+
+        :param table: Table name, or :data:`RUN` for run-level work
+        :param phase: Phase name, e.g. :data:`COMMIT`
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(table, phase, time.perf_counter() - start)
+
+    def timed(self, table, phase, iterable):
+        """
+        Yield the items of an iterable, timing the production of each one
+        as part of a phase. Used for lazily read chunks.
+
+        :param table: Table name
+        :param phase: Phase name, e.g. :data:`READ`
+        :param iterable: Iterable to time
+        :return: Generator of the same items
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(table, phase, time.perf_counter() - start)
+                return
+            self.add_time(table, phase, time.perf_counter() - start)
+            yield item
+
+    def round_trips(self, table):
+        """
+        Return the counter of a table's Oracle calls.
+
+        :param table: Table name, or :data:`RUN` for run-level work
+        :return: :class:`~sync_layer.round_trips.RoundTripCounter`, see
+                 :func:`~sync_layer.round_trips.count_round_trips`
+        """
+        with self._lock:
+            return self._table(table).oracle
+
+    def observe_batch(self, table, seconds, rows):
+        """
+        Record one Oracle batch round trip.
+
+        :param table: Table name
+        :param seconds: Latency of the round trip
+        :param rows: Rows bound in the batch
+        """
+        index = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                index = i
+                break
+        size = payload_size(rows)
+        with self._lock:
+            metrics = self._table(table)
+            metrics.buckets[index] += 1
+            metrics.latency_sum += seconds
+            metrics.phases[WRITE] += seconds
+            metrics.rows += len(rows)
+            metrics.bytes += size
+
+    def table_finished(self, table, seconds):
+        """
+        Record the wall-clock time a table took end to end.
+
+        :param table: Table name
+        :param seconds: Elapsed seconds
+        """
+        with self._lock:
+            self._table(table).duration += seconds
+
+    def finish(self, status):
+        """
+        Close the run.
+
+        :param status: ``"succeeded"`` or ``"failed"``
+        """
+        self.finished = time.time()
+        self.status = status
+
+    def report(self):
+        """
+        Return the run's metrics as a JSON-serialisable dict.
+
+        :return: Report dict
+        """
+        finished = self.finished or time.time()
+        with self._lock:
+            tables = {
+                table: metrics.as_dict()
+                for table, metrics in self._tables.items()
+            }
+        run = tables.pop(RUN, None)
+        oracle = {
+            name: sum(t["oracle"][name] for t in tables.values())
+            + (run["oracle"][name] if run else 0)
+            for name in COUNTS
+        }
+        return {
+            "started": datetime.datetime.fromtimestamp(
+                self.started, datetime.timezone.utc
+            ).isoformat(),
+            "duration": round(finished - self.started, 6),
+            "status": self.status,
+            "phases": run["phases"] if run else {},
+            "rows": sum(t["rows"] for t in tables.values()),
+            "bytes": sum(t["bytes"] for t in tables.values()),
+            "oracle": oracle,
+            "tables": tables,
+        }
+
+    def prometheus(self):
+        """
+        Render the run's metrics in the Prometheus text format.
+
+        :return: Text of the exposition
+        """
+        report = self.report()
+        lines = [
+            "# HELP sync_run_duration_seconds Duration of the last sync run.",
+            "# TYPE sync_run_duration_seconds gauge",
+            f"sync_run_duration_seconds {report['duration']}",
+            "# HELP sync_run_success Whether the last sync run succeeded.",
+            "# TYPE sync_run_success gauge",
+            f"sync_run_success {int(report['status'] == 'succeeded')}",
+            "# HELP sync_run_timestamp_seconds Start of the last sync run.",
+            "# TYPE sync_run_timestamp_seconds gauge",
+            f"sync_run_timestamp_seconds {round(self.started, 3)}",
+        ]
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        tables = report["tables"]
+        phases = [
+            ((("table", RUN), ("phase", phase)), seconds)
+            for phase, seconds in report["phases"].items()
+        ]
+        for table, metrics in tables.items():
+            phases += [
+                ((("table", table), ("phase", phase)), seconds)
+                for phase, seconds in metrics["phases"].items()
+            ]
+        family(
+            "sync_phase_seconds",
+            "gauge",
+            "Time spent per table and phase in the last run.",
+            phases,
+        )
+        for name, key, help_text in (
+            ("sync_table_rows", "rows", "Rows sent in the last run."),
+            ("sync_table_bytes", "bytes", "Bytes bound in the last run."),
+            ("sync_table_duration_seconds", "duration", "Time per table."),
+            ("sync_table_rows_per_second", "rows_per_sec", "Throughput."),
+        ):
+            family(
+                name,
+                "gauge",
+                help_text,
+                [((("table", t),), m[key]) for t, m in tables.items()],
+            )
+
+        family(
+            "sync_oracle_calls",
+            "gauge",
+            "Oracle round trips, executes, fetches and commits per table.",
+            [
+                ((("table", table), ("kind", kind)), count)
+                for table, metrics in tables.items()
+                for kind, count in metrics["oracle"].items()
+            ],
+        )
+
+        name = "sync_batch_latency_seconds"
+        lines.append(f"# HELP {name} Latency of Oracle batch round trips.")
+        lines.append(f"# TYPE {name} histogram")
+        for table, metrics in tables.items():
+            latency = metrics["batch_latency"]
+            for bound, count in latency["buckets"].items():
+                lines.append(
+                    f'{name}_bucket{{table="{table}",le="{bound}"}} {count}'
+                )
+            lines.append(f'{name}_sum{{table="{table}"}} {latency["sum"]}')
+            lines.append(
+                f'{name}_count{{table="{table}"}} {latency["count"]}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory=None):
+        """
+        Write the JSON report and the Prometheus file.
+
+        :param directory: Target directory, :data:`METRICS_DIR` by default
+        :return: Tuple of the two file paths
+        """
+        directory = directory or METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for file_name, text in (
+            (JSON_REPORT, json.dumps(self.report(), indent=2)),
+            (PROMETHEUS_REPORT, self.prometheus()),
+        ):
+            path = os.path.join(directory, file_name)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(f"{path}.tmp", path)
+            paths.append(path)
+        return tuple(paths)
@@ -0,0 +1,136 @@
+"""
+Foreign-key aware scheduling of per-table sync work.
+
+Tables are ordered by the foreign keys declared in the local SQLite schema
+(``sides`` before ``questions`` and so on). Independent tables run
+concurrently on a worker pool and a dependent table starts as soon as all
+of its parents have committed.
+"""
+
+import collections
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    from core_functionalities.app_logging import get_logger
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DependencyFailed(Exception):
+    """Raised for a table skipped because one of its parents failed."""
+
+
+def get_table_dependencies(sqlite_conn, tables):
+    """
+    Build the foreign-key dependency graph between the given tables.
+
+    Only references to other tables in ``tables`` are kept; self
+    references are ignored.
+
+    :param sqlite_conn: SQLite connection object
+    :param tables: Iterable of table names
+    :return: Dict mapping each table to the set of tables it references
+    """
+    tables = list(tables)
+    cursor = sqlite_conn.cursor()
+    dependencies = {}
+    for table in tables:
+        cursor.execute(f"PRAGMA foreign_key_list({table})")
+        dependencies[table] = {
+            row[2] for row in cursor.fetchall() if row[2] in tables
+        } - {table}
+    cursor.close()
+    return dependencies
+
+
+def dependency_order(dependencies):
+    """
+    Order tables so every table comes after the tables it references.
+
+    :param dependencies: Dict mapping each table to its parent tables
+    :return: List of table names
+    :raises ValueError: If the foreign keys form a cycle
+    """
+    remaining = {table: set(parents) for table, parents in dependencies.items()}
+    order = []
+    while remaining:
+        ready = [table for table, parents in remaining.items() if not parents]
+        if not ready:
+            raise ValueError(
+                f"Foreign key cycle between tables: {sorted(remaining)}"
+            )
+        for table in ready:
+            del remaining[table]
+            order.append(table)
+        for parents in remaining.values():
+            parents.difference_update(ready)
+    return order
+
+
+def run_in_dependency_order(dependencies, work, max_workers):
+    """
+    Run ``work(table)`` for every table, parents before children.
+
+    Up to ``max_workers`` tables run at once. A table is submitted as soon
+    as all of its parents have finished successfully; when a table fails,
+    its descendants are skipped and reported as :class:`DependencyFailed`.
+
+    :param dependencies: Dict mapping each table to its parent tables
+    :param work: Callable taking a table name, run on a worker thread
+    :param max_workers: Maximum number of tables processed concurrently
+    :return: Tuple ``(results, errors)`` of dicts keyed by table name
+    :raises ValueError: If the foreign keys form a cycle
+    """
+    dependency_order(dependencies)  # Fail fast on cycles
+
+    remaining = {table: set(parents) for table, parents in dependencies.items()}
+    children = collections.defaultdict(set)
+    for table, parents in remaining.items():
+        for parent in parents:
+            children[parent].add(table)
+
+    results = {}
+    errors = {}
+
+    def skip_descendants(table):
+        for child in children[table]:
+            if child in remaining:
+                del remaining[child]
+                errors[child] = DependencyFailed(
+                    f"Skipped {child}: parent table {table} failed"
+                )
+                skip_descendants(child)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="sync-table"
+    ) as executor:
+        running = {}
+
+        def submit_ready():
+            for table in [t for t, parents in remaining.items() if not parents]:
+                del remaining[table]
+                running[executor.submit(work, table)] = table
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = running.pop(future)
+                try:
+                    results[table] = future.result()
+                except Exception as e:
+                    logger.error(f"Sync of table {table} failed: {e}")
+                    errors[table] = e
+                    skip_descendants(table)
+                else:
+                    for child in children[table]:
+                        if child in remaining:
+                            remaining[child].discard(table)
+            submit_ready()
+
+    return results, errors
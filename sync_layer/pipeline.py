@@ -0,0 +1,144 @@
+"""
+Bounded producer/consumer pipeline used to stream records from SQLite
+to Oracle.
+
+The SQLite reader runs in the calling thread (SQLite connections are bound
+to the thread that created them) while the Oracle writer runs in a
+background thread. Chunks travel through a bounded queue, so memory stays
+flat regardless of table size and reading overlaps with writing.
+
+A run can be cancelled from another thread through an event both sides
+check between chunks; the writer then stops as if it had failed, so the
+work since its last commit is rolled back.
+"""
+
+import queue
+import threading
+
+# Number of chunks that may wait between the reader and the writer
+DEFAULT_QUEUE_SIZE = 4
+
+# How often a blocked reader re-checks whether the writer has stopped
+_PUT_TIMEOUT = 0.1
+
+_END = object()
+
+
+class PipelineAborted(Exception):
+    """Raised in the writer when the reader failed part way through."""
+
+
+class PipelineCancelled(Exception):
+    """Raised when a run was cancelled through its cancel event."""
+
+
+def check_cancelled(cancel):
+    """
+    Stop the current work if it was cancelled.
+
+    :param cancel: threading.Event set to cancel, or None
+    :raises PipelineCancelled: If the event is set
+    """
+    if cancel is not None and cancel.is_set():
+        raise PipelineCancelled("Sync cancelled")
+
+
+class _Abort:
+    """Queue marker carrying the reader's exception to the writer."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(buffer, item, writer_done):
+    """
+    Put an item on the queue unless the writer has already stopped.
+
+    :param buffer: Bounded queue shared with the writer
+    :param item: Chunk or marker to enqueue
+    :param writer_done: Event set once the writer thread has finished
+    :return: True if the item was enqueued, False if the writer is gone
+    """
+    while not writer_done.is_set():
+        try:
+            buffer.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(buffer, cancel=None):
+    """
+    Yield the queued chunks until the end marker arrives.
+
+    :param buffer: Bounded queue filled by the reader
+    :param cancel: threading.Event set to cancel, or None
+    :raises PipelineAborted: If the reader failed
+    :raises PipelineCancelled: If the run was cancelled
+    """
+    while True:
+        item = buffer.get()
+        if item is _END:
+            return
+        if isinstance(item, _Abort):
+            raise PipelineAborted("Reader failed") from item.error
+        check_cancelled(cancel)
+        yield item
+
+
+def run_pipeline(
+    chunks, consume, queue_size=DEFAULT_QUEUE_SIZE, cancel=None
+):
+    """
+    Feed chunks produced in the calling thread to a consumer running in a
+    background writer thread.
+
+    :param chunks: Iterable of chunks, iterated in the calling thread; a
+                   generator is closed there once the pipeline stops
+    :param consume: Callable receiving an iterator of the same chunks; runs
+                    in the writer thread
+    :param queue_size: Maximum number of chunks buffered between the two
+    :param cancel: threading.Event checked by the reader and the writer
+                   before each chunk, or None
+    :return: Value returned by ``consume``
+    :raises PipelineCancelled: If ``cancel`` was set before the end
+    :raises Exception: Whatever the reader or the writer raised
+    """
+    buffer = queue.Queue(maxsize=queue_size)
+    writer_done = threading.Event()
+    outcome = {}
+
+    def writer():
+        try:
+            outcome["result"] = consume(_drain(buffer, cancel))
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            writer_done.set()
+
+    thread = threading.Thread(target=writer, name="sync-writer", daemon=True)
+    thread.start()
+
+    try:
+        for chunk in chunks:
+            check_cancelled(cancel)
+            if not _put(buffer, chunk, writer_done):
+                break  # The writer stopped, e.g. it failed
+    except BaseException as e:
+        _put(buffer, _Abort(e), writer_done)
+        thread.join()
+        raise
+    else:
+        _put(buffer, _END, writer_done)
+    finally:
+        # Release the reader's cursor now, in the thread that owns it,
+        # rather than whenever (and wherever) the generator is collected
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
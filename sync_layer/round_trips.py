@@ -0,0 +1,202 @@
+"""
+Counting of Oracle round trips.
+
+Field devices sync over high-latency links, where the number of round
+trips matters more than the volume sent. :func:`count_round_trips` wraps
+an Oracle connection so that its cursors count executes, fetches, commits
+and the round trips they cost into a :class:`RoundTripCounter`, without
+changing the code using the connection.
+
+Executes, commits and rollbacks cost one round trip each (an
+``executemany`` binds the whole array in one). Query results arrive
+``prefetchrows`` rows with the execute and ``arraysize`` rows per fetch
+round trip after that, so fetch round trips are estimated from the rows
+returned.
+"""
+
+import threading
+
+# Fields of RoundTripCounter.as_dict()
+COUNTS = ("round_trips", "executes", "fetches", "commits")
+
+# Rows returned by the execute round trip of a query (cx_Oracle default)
+DEFAULT_PREFETCH_ROWS = 2
+
+
+class RoundTripCounter:
+    """
+    Oracle call counts; safe to update from several threads.
+    """
+
+    def __init__(self):
+        self._counts = dict.fromkeys(COUNTS, 0)
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        """
+        Add to the counts.
+
+        :param counts: Keyword arguments named after :data:`COUNTS`
+        """
+        with self._lock:
+            for name, value in counts.items():
+                self._counts[name] += value
+
+    def as_dict(self):
+        """
+        Return the counts.
+
+        :return: Dict keyed by :data:`COUNTS`
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def __getattr__(self, name):
+        if name in COUNTS:
+            return self.as_dict()[name]
+        raise AttributeError(name)
+
+
+class CountingCursor:
+    """
+    Oracle cursor counting its calls; other attributes are passed through.
+    """
+
+    def __init__(self, cursor, counter):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_counter", counter)
+        object.__setattr__(self, "_buffered", 0)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)  # e.g. arraysize
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _executed(self):
+        buffered = 0
+        if self._cursor.description is not None:
+            buffered = getattr(
+                self._cursor, "prefetchrows", DEFAULT_PREFETCH_ROWS
+            )
+        object.__setattr__(self, "_buffered", buffered)
+        self._counter.add(round_trips=1, executes=1)
+
+    def _fetched(self, rows):
+        # Rows beyond the buffer cost one round trip per arraysize rows
+        missing = max(rows - self._buffered, 0)
+        arraysize = max(self._cursor.arraysize, 1)
+        round_trips = -(-missing // arraysize)
+        buffered = self._buffered - rows + round_trips * arraysize
+        object.__setattr__(self, "_buffered", buffered)
+        self._counter.add(round_trips=round_trips, fetches=1)
+
+    def execute(self, statement, *args, **kwargs):
+        result = self._cursor.execute(statement, *args, **kwargs)
+        self._executed()
+        # cx_Oracle returns the cursor itself for queries
+        return self if result is self._cursor else result
+
+    def executemany(self, statement, parameters, *args, **kwargs):
+        result = self._cursor.executemany(
+            statement, parameters, *args, **kwargs
+        )
+        self._executed()
+        return result
+
+    def callproc(self, *args, **kwargs):
+        result = self._cursor.callproc(*args, **kwargs)
+        self._counter.add(round_trips=1, executes=1)
+        return result
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._fetched(0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched(len(rows))
+        return rows
+
+
+class CountingConnection:
+    """
+    Oracle connection whose cursors, commits and rollbacks are counted;
+    other attributes are passed through.
+    """
+
+    def __init__(self, connection, counter):
+        object.__setattr__(self, "connection", connection)
+        object.__setattr__(self, "counter", counter)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.connection, name, value)  # e.g. call_timeout
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(
+            self.connection.cursor(*args, **kwargs), self.counter
+        )
+
+    def commit(self):
+        self.connection.commit()
+        self.counter.add(round_trips=1, commits=1)
+
+    def rollback(self):
+        self.connection.rollback()
+        self.counter.add(round_trips=1)
+
+    def ping(self):
+        self.connection.ping()
+        self.counter.add(round_trips=1)
+
+
+def count_round_trips(connection, counter):
+    """
+    Count the Oracle calls made through a connection.
+
+    A connection that is already counted is re-wrapped around its
+    underlying connection, so each call is counted once, by ``counter``.
+
+    :param connection: cx_Oracle connection object
+    :param counter: :class:`RoundTripCounter` to count into
+    :return: :class:`CountingConnection`
+    """
+    if isinstance(connection, CountingConnection):
+        connection = connection.connection
+    return CountingConnection(connection, counter)
+
+
+def assert_round_trip_budget(counter, rows, per_block, block_rows=10000):
+    """
+    Assert that a sync stayed within a round-trip budget, e.g. at most
+    5 round trips per 10000 rows with ``per_block=5``.
+
+    Meant for tests, to catch regressions in batching.
+
+    :param counter: :class:`RoundTripCounter` of the sync (or one table),
+                    or its counts, e.g. from a metrics report
+    :param rows: Number of rows synced
+    :param per_block: Round trips allowed per ``block_rows`` rows; a sync
+                      of fewer rows is allowed one block
+    :param block_rows: Number of rows per block
+    :raises AssertionError: If more round trips were made
+    """
+    blocks = max(-(-rows // block_rows), 1)
+    budget = per_block * blocks
+    counts = counter if isinstance(counter, dict) else counter.as_dict()
+    assert counts["round_trips"] <= budget, (
+        f"{counts['round_trips']} Oracle round trips for {rows} rows, "
+        f"budget {budget} ({per_block} per {block_rows} rows): {counts}"
+    )
@@ -0,0 +1,78 @@
+"""
+Row hashing shared by the sync and the verification.
+
+A row is rendered as text by joining its column values, each cast to text
+with NULL as an empty string, with a separator. SQLite hashes that text
+through functions registered by :func:`prepare_sqlite`; Oracle builds the
+same text with :func:`oracle_row_text` and hashes it with
+``STANDARD_HASH``. Both agree for the integer and text columns of the
+inspection schema.
+"""
+
+import hashlib
+
+# Column holding the content hash of each row in the Oracle tables
+ROW_HASH_COLUMN = "row_hash"
+
+# Local table remembering the content hash last committed to Oracle
+ROW_HASH_TABLE = "sync_row_hash"
+
+
+def sqlite_row_text(columns):
+    """
+    Build the SQLite expression rendering a row as text.
+
+    :param columns: List of column names
+    :return: SQL expression
+    """
+    # The leading '#' keeps the text non-empty, as Oracle treats '' as NULL
+    text = " || char(31) || ".join(
+        f"COALESCE(CAST({col} AS TEXT), '')" for col in columns
+    )
+    return f"'#' || {text}"
+
+
+def oracle_row_text(columns):
+    """
+    Build the Oracle expression rendering a row as text.
+
+    :param columns: List of column names
+    :return: SQL expression
+    """
+    text = " || CHR(31) || ".join(f"TO_CHAR({col})" for col in columns)
+    return f"'#' || {text}"
+
+
+def content_hash(text):
+    """
+    Hash a row rendered as text.
+
+    :param text: Row text built by :func:`sqlite_row_text`
+    :return: MD5 digest as 32 hexadecimal characters
+    """
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def row_checksum(text):
+    """
+    Hash a row rendered as text to an integer that can be summed.
+
+    :param text: Row text built by :func:`sqlite_row_text`
+    :return: First 32 bits of the MD5 digest as an integer
+    """
+    return int(content_hash(text)[:8], 16)
+
+
+def prepare_sqlite(sqlite_conn):
+    """
+    Register ``sync_content_hash`` and ``sync_checksum`` on a SQLite
+    connection.
+
+    :param sqlite_conn: SQLite connection object
+    """
+    sqlite_conn.create_function(
+        "sync_content_hash", 1, content_hash, deterministic=True
+    )
+    sqlite_conn.create_function(
+        "sync_checksum", 1, row_checksum, deterministic=True
+    )
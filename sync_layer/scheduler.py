@@ -0,0 +1,205 @@
+"""
+Change-driven sync scheduling.
+
+Instead of syncing at fixed times, the scheduler polls the local changelog
+(a cheap SQLite query, no Oracle session needed) and syncs as soon as
+enough changes are pending or the oldest pending change has waited long
+enough. Cycles with nothing pending are skipped. Failed runs (typically
+the central DB being unreachable) are retried with exponential backoff.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+try:
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.db_connection import get_sqlite_connection
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        changelog_exists,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.db_connection import get_sqlite_connection
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        changelog_exists,
+        sync_databases,
+    )
+
+logger = get_logger(__name__)
+
+# Seconds between two looks at the changelog
+POLL_INTERVAL = float(os.getenv("SYNC_POLL_INTERVAL", "30"))
+
+# Pending changes that trigger a sync straight away
+VOLUME_THRESHOLD = int(os.getenv("SYNC_VOLUME_THRESHOLD", "500"))
+
+# Seconds the oldest pending change may wait before it is synced
+MAX_AGE = float(os.getenv("SYNC_MAX_AGE", "900"))
+
+# Delay after the first failed run, doubled on every further failure
+BACKOFF_BASE = float(os.getenv("SYNC_BACKOFF_BASE", "30"))
+BACKOFF_MAX = float(os.getenv("SYNC_BACKOFF_MAX", "3600"))
+
+
+def get_pending_changes(sqlite_conn):
+    """
+    Measure the local changes waiting to be synced.
+
+    :param sqlite_conn: SQLite connection object
+    :return: Tuple ``(count, age)``: number of changelog entries and the
+             age in seconds of the oldest one (0 when nothing is pending)
+    """
+    cursor = sqlite_conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT COUNT(*),
+               COALESCE((julianday('now') - julianday(MIN(changed_at)))
+                        * 86400, 0)
+        FROM {CHANGELOG_TABLE}
+        """
+    )
+    count, age = cursor.fetchone()
+    cursor.close()
+    return count, age
+
+
+class SyncScheduler:
+    """
+    Decide when to sync from the pending change volume and age.
+    """
+
+    def __init__(
+        self,
+        run_sync=sync_databases,
+        db_path=None,
+        poll_interval=POLL_INTERVAL,
+        volume_threshold=VOLUME_THRESHOLD,
+        max_age=MAX_AGE,
+        backoff_base=BACKOFF_BASE,
+        backoff_max=BACKOFF_MAX,
+    ):
+        """
+        :param run_sync: Callable running one sync, raising on failure
+        :param db_path: Path to the SQLite database file
+        :param poll_interval: Seconds between two looks at the changelog
+        :param volume_threshold: Pending changes that trigger a sync
+        :param max_age: Seconds the oldest pending change may wait
+        :param backoff_base: Delay after the first failed run
+        :param backoff_max: Upper bound of the backoff delay
+        """
+        self.run_sync = run_sync
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.volume_threshold = volume_threshold
+        self.max_age = max_age
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failures = 0
+        self.last_run = None  # time.monotonic() of the last attempt
+
+    def should_sync(self, count, age):
+        """
+        Decide whether the pending changes warrant a sync now.
+
+        :param count: Number of pending changes
+        :param age: Age in seconds of the oldest pending change
+        :return: Reason to sync, or None to skip this cycle
+        """
+        if count == 0:
+            return None
+        if count >= self.volume_threshold:
+            return f"{count} changes pending"
+        if age >= self.max_age:
+            return f"oldest change pending for {age:.0f}s"
+        return None
+
+    def backoff_delay(self):
+        """
+        Return the delay before retrying after the current failure streak.
+
+        :return: Seconds to wait
+        """
+        delay = self.backoff_base * 2 ** (self.failures - 1)
+        return min(delay, self.backoff_max)
+
+    def run_once(self):
+        """
+        Look at the changelog once and sync if warranted.
+
+        :return: Seconds to wait before the next call
+        """
+        sqlite_conn = get_sqlite_connection(self.db_path)
+        try:
+            if not changelog_exists(sqlite_conn):
+                # Without change capture, sync every ``max_age`` seconds
+                count = 1
+                age = self.max_age
+                if self.last_run is not None:
+                    age = time.monotonic() - self.last_run
+            else:
+                count, age = get_pending_changes(sqlite_conn)
+        except sqlite3.Error as e:
+            logger.error(f"Could not read the changelog: {e}")
+            return self.poll_interval
+        finally:
+            sqlite_conn.close()
+
+        reason = self.should_sync(count, age)
+        if reason is None:
+            logger.debug(f"Sync skipped: {count} changes pending.")
+            return self.poll_interval
+
+        logger.info(f"Scheduled sync starting: {reason}.")
+        self.last_run = time.monotonic()
+        try:
+            self.run_sync()
+        except Exception as e:
+            self.failures += 1
+            delay = self.backoff_delay()
+            logger.error(
+                f"Scheduled sync failed ({self.failures} in a row), "
+                f"retrying in {delay:.0f}s: {e}"
+            )
+            return delay
+
+        self.failures = 0
+        return self.poll_interval
+
+    def run_forever(self, stop_event=None):
+        """
+        Keep scheduling syncs until ``stop_event`` is set.
+
+        :param stop_event: threading.Event ending the loop, optional
+        """
+        stop_event = stop_event or threading.Event()
+        logger.info(
+            f"Sync scheduler started (poll {self.poll_interval:.0f}s, "
+            f"threshold {self.volume_threshold} changes, "
+            f"max age {self.max_age:.0f}s)."
+        )
+        while not stop_event.is_set():
+            delay = self.run_once()
+            stop_event.wait(delay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Change-driven sync.")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Check the changelog once instead of running forever.",
+    )
+    args = parser.parse_args()
+    scheduler = SyncScheduler()
+    if args.once:
+        scheduler.run_once()
+    else:
+        scheduler.run_forever()
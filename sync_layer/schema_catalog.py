@@ -0,0 +1,248 @@
+"""
+Schema catalog shared by sync and verification.
+
+Tables, columns, primary keys and foreign-key dependencies are discovered
+from SQLite (and matched against Oracle) once, then cached keyed by the
+schema version of both databases. Generated SQL statements are cached as
+well, so they are built once per process rather than on every call.
+"""
+
+import os
+import sys
+import threading
+
+try:
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.parallel_sync import get_table_dependencies
+    from sync_layer.row_hash import ROW_HASH_COLUMN
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.parallel_sync import get_table_dependencies
+    from sync_layer.row_hash import ROW_HASH_COLUMN
+
+logger = get_logger(__name__)
+
+# Tables used internally (SQLite bookkeeping, changelog, sync metadata,
+# local search index)
+INTERNAL_PREFIXES = ("sqlite_", "sync_", "search_")
+
+_catalogs = {}
+_statements = {}
+_lock = threading.Lock()
+
+
+class SchemaCatalog:
+    """
+    Tables shared by the local SQLite DB and the central Oracle DB.
+
+    Attributes
+    ----------
+    tables : dict
+        Table name mapped to its column names, primary key first.
+    dependencies : dict
+        Table name mapped to the set of tables it references.
+    version : tuple
+        Schema versions the catalog was built from.
+    hashed : frozenset
+        Tables whose Oracle copy stores a content hash per row.
+    """
+
+    def __init__(self, tables, dependencies, version, hashed=frozenset()):
+        self.tables = tables
+        self.dependencies = dependencies
+        self.version = version
+        self.hashed = hashed
+
+    def columns(self, table):
+        """
+        Return the column names of a table, primary key first.
+
+        :param table: Table name
+        :return: List of column names
+        """
+        return self.tables[table]
+
+    def primary_key(self, table):
+        """
+        Return the primary key column of a table.
+
+        :param table: Table name
+        :return: Column name
+        """
+        return self.tables[table][0]
+
+
+def _is_internal(table):
+    return table.lower().startswith(INTERNAL_PREFIXES)
+
+
+def _sqlite_version(sqlite_conn):
+    """
+    Identify the SQLite database file and its schema version.
+
+    :param sqlite_conn: SQLite connection object
+    :return: Tuple ``(file path, schema_version)``
+    """
+    cursor = sqlite_conn.cursor()
+    cursor.execute("PRAGMA database_list")
+    path = next(row[2] for row in cursor.fetchall() if row[1] == "main")
+    cursor.execute("PRAGMA schema_version")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return path, version
+
+
+def _oracle_version(oracle_conn, schema):
+    """
+    Return the time of the last DDL on a table of the Oracle schema.
+
+    :param oracle_conn: Oracle connection object
+    :param schema: Oracle schema owning the synced tables
+    :return: Datetime of the last table DDL
+    """
+    cursor = oracle_conn.cursor()
+    cursor.execute(
+        """
+        SELECT MAX(last_ddl_time) FROM all_objects
+        WHERE owner = :1 AND object_type = 'TABLE'
+        """,
+        [schema.upper()],
+    )
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def load_sqlite_tables(sqlite_conn):
+    """
+    Discover the user tables of the SQLite DB and their columns.
+
+    Tables without a single-column primary key are skipped, as the sync
+    addresses rows by key.
+
+    :param sqlite_conn: SQLite connection object
+    :return: Dict mapping table names to columns, primary key first
+    """
+    cursor = sqlite_conn.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+    )
+    names = [row[0] for row in cursor.fetchall() if not _is_internal(row[0])]
+
+    tables = {}
+    for name in names:
+        cursor.execute(f"PRAGMA table_info({name})")
+        info = cursor.fetchall()
+        keys = [row[1] for row in info if row[5]]
+        if len(keys) != 1:
+            logger.warning(
+                f"Table {name} has no single-column primary key, skipping."
+            )
+            continue
+        tables[name] = keys + [row[1] for row in info if not row[5]]
+    cursor.close()
+    return tables
+
+
+def load_oracle_columns(oracle_conn, schema):
+    """
+    Discover the tables of the Oracle schema and their columns.
+
+    :param oracle_conn: Oracle connection object
+    :param schema: Oracle schema owning the synced tables
+    :return: Dict mapping lower-case table names to sets of column names
+    """
+    cursor = oracle_conn.cursor()
+    cursor.execute(
+        """
+        SELECT table_name, column_name FROM all_tab_columns
+        WHERE owner = :1
+        ORDER BY table_name, column_id
+        """,
+        [schema.upper()],
+    )
+    columns = {}
+    for table, column in cursor.fetchall():
+        columns.setdefault(table.lower(), set()).add(column.lower())
+    cursor.close()
+    return columns
+
+
+def get_catalog(sqlite_conn, oracle_conn=None, schema="SYSTEM"):
+    """
+    Return the schema catalog, rebuilding it only when a schema changed.
+
+    With an Oracle connection, only tables present on both sides are kept,
+    with the columns they share, and tables whose Oracle copy has a
+    ``row_hash`` column are marked as hashed. The check costs one query
+    per database; the full introspection runs only when a schema version
+    changed.
+
+    :param sqlite_conn: SQLite connection object
+    :param oracle_conn: Oracle connection object, optional
+    :param schema: Oracle schema owning the synced tables
+    :return: :class:`SchemaCatalog`
+    """
+    version = _sqlite_version(sqlite_conn)
+    if oracle_conn is not None:
+        version += (schema, _oracle_version(oracle_conn, schema))
+
+    with _lock:
+        catalog = _catalogs.get(version)
+    if catalog is not None:
+        return catalog
+
+    tables = load_sqlite_tables(sqlite_conn)
+    hashed = set()
+    if oracle_conn is not None:
+        oracle_columns = load_oracle_columns(oracle_conn, schema)
+        shared = {}
+        for table, columns in tables.items():
+            if table.lower() not in oracle_columns:
+                logger.warning(f"Table {table} does not exist in Oracle.")
+                continue
+            available = oracle_columns[table.lower()]
+            shared[table] = [col for col in columns if col.lower() in available]
+            if ROW_HASH_COLUMN in available:
+                hashed.add(table)
+        tables = shared
+
+    catalog = SchemaCatalog(
+        tables,
+        get_table_dependencies(sqlite_conn, tables),
+        version,
+        frozenset(hashed),
+    )
+    logger.info(f"Schema catalog loaded: {', '.join(tables)}")
+
+    with _lock:
+        # Entries for older versions of the same database are obsolete
+        for key in [k for k in _catalogs if k[0] == version[0]]:
+            del _catalogs[key]
+        _catalogs[version] = catalog
+    return catalog
+
+
+def cached_statement(kind, table, columns, build):
+    """
+    Return a generated SQL statement, building it on first use.
+
+    Statements are keyed by their kind, table and columns, so a schema
+    change yields a new statement while unchanged tables reuse theirs
+    across runs and across sync and verification.
+
+    :param kind: Statement kind, e.g. ``"merge"``
+    :param table: Table name the statement targets
+    :param columns: List of column names the statement binds
+    :param build: Callable returning the statement text
+    :return: SQL statement
+    """
+    key = (kind, table, tuple(columns))
+    with _lock:
+        statement = _statements.get(key)
+    if statement is None:
+        statement = build()
+        with _lock:
+            _statements[key] = statement
+    return statement
@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 
@@ -33,28 +34,58 @@ def table_exists(cursor, table_name):
     return cursor.fetchone() is not None
 
 
-def setup_oracle_db():
+# Tables receiving data from the field devices
+SYNCED_TABLES = ["SIDES", "QUESTIONS", "USERS"]
+
+
+def create_sync_support_tables(cursor, table_name):
+    """
+    Create the staging and error-log tables used by the bulk sync mode.
+
+    ``SYNC_STAGE_<table>`` is a global temporary table with the columns of
+    the synced table; chunks are array-inserted into it and merged with one
+    set-based MERGE. ``SYNC_ERR_<table>`` is the DML error log receiving
+    the rows that MERGE rejects.
+
+    :param cursor: Oracle cursor object
+    :param table_name: Name of the synced table
+    """
+    staging_table = f"SYNC_STAGE_{table_name}"
+    error_table = f"SYNC_ERR_{table_name}"
+
+    for support_table in (staging_table, error_table):
+        if table_exists(cursor, support_table):
+            print(f"Dropping existing table: {support_table}")
+            cursor.execute(f"DROP TABLE {support_table} PURGE")
+
+    print(f"Creating table: {staging_table}")
+    cursor.execute(
+        f"""
+        CREATE GLOBAL TEMPORARY TABLE {staging_table}
+        ON COMMIT DELETE ROWS
+        AS SELECT * FROM {table_name} WHERE 1 = 0
+        """
+    )
+
+    print(f"Creating table: {error_table}")
+    cursor.execute(
+        "BEGIN DBMS_ERRLOG.CREATE_ERROR_LOG(:1, :2); END;",
+        [table_name, error_table],
+    )
+
+
+def setup_oracle_db(seed_data=True):
     """
     Set up the Oracle database with the necessary tables and initial data.
+
+    :param seed_data: Insert the initial sides, questions and admin user.
+                      Leave the tables empty to seed them from a field
+                      device with the sync's initial load instead.
     """
     try:
         oracle_conn = get_oracle_connection()  # Use the centralized connection
         oracle_cursor = oracle_conn.cursor()
 
-        oracle_cursor.execute(
-            "SELECT user, sys_context('USERENV', 'CURRENT_SCHEMA') FROM dual"
-        )
-        result = oracle_cursor.fetchone()
-        logger.info(
-            f"Connected to Oracle as user: {result[0]}, schema: {result[1]}"
-        )
-
-        oracle_cursor.execute(
-            "SELECT sys_context('USERENV', 'CON_NAME') FROM dual"
-        )
-        pdb_name = oracle_cursor.fetchone()
-        logger.info(f"Connected to PDB: {pdb_name[0]}")
-
         # Table creation statements
         table_definitions = {
             "INSPECTIONS": """
@@ -68,7 +99,8 @@ def setup_oracle_db():
             "SIDES": """
                 CREATE TABLE sides (
                     id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
-                    side_name VARCHAR2(255) NOT NULL
+                    side_name VARCHAR2(255) NOT NULL,
+                    row_hash VARCHAR2(32)
                 )
             """,
             "QUESTIONS": """
@@ -76,6 +108,7 @@ def setup_oracle_db():
                     id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
                     side_id NUMBER NOT NULL,
                     question VARCHAR2(255) NOT NULL,
+                    row_hash VARCHAR2(32),
                     CONSTRAINT fk_side
                         FOREIGN KEY (side_id)
                         REFERENCES sides(id)
@@ -86,23 +119,33 @@ def setup_oracle_db():
                 CREATE TABLE users (
                     id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
                     username VARCHAR2(50) UNIQUE NOT NULL,
-                    password VARCHAR2(255) NOT NULL
+                    password VARCHAR2(255) NOT NULL,
+                    row_hash VARCHAR2(32)
                 )
             """,
             "SYNC_METADATA": """
                 CREATE TABLE sync_metadata (
-                    sync_id NUMBER PRIMARY KEY,
-                    last_sync TIMESTAMP
+                    device_id VARCHAR2(64) NOT NULL,
+                    table_name VARCHAR2(128) NOT NULL,
+                    last_seq NUMBER DEFAULT 0 NOT NULL,
+                    last_sync TIMESTAMP,
+                    CONSTRAINT pk_sync_metadata
+                        PRIMARY KEY (device_id, table_name)
+                )
+            """,
+            "SYNC_CHECKPOINT": """
+                CREATE TABLE sync_checkpoint (
+                    device_id VARCHAR2(64) NOT NULL,
+                    table_name VARCHAR2(128) NOT NULL,
+                    sync_mode VARCHAR2(16) NOT NULL,
+                    last_key NUMBER NOT NULL,
+                    snapshot_seq NUMBER,
+                    updated_at TIMESTAMP,
+                    CONSTRAINT pk_sync_checkpoint
+                        PRIMARY KEY (device_id, table_name)
                 )
             """,
         }
-        oracle_cursor.execute(
-            "SELECT user, sys_context('USERENV', 'CURRENT_SCHEMA') FROM dual"
-        )
-        result = oracle_cursor.fetchone()
-        logger.info(
-            f"Connected to Oracle as user: {result[0]}, schema: {result[1]}"
-        )
 
         # Drop and create tables
         for table_name, create_statement in table_definitions.items():
@@ -127,8 +170,19 @@ def setup_oracle_db():
             except cx_Oracle.Error as e:
                 print(f"Error creating table {table_name}: {e}")
 
+        # Staging and error-log tables for the bulk sync mode
+        for table_name in SYNCED_TABLES:
+            try:
+                create_sync_support_tables(oracle_cursor, table_name)
+            except cx_Oracle.Error as e:
+                print(f"Error creating sync tables for {table_name}: {e}")
+
         # Insert initial data
         try:
+            if not seed_data:
+                print("Skipping initial data, tables left empty.")
+                return
+
             print("Inserting initial data...")
 
             # Insert admin user
@@ -190,4 +244,11 @@ def setup_oracle_db():
 
 
 if __name__ == "__main__":
-    setup_oracle_db()
+    parser = argparse.ArgumentParser(description="Set up the Oracle DB.")
+    parser.add_argument(
+        "--no-seed",
+        action="store_true",
+        help="Create empty tables, to be seeded by the first device sync.",
+    )
+    args = parser.parse_args()
+    setup_oracle_db(seed_data=not args.no_seed)
@@ -0,0 +1,392 @@
+"""
+Long-lived sync worker.
+
+The worker keeps the Oracle session pool and the schema catalog warm
+between runs and executes sync jobs one at a time from a queue. Triggers
+arriving while a job is still queued join that job instead of queuing
+another run; a trigger arriving while a job runs queues a single follow-up
+job, so changes made during the run are sent too.
+
+``python sync_layer/sync_daemon.py`` serves the worker to other local
+processes (the HTTP trigger, cron, the command line) over a socket;
+``--trigger`` submits a job to a running worker. The socket carries
+pickles, so both sides authenticate with a random key the worker writes to
+a file only its owner can read.
+"""
+
+import argparse
+import collections
+import os
+import queue
+import secrets
+import stat
+import sys
+import threading
+import time
+import uuid
+from multiprocessing.managers import BaseManager
+
+try:
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.db_connection import get_oracle_pool
+    from sync_layer.scheduler import SyncScheduler
+    from sync_layer.sync_db import sync_databases
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.db_connection import get_oracle_pool
+    from sync_layer.scheduler import SyncScheduler
+    from sync_layer.sync_db import sync_databases
+
+logger = get_logger(__name__)
+
+# Local socket the worker is served on
+DAEMON_HOST = os.getenv("SYNC_DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.getenv("SYNC_DAEMON_PORT", "50507"))
+
+# Shared secret of the worker and its clients: taken from the variable when
+# set, otherwise from the key file, which the worker creates on first start
+AUTHKEY_VARIABLE = "SYNC_DAEMON_AUTHKEY"
+DAEMON_AUTHKEY_FILE = os.getenv(
+    "SYNC_DAEMON_AUTHKEY_FILE",
+    os.path.join(os.path.expanduser("~"), ".sync_daemon_key"),
+)
+MIN_AUTHKEY_LENGTH = 32
+
+# Number of jobs kept for status queries
+JOB_HISTORY = 100
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_STOP = object()
+
+
+def _copy(job):
+    return dict(job, tables=dict(job["tables"]))
+
+
+class SyncDaemon:
+    """
+    Queue of sync jobs executed by a single background thread.
+
+    Jobs are plain dicts so their status can be handed to other processes:
+    ``id``, ``state``, ``triggers`` (number of requests coalesced into the
+    job), ``submitted``/``started``/``finished`` timestamps, ``tables``
+    (per-table counts, filled in as the run progresses) and ``error``.
+    """
+
+    def __init__(self, sync=sync_databases, history=JOB_HISTORY):
+        """
+        :param sync: Callable running one sync, accepting ``progress``
+        :param history: Number of jobs kept for status queries
+        """
+        self._sync = sync
+        self._history = history
+        self._jobs = collections.OrderedDict()
+        self._queued_id = None  # Job that new triggers are coalesced into
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread, if it is not running yet."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sync-daemon", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread once the current job has finished."""
+        self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self):
+        """
+        Request a sync run.
+
+        :return: Id of the job that will perform it
+        """
+        with self._lock:
+            if self._queued_id is not None:
+                job = self._jobs[self._queued_id]
+                job["triggers"] += 1
+                return job["id"]
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "state": QUEUED,
+                "triggers": 1,
+                "submitted": time.time(),
+                "started": None,
+                "finished": None,
+                "tables": {},
+                "error": None,
+            }
+            self._jobs[job["id"]] = job
+            self._queued_id = job["id"]
+            while len(self._jobs) > self._history:
+                self._jobs.popitem(last=False)
+        self._queue.put(job["id"])
+        return job["id"]
+
+    def status(self, job_id):
+        """
+        Return a snapshot of a job.
+
+        :param job_id: Id returned by :meth:`submit`
+        :return: Job dict, or None for unknown (or forgotten) jobs
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else _copy(job)
+
+    def wait(self, job_id, timeout=None):
+        """
+        Wait for a job to finish.
+
+        :param job_id: Id returned by :meth:`submit`
+        :param timeout: Seconds to wait at most, None to wait indefinitely
+        :return: Job dict (still queued or running on timeout), or None
+                 for unknown jobs
+        """
+
+        def finished():
+            job = self._jobs.get(job_id)
+            return job is None or job["finished"] is not None
+
+        with self._finished:
+            self._finished.wait_for(finished, timeout)
+            job = self._jobs.get(job_id)
+            return None if job is None else _copy(job)
+
+    def run_job(self):
+        """
+        Submit a sync run and wait for it, as a blocking sync callable.
+
+        :raises RuntimeError: If the job failed
+        """
+        job = self.wait(self.submit())
+        if job is not None and job["state"] == FAILED:
+            raise RuntimeError(job["error"])
+
+    def jobs(self):
+        """
+        Return snapshots of the recent jobs, oldest first.
+
+        :return: List of job dicts
+        """
+        with self._lock:
+            return [_copy(job) for job in self._jobs.values()]
+
+    def _progress(self, job, table, result):
+        counts = {"upserted": 0, "deleted": 0, "rejected": 0}
+        if result is not None:
+            counts = {
+                "upserted": result.upserted,
+                "deleted": result.deleted,
+                "rejected": len(result.failures),
+            }
+        with self._lock:
+            job["tables"][table] = counts
+
+    def _run(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is _STOP:
+                return
+
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job_id == self._queued_id:
+                    self._queued_id = None
+                if job is None:
+                    continue
+                job["state"] = RUNNING
+                job["started"] = time.time()
+
+            logger.info(
+                f"Sync job {job_id} started ({job['triggers']} trigger(s))."
+            )
+            try:
+                self._sync(
+                    progress=lambda table, result: self._progress(
+                        job, table, result
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Sync job {job_id} failed: {e}")
+                state, error = FAILED, str(e)
+            else:
+                logger.info(f"Sync job {job_id} succeeded.")
+                state, error = SUCCEEDED, None
+
+            with self._lock:
+                job["state"] = state
+                job["error"] = error
+                job["finished"] = time.time()
+                self._finished.notify_all()
+
+
+def _create_authkey(path):
+    # O_EXCL keeps an existing key; the mode applies from the first byte
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return
+    with os.fdopen(fd, "w") as key_file:
+        key_file.write(secrets.token_hex(MIN_AUTHKEY_LENGTH))
+    logger.info(f"Sync daemon key written to {path}.")
+
+
+def load_authkey(path=None, create=False):
+    """
+    Return the shared secret of the sync worker.
+
+    ``SYNC_DAEMON_AUTHKEY`` takes precedence over the key file.
+
+    :param path: Key file, :data:`DAEMON_AUTHKEY_FILE` by default
+    :param create: Generate a random key file if there is none
+    :return: Key as bytes
+    :raises FileNotFoundError: If there is no key file to read
+    :raises PermissionError: If the key file is not private to its owner
+    :raises ValueError: If the key is shorter than
+                        :data:`MIN_AUTHKEY_LENGTH` characters
+    """
+    key = os.getenv(AUTHKEY_VARIABLE)
+    source = AUTHKEY_VARIABLE
+    if key is None:
+        source = path or DAEMON_AUTHKEY_FILE
+        if create:
+            _create_authkey(source)
+        with open(source) as key_file:
+            mode = os.fstat(key_file.fileno())
+            if os.name == "posix" and (
+                mode.st_uid != os.getuid()
+                or stat.S_IMODE(mode.st_mode) & 0o077
+            ):
+                raise PermissionError(
+                    f"{source} must be owned by this user and readable by "
+                    f"it only (chmod 600)."
+                )
+            key = key_file.read().strip()
+    if len(key) < MIN_AUTHKEY_LENGTH:
+        raise ValueError(
+            f"Sync daemon key from {source} is shorter than "
+            f"{MIN_AUTHKEY_LENGTH} characters."
+        )
+    return key.encode()
+
+
+class _DaemonServer(BaseManager):
+    pass
+
+
+class _DaemonClient(BaseManager):
+    pass
+
+
+_DaemonClient.register("daemon")
+
+
+def serve(host=DAEMON_HOST, port=DAEMON_PORT, authkey=None, schedule=False):
+    """
+    Run a sync worker and serve it to local processes until interrupted.
+
+    :param host: Interface to listen on
+    :param port: Port to listen on
+    :param authkey: Shared secret clients must present, by default from
+                    :func:`load_authkey`, creating the key file if needed
+    :param schedule: Also submit jobs from a
+                     :class:`~sync_layer.scheduler.SyncScheduler` as local
+                     changes accumulate
+    """
+    if authkey is None:
+        authkey = load_authkey(create=True)
+    daemon = SyncDaemon()
+    try:
+        get_oracle_pool()  # Log in once, before the first trigger
+    except Exception as e:
+        logger.warning(f"Oracle not reachable yet, pool created later: {e}")
+    daemon.start()
+
+    if schedule:
+        scheduler = SyncScheduler(run_sync=daemon.run_job)
+        threading.Thread(
+            target=scheduler.run_forever, name="sync-scheduler", daemon=True
+        ).start()
+
+    _DaemonServer.register("daemon", callable=lambda: daemon)
+    server = _DaemonServer(address=(host, port), authkey=authkey).get_server()
+    logger.info(f"Sync daemon listening on {host}:{port}.")
+    try:
+        server.serve_forever()
+    finally:
+        daemon.stop()
+
+
+def connect(host=DAEMON_HOST, port=DAEMON_PORT, authkey=None):
+    """
+    Connect to a running sync worker.
+
+    :param host: Host the worker listens on
+    :param port: Port the worker listens on
+    :param authkey: Shared secret of the worker, by default from
+                    :func:`load_authkey`
+    :return: Proxy exposing :meth:`SyncDaemon.submit`,
+             :meth:`SyncDaemon.status` and :meth:`SyncDaemon.jobs`
+    :raises ConnectionRefusedError: If no worker is running
+    :raises FileNotFoundError: If no worker has written its key file
+    """
+    if authkey is None:
+        authkey = load_authkey()
+    manager = _DaemonClient(address=(host, port), authkey=authkey)
+    manager.connect()
+    return manager.daemon()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Long-lived sync worker.")
+    parser.add_argument(
+        "--trigger",
+        action="store_true",
+        help="Submit a sync job to the running worker instead of serving.",
+    )
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Also sync on its own as local changes accumulate.",
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="With --trigger, wait for the job to finish.",
+    )
+    args = parser.parse_args()
+
+    if not args.trigger:
+        serve(schedule=args.schedule)
+        sys.exit(0)
+
+    daemon = connect()
+    job_id = daemon.submit()
+    print(f"Sync job: {job_id}")
+    if args.wait:
+        job = daemon.status(job_id)
+        while job is not None and job["state"] in (QUEUED, RUNNING):
+            time.sleep(1)
+            job = daemon.status(job_id)
+        if job is None:
+            # Restarted worker, or dropped from the job history
+            print(f"Sync job {job_id} is no longer known to the worker.")
+            sys.exit(1)
+        print(f"Sync job {job_id} {job['state']}.")
+        sys.exit(0 if job["state"] == SUCCEEDED else 1)
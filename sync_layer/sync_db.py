@@ -1,6 +1,11 @@
-import datetime
+import collections
+import itertools
 import os
+import socket
+import sqlite3
 import sys
+import time
+import uuid
 
 import cx_Oracle
 
@@ -9,87 +14,510 @@ try:
     from sync_layer.db_connection import (
         get_oracle_connection,
         get_sqlite_connection,
+        get_sqlite_snapshot,
     )
+    from sync_layer.metrics import (
+        COMMIT,
+        CONNECT,
+        READ,
+        RUN,
+        TRANSFORM,
+        WRITE,
+        SyncMetrics,
+    )
+    from sync_layer.parallel_sync import (
+        dependency_order,
+        run_in_dependency_order,
+    )
+    from sync_layer.pipeline import (
+        DEFAULT_QUEUE_SIZE,
+        check_cancelled,
+        run_pipeline,
+    )
+    from sync_layer.round_trips import count_round_trips
+    from sync_layer.row_hash import (
+        ROW_HASH_COLUMN,
+        ROW_HASH_TABLE,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+    from sync_layer.schema_catalog import cached_statement, get_catalog
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     from core_functionalities.app_logging import get_logger
     from sync_layer.db_connection import (
         get_oracle_connection,
         get_sqlite_connection,
+        get_sqlite_snapshot,
+    )
+    from sync_layer.metrics import (
+        COMMIT,
+        CONNECT,
+        READ,
+        RUN,
+        TRANSFORM,
+        WRITE,
+        SyncMetrics,
+    )
+    from sync_layer.parallel_sync import (
+        dependency_order,
+        run_in_dependency_order,
     )
+    from sync_layer.pipeline import (
+        DEFAULT_QUEUE_SIZE,
+        check_cancelled,
+        run_pipeline,
+    )
+    from sync_layer.round_trips import count_round_trips
+    from sync_layer.row_hash import (
+        ROW_HASH_COLUMN,
+        ROW_HASH_TABLE,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+    from sync_layer.schema_catalog import cached_statement, get_catalog
 
 logger = get_logger(__name__)
 
+# Number of records bound per executemany() call (one round trip per batch)
+DEFAULT_BATCH_SIZE = 1000
+
+# Number of rows read from SQLite per fetchmany() call
+DEFAULT_CHUNK_SIZE = 1000
+
+# Number of tables synced concurrently, each on its own pooled session
+DEFAULT_PARALLELISM = int(os.getenv("SYNC_PARALLELISM", "4"))
+
+# Sync modes: one MERGE from dual per bound row, or array-insert into a
+# staging table followed by one set-based MERGE per table
+MODE_ROW = "row"
+MODE_STAGING = "staging"
+MODE_AUTO = "auto"
+# Append-only direct-path load used to seed an empty central table
+MODE_INITIAL = "initial"
+
+# Records bound per direct-path insert during an initial load
+INITIAL_LOAD_BATCH_SIZE = 50000
 
-def fetch_latest_records_sqlite(conn, table, last_sync_time):
+# Rows applied between two commits (checkpoints) of a table
+DEFAULT_CHECKPOINT_ROWS = 10000
+
+# Pending changes from which "auto" switches a table to the staging mode
+STAGING_THRESHOLD = int(os.getenv("SYNC_STAGING_THRESHOLD", "10000"))
+
+# Local change-data-capture table maintained by triggers (see setup_db.py)
+CHANGELOG_TABLE = "sync_changelog"
+
+# One chunk of changes flowing through the pipeline. ``upserts`` are full
+# records, ``deletes`` are 1-tuples of primary keys and ``last_seq`` is the
+# highest changelog sequence covered by the chunk (None for full scans).
+ChangeBatch = collections.namedtuple(
+    "ChangeBatch", ["upserts", "deletes", "last_seq"]
+)
+
+# Outcome of syncing one table
+TableSyncResult = collections.namedtuple(
+    "TableSyncResult", ["upserted", "deleted", "failures", "last_seq"]
+)
+
+
+def fetch_all_records_sqlite(
+    conn,
+    table,
+    columns,
+    after_key=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    hashed=False,
+):
     """
-    Fetch records modified after the last sync time from SQLite.
+    Fetch every record of a table from SQLite, ordered by primary key.
 
-    :param conn: SQLite connection object
+    Used for initial loads and for databases created before the changelog
+    existed. Records are read lazily with ``fetchmany`` so only one chunk
+    is held in memory at a time.
+
+    With ``hashed``, each record carries its content hash as an extra last
+    value and records whose hash matches the one last committed to Oracle
+    are left out (see :func:`record_row_hashes`).
+
+    :param conn: SQLite connection object, see
+                 :func:`~sync_layer.row_hash.prepare_sqlite` when hashed
     :param table: Table name to fetch records from
-    :param last_sync_time: Datetime object representing the last sync time
-    :return: List of tuples representing the records
+    :param columns: List of column names, primary key first
+    :param after_key: Only fetch records with a greater primary key, used
+                      to resume an interrupted scan
+    :param chunk_size: Number of rows per yielded chunk
+    :param hashed: Append content hashes and skip unchanged records
+    :return: Generator of lists of tuples representing the records
     """
     cursor = conn.cursor()
-
-    # Check if the updated_at column exists
-    cursor.execute(f"PRAGMA table_info({table})")
-    columns = [info[1] for info in cursor.fetchall()]
-
-    if "updated_at" in columns:
+    if hashed:
+        row_text = sqlite_row_text([f"t.{col}" for col in columns])
         query = f"""
-        SELECT * FROM {table}
-        WHERE updated_at > ?
+            SELECT {', '.join(f't.{col}' for col in columns)},
+                sync_content_hash({row_text}),
+                h.row_hash
+            FROM {table} t
+            LEFT JOIN {ROW_HASH_TABLE} h
+                ON h.table_name = ? AND h.row_id = t.{columns[0]}
         """
-        cursor.execute(query, (last_sync_time,))
+        params = (table,)
+        key = f"t.{columns[0]}"
     else:
-        logger.warning(
-            f"Table {table} does not have 'updated_at' column. "
-            f"Fetching all records."
+        query = f"SELECT {', '.join(columns)} FROM {table}"
+        params = ()
+        key = columns[0]
+    if after_key is not None:
+        query += f" WHERE {key} > ?"
+        params += (after_key,)
+    cursor.execute(f"{query} ORDER BY {key}", params)
+
+    try:
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                return
+            if hashed:
+                chunk = [row[:-1] for row in chunk if row[-2] != row[-1]]
+            yield chunk
+    finally:
+        cursor.close()
+
+
+def _table_exists(conn, name):
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        (name,),
+    )
+    exists = cursor.fetchone() is not None
+    cursor.close()
+    return exists
+
+
+def changelog_exists(conn):
+    """
+    Check whether the local SQLite DB has the change-data-capture table.
+
+    :param conn: SQLite connection object
+    :return: True if the changelog table exists
+    """
+    return _table_exists(conn, CHANGELOG_TABLE)
+
+
+def row_hashes_exist(conn):
+    """
+    Check whether the local SQLite DB records the content hashes last
+    committed to Oracle.
+
+    :param conn: SQLite connection object
+    :return: True if the row hash table exists
+    """
+    return _table_exists(conn, ROW_HASH_TABLE)
+
+
+def fetch_changes_sqlite(
+    conn,
+    table,
+    columns,
+    since_seq=0,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    hashed=False,
+):
+    """
+    Fetch the rows changed since ``since_seq`` from the SQLite changelog.
+
+    Repeated edits of the same row are coalesced into one operation: each
+    changed key appears once, ordered by its latest sequence, and carries
+    the row's current values. Keys whose row no longer exists become
+    deletes.
+
+    With ``hashed``, each upsert carries its content hash as an extra last
+    value, and rows touched without being changed since their last commit
+    to Oracle are left out before they reach the network.
+
+    :param conn: SQLite connection object, see
+                 :func:`~sync_layer.row_hash.prepare_sqlite` when hashed
+    :param table: Table name to fetch changes for
+    :param columns: List of column names, primary key first
+    :param since_seq: Last changelog sequence already acknowledged
+    :param chunk_size: Number of changed keys per yielded chunk
+    :param hashed: Append content hashes and skip unchanged rows
+    :return: Generator of :data:`ChangeBatch` tuples
+    """
+    if hashed:
+        row_text = sqlite_row_text([f"t.{col}" for col in columns])
+        query = cached_statement(
+            "changes_hashed",
+            table,
+            columns,
+            lambda: f"""
+            SELECT m.seq, m.row_id,
+                {', '.join(f't.{col}' for col in columns)},
+                sync_content_hash({row_text}),
+                h.row_hash
+            FROM (
+                SELECT row_id, MAX(seq) AS seq
+                FROM {CHANGELOG_TABLE}
+                WHERE table_name = ? AND seq > ?
+                GROUP BY row_id
+            ) m
+            LEFT JOIN {table} t ON t.{columns[0]} = m.row_id
+            LEFT JOIN {ROW_HASH_TABLE} h
+                ON h.table_name = ? AND h.row_id = m.row_id
+            ORDER BY m.seq
+        """,
         )
-        query = f"SELECT * FROM {table}"
-        cursor.execute(query)
+        params = (table, since_seq, table)
+    else:
+        query = cached_statement(
+            "changes",
+            table,
+            columns,
+            lambda: f"""
+            SELECT m.seq, m.row_id, {', '.join(f't.{col}' for col in columns)}
+            FROM (
+                SELECT row_id, MAX(seq) AS seq
+                FROM {CHANGELOG_TABLE}
+                WHERE table_name = ? AND seq > ?
+                GROUP BY row_id
+            ) m
+            LEFT JOIN {table} t ON t.{columns[0]} = m.row_id
+            ORDER BY m.seq
+        """,
+        )
+        params = (table, since_seq)
+    cursor = conn.cursor()
+    cursor.execute(query, params)
 
-    return cursor.fetchall()
+    skipped = 0
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            upserts = []
+            deletes = []
+            for row in rows:
+                if row[2] is None:
+                    deletes.append((row[1],))
+                elif not hashed:
+                    upserts.append(row[2:])
+                elif row[-2] == row[-1]:
+                    skipped += 1  # Touched but unchanged since last sync
+                else:
+                    upserts.append(row[2:-1])
+            yield ChangeBatch(upserts, deletes, rows[-1][0])
+    finally:
+        cursor.close()
+    if skipped:
+        logger.info(f"Skipped {skipped} unchanged rows of table {table}.")
 
 
-def sync_table_to_oracle(oracle_conn, table, columns, records):
+def get_changelog_seq(conn, table):
     """
-    Sync records from SQLite to Oracle DB for a specific table.
+    Return the highest changelog sequence recorded for a table.
 
-    :param oracle_conn: Oracle connection object
-    :param table: Table name to sync
-    :param columns: List of column names
-    :param records: List of tuples representing the records
+    :param conn: SQLite connection object
+    :param table: Table name
+    :return: Highest sequence, 0 if the table has no pending changes
     """
-    cursor = oracle_conn.cursor()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGELOG_TABLE} "
+        f"WHERE table_name = ?",
+        (table,),
+    )
+    seq = cursor.fetchone()[0]
+    cursor.close()
+    return seq
+
 
+def count_pending_changes(conn, table, since_seq=0):
+    """
+    Count the distinct keys changed since ``since_seq`` in the changelog.
+
+    :param conn: SQLite connection object
+    :param table: Table name
+    :param since_seq: Last changelog sequence already acknowledged
+    :return: Number of rows the next sync of the table would send
+    """
+    cursor = conn.cursor()
     cursor.execute(
-        "SELECT user, sys_context('USERENV', 'CURRENT_SCHEMA') FROM dual"
+        f"""
+        SELECT COUNT(DISTINCT row_id) FROM {CHANGELOG_TABLE}
+        WHERE table_name = ? AND seq > ?
+        """,
+        (table, since_seq),
     )
-    result = cursor.fetchone()
-    logger.info(
-        f"Connected to Oracle as user: {result[0]}, schema: {result[1]}"
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def acknowledge_changes(
+    conn, table, last_seq, failed_keys=(), columns=None, scan=False
+):
+    """
+    Remove changelog entries that have been committed to Oracle.
+
+    Keys Oracle rejected are logged again with a fresh sequence, past the
+    new watermark, so they are retried by the next sync.
+
+    With ``columns``, the content hashes of the committed rows are
+    recorded first (see :func:`record_row_hashes`).
+
+    :param conn: SQLite connection object
+    :param table: Table name the changes belong to
+    :param last_seq: Highest changelog sequence committed to Oracle
+    :param failed_keys: Primary keys of rows rejected by Oracle
+    :param columns: List of column names of a hashed table, primary key
+                    first
+    :param scan: The whole table was sent rather than its changes
+    """
+    cursor = conn.cursor()
+    cursor.executemany(
+        f"""
+        INSERT INTO {CHANGELOG_TABLE} (table_name, row_id, op)
+        VALUES (?, ?, 'U')
+        """,
+        [(table, key) for key in failed_keys],
+    )
+    if columns is not None:
+        record_row_hashes(cursor, table, columns, last_seq, scan=scan)
+    cursor.execute(
+        f"DELETE FROM {CHANGELOG_TABLE} WHERE table_name = ? AND seq <= ?",
+        (table, last_seq),
     )
+    conn.commit()
+    cursor.close()
 
-    cursor.execute("SELECT sys_context('USERENV', 'CON_NAME') FROM dual")
-    pdb_name = cursor.fetchone()
-    logger.info(f"Connected to PDB: {pdb_name[0]}")
 
-    # Explicitly specify the schema to avoid confusion
-    schema = "SYSTEM"
+def record_row_hashes(cursor, table, columns, last_seq, scan=False):
+    """
+    Remember the content hash of the rows committed to Oracle, so rows
+    touched later without being changed are not sent again.
 
-    # Use fully qualified table names
-    table_with_schema = f"{schema}.{table}"
+    Rows changed again after ``last_seq`` (including rejected rows, which
+    are logged again) are left without a hash, as Oracle may hold older
+    values for them; they are sent by the next sync.
+
+    :param cursor: SQLite cursor object, see
+                   :func:`~sync_layer.row_hash.prepare_sqlite`
+    :param table: Table name
+    :param columns: List of column names, primary key first
+    :param last_seq: Highest changelog sequence committed to Oracle
+    :param scan: The whole table was sent, not only the changed rows
+    """
+    primary_key = columns[0]
+    committed = ""
+    params = ()
+    if not scan:
+        committed = f"""
+            AND {{key}} IN (
+                SELECT row_id FROM {CHANGELOG_TABLE}
+                WHERE table_name = ? AND seq <= ?
+            )
+        """
+        params = (table, last_seq)
 
     cursor.execute(
-        "SELECT user, sys_context('USERENV', 'CURRENT_SCHEMA') FROM dual"
+        f"DELETE FROM {ROW_HASH_TABLE} WHERE table_name = ? "
+        + committed.format(key="row_id"),
+        (table,) + params,
     )
-    result = cursor.fetchone()
-    logger.info(
-        f"Connected to Oracle as user: {result[0]}, schema: {result[1]}"
+    cursor.execute(
+        f"""
+        INSERT OR REPLACE INTO {ROW_HASH_TABLE} (table_name, row_id, row_hash)
+        SELECT ?, {primary_key}, sync_content_hash({sqlite_row_text(columns)})
+        FROM {table}
+        WHERE {primary_key} NOT IN (
+            SELECT row_id FROM {CHANGELOG_TABLE}
+            WHERE table_name = ? AND seq > ?
+        )
+        """
+        + committed.format(key=primary_key),
+        (table, table, last_seq) + params,
     )
 
+
+def forget_row_hashes(conn, table):
+    """
+    Drop the recorded content hashes of a table, e.g. before an initial
+    load into an empty Oracle table they no longer describe.
+
+    :param conn: SQLite connection object
+    :param table: Table name
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        f"DELETE FROM {ROW_HASH_TABLE} WHERE table_name = ?", (table,)
+    )
+    conn.commit()
+    cursor.close()
+
+
+def get_device_id(sqlite_conn):
+    """
+    Identify this device in the central watermark table.
+
+    The ``SYNC_DEVICE_ID`` environment variable takes precedence, then the
+    id stored in the local ``sync_device`` table, then the host name.
+
+    :param sqlite_conn: SQLite connection object
+    :return: Device identifier string
+    """
+    device_id = os.getenv("SYNC_DEVICE_ID")
+    if device_id:
+        return device_id
+
+    cursor = sqlite_conn.cursor()
+    try:
+        cursor.execute("SELECT device_id FROM sync_device")
+        row = cursor.fetchone()
+    except sqlite3.OperationalError:
+        row = None  # Database created before sync_device existed
+    finally:
+        cursor.close()
+
+    return row[0] if row else socket.gethostname()
+
+
+def iter_batches(records, batch_size):
+    """
+    Split an iterable of records into lists of at most ``batch_size`` items.
+
+    :param records: Iterable of record tuples
+    :param batch_size: Maximum number of records per batch
+    :return: Generator of record lists
+    """
+    iterator = iter(records)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _hash_guard(columns):
+    # Skip updates that would rewrite a row with identical content
+    if ROW_HASH_COLUMN not in columns:
+        return ""
+    return f"""
+            WHERE d.{ROW_HASH_COLUMN} IS NULL
+                OR d.{ROW_HASH_COLUMN} <> s.{ROW_HASH_COLUMN}"""
+
+
+def build_merge_query(table_with_schema, columns, guard=True):
+    """
+    Build the MERGE statement used to upsert a single bound record.
+
+    :param table_with_schema: Fully qualified Oracle table name
+    :param columns: List of column names, primary key first
+    :param guard: With a ``row_hash`` column, leave matched rows whose
+                  stored hash is the bound one untouched
+    :return: MERGE statement with positional binds ``:1 .. :n``
+    """
     # Assume first column is the primary key (id)
     primary_key = columns[0]
     non_primary_columns = columns[1:]
@@ -101,7 +529,7 @@ def sync_table_to_oracle(oracle_conn, table, columns, records):
 
     # MERGE statement to either update or insert records
     # NOTE it is different than POSTGRES `ON CONFLICT`
-    merge_query = f"""
+    return f"""
         MERGE INTO {table_with_schema} d
         USING (
             SELECT 
@@ -110,119 +538,1032 @@ def sync_table_to_oracle(oracle_conn, table, columns, records):
         ) s
         ON (d.{primary_key} = s.{primary_key})
         WHEN MATCHED THEN
-            UPDATE SET {merge_columns}
+            UPDATE SET {merge_columns}{_hash_guard(columns) if guard else ""}
         WHEN NOT MATCHED THEN
             INSERT ({", ".join(columns)})
             VALUES ({", ".join([f"s.{col}" for col in columns])})
     """
 
+
+def build_staging_queries(
+    table_with_schema, columns, schema, table, guard=True
+):
+    """
+    Build the statements of the staging mode for one table.
+
+    :param table_with_schema: Fully qualified Oracle table name
+    :param columns: List of column names, primary key first
+    :param schema: Oracle schema holding the staging and error tables
+    :param table: Unqualified table name
+    :param guard: See :func:`build_merge_query`
+    :return: Tuple ``(insert_query, merge_query, error_table)``
+    """
+    guard = _hash_guard(columns) if guard else ""
+    staging_table = f"{schema}.sync_stage_{table}"
+    error_table = f"{schema}.sync_err_{table}"
+    primary_key = columns[0]
+    set_clause = ", ".join(f"d.{col} = s.{col}" for col in columns[1:])
+
+    insert_query = f"""
+        INSERT INTO {staging_table} ({", ".join(columns)})
+        VALUES ({", ".join(f":{i+1}" for i in range(len(columns)))})
+    """
+    merge_query = f"""
+        MERGE INTO {table_with_schema} d
+        USING {staging_table} s
+        ON (d.{primary_key} = s.{primary_key})
+        WHEN MATCHED THEN
+            UPDATE SET {set_clause}{guard}
+        WHEN NOT MATCHED THEN
+            INSERT ({", ".join(columns)})
+            VALUES ({", ".join(f"s.{col}" for col in columns)})
+        LOG ERRORS INTO {error_table} (:1) REJECT LIMIT UNLIMITED
+    """
+    return insert_query, merge_query, error_table
+
+
+def merge_staged(cursor, merge_query, error_table, primary_key):
+    """
+    Merge the staged rows into the target table with one statement.
+
+    Rows the MERGE rejects are written to the DML error log instead of
+    failing the statement; they are read back and cleared.
+
+    :param cursor: Oracle cursor object
+    :param merge_query: Set-based MERGE from :func:`build_staging_queries`
+    :param error_table: DML error log table of the target table
+    :param primary_key: Primary key column name
+    :return: List of ``(key, message)`` tuples for the rejected rows
+    """
+    tag = uuid.uuid4().hex
+    cursor.execute(merge_query, [tag])
+    cursor.execute(
+        f"""
+        SELECT {primary_key}, ora_err_mesg$ FROM {error_table}
+        WHERE ora_err_tag$ = :1
+        """,
+        [tag],
+    )
+    failures = [(key, message.strip()) for key, message in cursor.fetchall()]
+    if failures:
+        cursor.execute(
+            f"DELETE FROM {error_table} WHERE ora_err_tag$ = :1", [tag]
+        )
+    return failures
+
+
+def build_append_query(table_with_schema, columns):
+    """
+    Build the direct-path INSERT used by the initial load.
+
+    :param table_with_schema: Fully qualified Oracle table name
+    :param columns: List of column names, primary key first
+    :return: INSERT statement with positional binds ``:1 .. :n``
+    """
+    return f"""
+        INSERT /*+ APPEND_VALUES */ INTO {table_with_schema}
+        ({", ".join(columns)})
+        VALUES ({", ".join(f":{i+1}" for i in range(len(columns)))})
+    """
+
+
+def oracle_table_is_empty(oracle_conn, table_with_schema):
+    """
+    Check whether an Oracle table holds no rows.
+
+    :param oracle_conn: Oracle connection object
+    :param table_with_schema: Fully qualified Oracle table name
+    :return: True if the table is empty
+    """
+    cursor = oracle_conn.cursor()
+    cursor.execute(f"SELECT 1 FROM {table_with_schema} WHERE ROWNUM = 1")
+    is_empty = cursor.fetchone() is None
+    cursor.close()
+    return is_empty
+
+
+def reset_identity(cursor, schema, table):
+    """
+    Move a table's identity sequence past the highest loaded key.
+
+    Rows loaded with explicit keys do not advance the identity sequence,
+    so later inserts relying on it would collide without this.
+
+    :param cursor: Oracle cursor object
+    :param schema: Oracle schema owning the table
+    :param table: Unqualified table name
+    """
+    cursor.execute(
+        """
+        SELECT column_name FROM all_tab_identity_cols
+        WHERE owner = :1 AND table_name = :2
+        """,
+        (schema.upper(), table.upper()),
+    )
+    for (column,) in cursor.fetchall():
+        cursor.execute(
+            f"""
+            ALTER TABLE {schema}.{table} MODIFY {column}
+            GENERATED BY DEFAULT ON NULL AS IDENTITY (START WITH LIMIT VALUE)
+            """
+        )
+        logger.info(f"Reset identity of {schema}.{table}.{column}.")
+
+
+def execute_batch(cursor, query, columns, batch):
+    """
+    Bind one batch of records with a single array-DML round trip.
+
+    Rows Oracle rejects (constraint violations, bad values) do not abort
+    the batch; they are collected through ``batcherrors`` instead.
+
+    :param cursor: Oracle cursor object
+    :param query: Statement binding a whole record, e.g. from
+                  :func:`build_merge_query`
+    :param columns: List of column names, primary key first
+    :param batch: List of record tuples
+    :return: List of ``(key, message)`` tuples for the rejected rows
+    """
+    failures = []
+    rows = []
+    for record in batch:
+        # Ensure each record has the correct number of columns
+        if len(record) != len(columns):
+            failures.append(
+                (
+                    record[0] if record else None,
+                    f"Record {record} differ column count {len(columns)}",
+                )
+            )
+        else:
+            rows.append(record)
+
+    if rows:
+        cursor.executemany(query, rows, batcherrors=True)
+        for error in cursor.getbatcherrors():
+            failures.append((rows[error.offset][0], error.message))
+
+    return failures
+
+
+def delete_batch(cursor, delete_query, batch):
+    """
+    Delete one batch of keys with a single array-DML round trip.
+
+    :param cursor: Oracle cursor object
+    :param delete_query: DELETE statement binding the primary key as ``:1``
+    :param batch: List of 1-tuples holding primary keys
+    :return: List of ``(key, message)`` tuples for the rejected rows
+    """
+    cursor.executemany(delete_query, batch, batcherrors=True)
+    return [
+        (batch[error.offset][0], error.message)
+        for error in cursor.getbatcherrors()
+    ]
+
+
+def apply_changes_to_oracle(
+    oracle_conn,
+    table,
+    columns,
+    change_batches,
+    batch_size=DEFAULT_BATCH_SIZE,
+    device_id=None,
+    mode=MODE_ROW,
+    scan=False,
+    checkpoint_rows=DEFAULT_CHECKPOINT_ROWS,
+    metrics=None,
+    overwrite=False,
+):
+    """
+    Apply upserts and deletes from SQLite to Oracle DB for a specific table.
+
+    Records are bound in batches of ``batch_size`` so a table costs one
+    round trip per batch rather than one per row. Rows rejected by Oracle
+    are logged with their primary key and returned; the remaining rows
+    are committed.
+
+    In the staging mode the upserts are array-inserted into the table's
+    global temporary staging table and merged with a single set-based
+    MERGE before each commit, moving the merge work into the database.
+
+    In the initial-load mode the upserts are appended to the (empty)
+    table with direct-path inserts, committed batch by batch as direct
+    path requires, and the identity sequence is reset after the final
+    commit.
+
+    Work is committed every ``checkpoint_rows`` rows. When ``device_id``
+    is given, each commit also records how far the table got, so an
+    interrupted sync resumes from the last committed batch: changelog
+    reads advance the watermark, while primary-key ordered scans
+    (``scan``) write the last key to the ``sync_checkpoint`` journal,
+    which is cleared once the table completes. Neither ever moves past
+    rows that are not committed in Oracle.
+
+    :param oracle_conn: Oracle connection object
+    :param table: Table name to sync
+    :param columns: List of column names
+    :param change_batches: Iterable of :data:`ChangeBatch` tuples
+    :param batch_size: Number of records bound per round trip
+    :param device_id: Device whose watermark to advance, if any
+    :param mode: :data:`MODE_ROW`, :data:`MODE_STAGING` or
+                 :data:`MODE_INITIAL`
+    :param scan: The batches come from a primary-key ordered full scan
+    :param checkpoint_rows: Number of rows applied between commits
+    :param metrics: :class:`~sync_layer.metrics.SyncMetrics` receiving the
+                    batch latencies and the transform, write and commit
+                    timings
+    :param overwrite: Rewrite matched rows even when their stored content
+                      hash is the one sent, as repairs of rows changed in
+                      Oracle do
+    :return: :data:`TableSyncResult` for the table
+    """
+    metrics = metrics if metrics is not None else SyncMetrics()
+    cursor = oracle_conn.cursor()
+    guard = not overwrite
+    variant = "_overwrite" if overwrite else ""
+
+    # Explicitly specify the schema to avoid confusion
+    schema = "SYSTEM"
+
+    # Use fully qualified table names
+    table_with_schema = f"{schema}.{table}"
+
+    if mode == MODE_STAGING:
+        upsert_query, merge_query, error_table = cached_statement(
+            f"staging{variant}",
+            table_with_schema,
+            columns,
+            lambda: build_staging_queries(
+                table_with_schema, columns, schema, table, guard
+            ),
+        )
+    elif mode == MODE_INITIAL:
+        upsert_query = merge_query = cached_statement(
+            "append",
+            table_with_schema,
+            columns,
+            lambda: build_append_query(table_with_schema, columns),
+        )
+    else:
+        upsert_query = merge_query = cached_statement(
+            f"merge{variant}",
+            table_with_schema,
+            columns,
+            lambda: build_merge_query(table_with_schema, columns, guard),
+        )
+    delete_query = f"DELETE FROM {table_with_schema} WHERE {columns[0]} = :1"
+    logger.debug(f"MERGE query: {merge_query}")
+
+    upserted = 0
+    deleted = 0
+    last_seq = None
+    last_key = None
+    pending = 0  # Rows applied since the last commit
+    committed_seq = None  # Watermark written by the last commit
+    failures = []
+
+    def write_batch(execute, batch):
+        start = time.perf_counter()
+        failures.extend(execute(batch))
+        metrics.observe_batch(table, time.perf_counter() - start, batch)
+
+    def merge():
+        with metrics.phase(table, WRITE):
+            failures.extend(
+                merge_staged(cursor, merge_query, error_table, columns[0])
+            )
+
+    def commit_checkpoint():
+        nonlocal committed_seq
+        if mode == MODE_STAGING:
+            merge()
+        with metrics.phase(table, COMMIT):
+            if device_id is not None:
+                if scan:
+                    save_checkpoint(
+                        cursor, device_id, table, mode, last_key, last_seq
+                    )
+                elif last_seq is not None:
+                    update_table_watermark(cursor, device_id, table, last_seq)
+            oracle_conn.commit()
+        committed_seq = last_seq
+
+    def batches(records):
+        return metrics.timed(
+            table, TRANSFORM, iter_batches(records, batch_size)
+        )
+
     try:
-        for record in records:
-            # Ensure each record has the correct number of columns
-            if len(record) != len(columns):
-                raise ValueError(
-                    f"Record {record} differ column count {len(columns)}"
+        for changes in change_batches:
+            for batch in batches(changes.upserts):
+                upserted += len(batch)
+                pending += len(batch)
+                write_batch(
+                    lambda b: execute_batch(cursor, upsert_query, columns, b),
+                    batch,
                 )
+                last_key = batch[-1][0]
+                if mode == MODE_INITIAL:
+                    commit_checkpoint()  # Direct path needs a commit
+                    pending = 0
+            for batch in batches(changes.deletes):
+                deleted += len(batch)
+                pending += len(batch)
+                write_batch(
+                    lambda b: delete_batch(cursor, delete_query, b), batch
+                )
+            if changes.last_seq is not None:
+                last_seq = changes.last_seq
+            if pending >= checkpoint_rows:
+                commit_checkpoint()
+                pending = 0
 
-            cursor.execute(merge_query, record)
-            logger.debug(f"MERGE query: {merge_query}")
-            logger.debug(f"Record to insert/update: {record}")
-        oracle_conn.commit()
+        if mode == MODE_STAGING and pending:
+            merge()
+        # Skip the round trips when the last checkpoint committed it all
+        uncommitted = pending or last_seq != committed_seq
+        if uncommitted or scan or mode == MODE_INITIAL:
+            with metrics.phase(table, COMMIT):
+                if device_id is not None:
+                    if scan:
+                        clear_checkpoint(cursor, device_id, table)
+                    if last_seq is not None:
+                        update_table_watermark(
+                            cursor, device_id, table, last_seq
+                        )
+                oracle_conn.commit()
+        if mode == MODE_INITIAL:
+            # DDL commits implicitly, so it runs once the load and its
+            # checkpoint are committed together
+            reset_identity(cursor, schema, table)
+        for key, message in failures:
+            logger.error(
+                f"Failed to sync {columns[0]}={key} "
+                f"to {table_with_schema}: {message}"
+            )
         logger.info(
-            f"Synced {len(records)} records to {table_with_schema} in Oracle."
+            f"Synced {upserted} upserts and {deleted} deletes "
+            f"({len(failures)} rejected) to {table_with_schema} in Oracle."
         )
     except cx_Oracle.Error as e:
         logger.error(f"Error syncing records to {table_with_schema}: {e}")
-        oracle_conn.rollback()  # Rollback in case of failure
+        oracle_conn.rollback()  # Rollback to the last checkpoint
+        raise
+    except Exception:
+        oracle_conn.rollback()  # e.g. the SQLite reader failed mid-table
         raise
     finally:
         cursor.close()
 
+    return TableSyncResult(upserted, deleted, failures, last_seq)
 
-def get_last_sync_time(oracle_conn):
+
+def sync_table_to_oracle(
+    oracle_conn, table, columns, records, batch_size=DEFAULT_BATCH_SIZE
+):
+    """
+    Sync records from SQLite to Oracle DB for a specific table.
+
+    :param oracle_conn: Oracle connection object
+    :param table: Table name to sync
+    :param columns: List of column names
+    :param records: Iterable of tuples representing the records
+    :param batch_size: Number of records bound per round trip
+    :return: List of ``(key, message)`` tuples for the rejected rows
+    """
+    change_batches = (
+        ChangeBatch(batch, [], None)
+        for batch in iter_batches(records, batch_size)
+    )
+    result = apply_changes_to_oracle(
+        oracle_conn, table, columns, change_batches, batch_size=batch_size
+    )
+    return result.failures
+
+
+def get_table_watermark(oracle_conn, device_id, table):
     """
-    Retrieve the last synchronization time from the sync_metadata table.
+    Retrieve the last changelog sequence committed for a device's table.
 
     :param oracle_conn: Oracle connection object
-    :return: Datetime object representing the last sync time
+    :param device_id: Device identifier
+    :param table: Table name
+    :return: Last committed sequence, 0 if the table was never synced
     """
     cursor = oracle_conn.cursor()
-    cursor.execute("SELECT last_sync FROM sync_metadata WHERE sync_id = 1")
+    cursor.execute(
+        """
+        SELECT last_seq FROM sync_metadata
+        WHERE device_id = :1 AND table_name = :2
+        """,
+        (device_id, table),
+    )
     result = cursor.fetchone()
+    cursor.close()
 
-    if result:
-        return result[0]  # Return the last sync time as a datetime object
-    else:
-        # If no sync has occurred, return the epoch
-        return datetime.datetime(1970, 1, 1)
+    return result[0] if result else 0
+
+
+def update_table_watermark(cursor, device_id, table, last_seq):
+    """
+    Record the last changelog sequence committed for a device's table.
+
+    The caller commits, so the watermark is written in the same transaction
+    as the data it covers.
+
+    :param cursor: Oracle cursor object
+    :param device_id: Device identifier
+    :param table: Table name
+    :param last_seq: Last changelog sequence committed
+    """
+    cursor.execute(
+        """
+        MERGE INTO sync_metadata d
+        USING (
+            SELECT :1 AS device_id, :2 AS table_name, :3 AS last_seq
+            FROM dual
+        ) s
+        ON (d.device_id = s.device_id AND d.table_name = s.table_name)
+        WHEN MATCHED THEN
+            UPDATE SET d.last_seq = s.last_seq, d.last_sync = SYSTIMESTAMP
+        WHEN NOT MATCHED THEN
+            INSERT (device_id, table_name, last_seq, last_sync)
+            VALUES (s.device_id, s.table_name, s.last_seq, SYSTIMESTAMP)
+    """,
+        (device_id, table, last_seq),
+    )
 
 
-def update_last_sync_time(oracle_conn, new_sync_time):
+def get_checkpoint(oracle_conn, device_id, table):
     """
-    Update the last synchronization time in the sync_metadata table.
+    Retrieve the checkpoint of an interrupted full scan of a table.
 
     :param oracle_conn: Oracle connection object
-    :param new_sync_time: Datetime object representing the new sync time
+    :param device_id: Device identifier
+    :param table: Table name
+    :return: Tuple ``(mode, last_key, snapshot_seq)`` or None
     """
     cursor = oracle_conn.cursor()
+    cursor.execute(
+        """
+        SELECT sync_mode, last_key, snapshot_seq FROM sync_checkpoint
+        WHERE device_id = :1 AND table_name = :2
+        """,
+        (device_id, table),
+    )
+    result = cursor.fetchone()
+    cursor.close()
+    return result
+
+
+def get_sync_state(oracle_conn, device_id, table):
+    """
+    Retrieve a table's watermark and checkpoint in one round trip.
 
+    :param oracle_conn: Oracle connection object
+    :param device_id: Device identifier
+    :param table: Table name
+    :return: Tuple ``(watermark, checkpoint)`` as returned by
+             :func:`get_table_watermark` and :func:`get_checkpoint`
+    """
+    cursor = oracle_conn.cursor()
     cursor.execute(
         """
-        MERGE INTO sync_metadata d
-        USING (SELECT 1 AS sync_id, :1 AS last_sync FROM dual) s
-        ON (d.sync_id = s.sync_id)
+        SELECT m.last_seq, c.sync_mode, c.last_key, c.snapshot_seq
+        FROM dual
+        LEFT JOIN sync_metadata m
+            ON m.device_id = :device_id AND m.table_name = :table_name
+        LEFT JOIN sync_checkpoint c
+            ON c.device_id = :device_id AND c.table_name = :table_name
+        """,
+        device_id=device_id,
+        table_name=table,
+    )
+    row = cursor.fetchone() or (None, None, None, None)
+    cursor.close()
+
+    last_seq, mode, last_key, snapshot_seq = row
+    checkpoint = None
+    if mode is not None:
+        checkpoint = (mode, last_key, snapshot_seq)
+    return last_seq or 0, checkpoint
+
+
+def save_checkpoint(cursor, device_id, table, mode, last_key, snapshot_seq):
+    """
+    Record the last primary key committed by a full scan of a table.
+
+    The caller commits, so the checkpoint is written in the same
+    transaction as the batch it covers.
+
+    :param cursor: Oracle cursor object
+    :param device_id: Device identifier
+    :param table: Table name
+    :param mode: Sync mode of the scan, reused when resuming
+    :param last_key: Last primary key committed
+    :param snapshot_seq: Changelog sequence the scan started from
+    """
+    cursor.execute(
+        """
+        MERGE INTO sync_checkpoint d
+        USING (
+            SELECT :1 AS device_id, :2 AS table_name, :3 AS sync_mode,
+                   :4 AS last_key, :5 AS snapshot_seq
+            FROM dual
+        ) s
+        ON (d.device_id = s.device_id AND d.table_name = s.table_name)
         WHEN MATCHED THEN
-            UPDATE SET d.last_sync = s.last_sync
+            UPDATE SET d.sync_mode = s.sync_mode, d.last_key = s.last_key,
+                       d.snapshot_seq = s.snapshot_seq,
+                       d.updated_at = SYSTIMESTAMP
         WHEN NOT MATCHED THEN
-            INSERT (sync_id, last_sync)
-            VALUES (s.sync_id, s.last_sync)
+            INSERT (device_id, table_name, sync_mode, last_key,
+                    snapshot_seq, updated_at)
+            VALUES (s.device_id, s.table_name, s.sync_mode, s.last_key,
+                    s.snapshot_seq, SYSTIMESTAMP)
     """,
-        (new_sync_time,),
+        (device_id, table, mode, last_key, snapshot_seq),
+    )
+
+
+def clear_checkpoint(cursor, device_id, table):
+    """
+    Remove the checkpoint of a table whose full scan has completed.
+
+    :param cursor: Oracle cursor object
+    :param device_id: Device identifier
+    :param table: Table name
+    """
+    cursor.execute(
+        "DELETE FROM sync_checkpoint WHERE device_id = :1 AND table_name = :2",
+        (device_id, table),
+    )
+
+
+def stream_table_to_oracle(
+    oracle_conn,
+    table,
+    columns,
+    change_batches,
+    batch_size=DEFAULT_BATCH_SIZE,
+    queue_size=DEFAULT_QUEUE_SIZE,
+    device_id=None,
+    mode=MODE_ROW,
+    scan=False,
+    checkpoint_rows=DEFAULT_CHECKPOINT_ROWS,
+    metrics=None,
+    cancel=None,
+):
+    """
+    Stream chunks of SQLite changes into Oracle while they are being read.
+
+    The chunks are consumed in the calling thread and handed to
+    :func:`apply_changes_to_oracle` running in a writer thread through a
+    bounded queue, so at most ``queue_size`` chunks are held in memory.
+
+    :param oracle_conn: Oracle connection object
+    :param table: Table name to sync
+    :param columns: List of column names
+    :param change_batches: Iterable of :data:`ChangeBatch` tuples, e.g.
+                           from :func:`fetch_changes_sqlite`
+    :param batch_size: Number of records bound per Oracle round trip
+    :param queue_size: Maximum number of chunks buffered in memory
+    :param device_id: Device whose watermark to advance, if any
+    :param mode: :data:`MODE_ROW`, :data:`MODE_STAGING` or
+                 :data:`MODE_INITIAL`
+    :param scan: The chunks come from a primary-key ordered full scan
+    :param checkpoint_rows: Number of rows applied between commits
+    :param metrics: :class:`~sync_layer.metrics.SyncMetrics` of the run
+    :param cancel: threading.Event cancelling the table when set; the work
+                   since the last checkpoint is rolled back
+    :return: :data:`TableSyncResult` for the table
+    :raises ~sync_layer.pipeline.PipelineCancelled: If cancelled
+    """
+    return run_pipeline(
+        change_batches,
+        lambda batches: apply_changes_to_oracle(
+            oracle_conn,
+            table,
+            columns,
+            batches,
+            batch_size=batch_size,
+            device_id=device_id,
+            mode=mode,
+            scan=scan,
+            checkpoint_rows=checkpoint_rows,
+            metrics=metrics,
+        ),
+        queue_size=queue_size,
+        cancel=cancel,
     )
 
-    oracle_conn.commit()
+
+def sync_table(
+    sqlite_conn,
+    oracle_conn,
+    table,
+    columns,
+    device_id,
+    use_changelog=True,
+    batch_size=DEFAULT_BATCH_SIZE,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    queue_size=DEFAULT_QUEUE_SIZE,
+    mode=MODE_AUTO,
+    initial_load=None,
+    checkpoint_rows=DEFAULT_CHECKPOINT_ROWS,
+    hashed=False,
+    snapshot_conn=None,
+    metrics=None,
+    cancel=None,
+):
+    """
+    Sync one table from SQLite to Oracle DB.
+
+    In :data:`MODE_AUTO` the table uses the staging mode when at least
+    :data:`STAGING_THRESHOLD` rows are pending, and row MERGEs otherwise.
+
+    A table never synced by this device whose Oracle counterpart is empty
+    (or any table when ``initial_load`` is True) is seeded with an
+    append-only :data:`MODE_INITIAL` load of the whole SQLite table; the
+    watermark then moves to the changelog sequence read before the load.
+
+    Work is committed every ``checkpoint_rows`` rows together with the
+    progress made, so a sync interrupted mid-table (timeout, network
+    drop) resumes from the last committed batch on the next run.
+
+    For a ``hashed`` table, rows whose content hash matches the one last
+    committed to Oracle are not sent, the others are sent with their hash
+    and the MERGE only rewrites Oracle rows whose stored hash differs.
+
+    With ``snapshot_conn``, every read of the table (the changelog, its
+    sequence and the rows) goes through that connection's read
+    transaction, so the watermark is derived from the same snapshot as
+    the rows sent. ``sqlite_conn`` is then only used to acknowledge.
+
+    :param sqlite_conn: SQLite connection object
+    :param oracle_conn: Oracle connection object
+    :param table: Table name to sync
+    :param columns: List of column names, primary key first
+    :param device_id: Device whose watermark to read and advance
+    :param use_changelog: Read the changelog instead of the whole table
+    :param batch_size: Number of records bound per Oracle round trip
+    :param chunk_size: Number of rows read from SQLite per chunk
+    :param queue_size: Maximum number of chunks buffered in memory
+    :param mode: :data:`MODE_ROW`, :data:`MODE_STAGING` or
+                 :data:`MODE_AUTO`
+    :param initial_load: Force (True) or disable (False) the initial
+                         load; None detects an empty target table
+    :param checkpoint_rows: Number of rows applied between commits
+    :param hashed: The Oracle table has a ``row_hash`` column and the local
+                   DB records the hashes committed to it; requires the
+                   changelog
+    :param snapshot_conn: SQLite connection holding a read transaction, see
+                          :func:`~sync_layer.db_connection.get_sqlite_snapshot`;
+                          for a hashed table it must have been prepared with
+                          :func:`~sync_layer.row_hash.prepare_sqlite`
+    :param metrics: :class:`~sync_layer.metrics.SyncMetrics` receiving the
+                    table's timings, a throwaway one if None
+    :param cancel: threading.Event cancelling the sync when set, see
+                   :func:`stream_table_to_oracle`
+    :return: :data:`TableSyncResult`, or None if nothing had to be sent
+    :raises ~sync_layer.pipeline.PipelineCancelled: If cancelled
+    """
+    check_cancelled(cancel)
+    metrics = metrics if metrics is not None else SyncMetrics()
+    started = time.perf_counter()
+    oracle_conn = count_round_trips(oracle_conn, metrics.round_trips(table))
+    hashed = hashed and use_changelog
+    if hashed:
+        prepare_sqlite(sqlite_conn)
+    reader = sqlite_conn if snapshot_conn is None else snapshot_conn
+
+    watermark, checkpoint = get_sync_state(oracle_conn, device_id, table)
+    if use_changelog:
+        logger.info(f"Watermark for table {table}: {watermark}")
+    else:
+        watermark = 0
+
+    after_key = None
+    snapshot_seq = None
+    if checkpoint is not None:
+        mode, after_key, snapshot_seq = checkpoint
+        logger.info(
+            f"Resuming {mode} scan of table {table} after key {after_key}."
+        )
+    else:
+        if initial_load is None:
+            initial_load = watermark == 0 and oracle_table_is_empty(
+                oracle_conn, f"SYSTEM.{table}"
+            )
+
+        if initial_load:
+            mode = MODE_INITIAL
+            # Rows changed after this point are sent again by the next sync
+            if use_changelog:
+                snapshot_seq = get_changelog_seq(reader, table)
+            # Recorded hashes do not describe the empty Oracle table
+            if hashed:
+                forget_row_hashes(sqlite_conn, table)
+        elif not use_changelog:
+            logger.warning(
+                f"No changelog available for table {table}. "
+                f"Fetching all records."
+            )
+            if mode == MODE_AUTO:
+                cursor = reader.cursor()
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                pending = cursor.fetchone()[0]
+                cursor.close()
+                mode = (
+                    MODE_STAGING if pending >= STAGING_THRESHOLD else MODE_ROW
+                )
+        elif mode == MODE_AUTO:
+            pending = count_pending_changes(reader, table, watermark)
+            mode = MODE_STAGING if pending >= STAGING_THRESHOLD else MODE_ROW
+
+    if mode == MODE_INITIAL:
+        batch_size = max(batch_size, INITIAL_LOAD_BATCH_SIZE)
+        chunk_size = max(chunk_size, INITIAL_LOAD_BATCH_SIZE)
+
+    # Initial loads, resumed scans and changelog-less databases read the
+    # whole table in primary-key order and are checkpointed by last key
+    scan = checkpoint is not None or mode == MODE_INITIAL or not use_changelog
+    if scan:
+        reading = fetch_all_records_sqlite(
+            reader,
+            table,
+            columns,
+            after_key=after_key,
+            chunk_size=chunk_size,
+            hashed=hashed,
+        )
+        change_batches = (
+            ChangeBatch(chunk, [], snapshot_seq) for chunk in reading
+        )
+    else:
+        reading = change_batches = fetch_changes_sqlite(
+            reader,
+            table,
+            columns,
+            watermark,
+            chunk_size=chunk_size,
+            hashed=hashed,
+        )
+
+    try:
+        change_batches = metrics.timed(table, READ, change_batches)
+
+        # A resumed scan with nothing left still runs, to clear its
+        # checkpoint
+        first_batch = next(change_batches, None)
+        if first_batch is not None:
+            change_batches = itertools.chain([first_batch], change_batches)
+        elif checkpoint is None:
+            logger.info(f"No new records to sync for table {table}.")
+            metrics.table_finished(table, time.perf_counter() - started)
+            return None
+        logger.info(f"Syncing table {table} in {mode} mode.")
+
+        result = stream_table_to_oracle(
+            oracle_conn,
+            table,
+            columns + [ROW_HASH_COLUMN] if hashed else columns,
+            change_batches,
+            batch_size=batch_size,
+            queue_size=queue_size,
+            device_id=device_id,
+            mode=mode,
+            scan=scan,
+            checkpoint_rows=checkpoint_rows,
+            metrics=metrics,
+            cancel=cancel,
+        )
+    finally:
+        # The wrappers above do not pass close() on; release the SQLite
+        # cursor in this thread even when the writer failed
+        reading.close()
+    if result.last_seq is not None:
+        with metrics.phase(table, COMMIT):
+            acknowledge_changes(
+                sqlite_conn,
+                table,
+                result.last_seq,
+                [key for key, _ in result.failures],
+                columns=columns if hashed else None,
+                scan=scan,
+            )
+    metrics.table_finished(table, time.perf_counter() - started)
+    return result
+
+
+def _sync_table_on_own_connections(
+    db_path, table, columns, device_id, snapshot_conn=None, metrics=None, **kw
+):
+    """
+    Sync one table on a dedicated SQLite connection and pooled session.
+
+    Used by the parallel scheduler: SQLite connections cannot be shared
+    across threads and each table commits on its own Oracle session.
+    Reads go through the run's shared snapshot when there is one, or
+    through a read transaction of the table's own otherwise.
+
+    :param db_path: Path to the SQLite database file
+    :param table: Table name to sync
+    :param columns: List of column names, primary key first
+    :param device_id: Device whose watermark to read and advance
+    :param snapshot_conn: Shared, prepared snapshot connection, if any
+    :param metrics: :class:`~sync_layer.metrics.SyncMetrics` of the run
+    :param kw: Keyword arguments passed on to :func:`sync_table`
+    :return: :data:`TableSyncResult`, or None if nothing had to be sent
+    """
+    metrics = metrics if metrics is not None else SyncMetrics()
+    with metrics.phase(table, CONNECT):
+        oracle_conn = get_oracle_connection()
+        sqlite_conn = get_sqlite_connection(db_path)
+        own_snapshot = None
+        if snapshot_conn is None:
+            snapshot_conn = own_snapshot = get_sqlite_snapshot(db_path)
+            prepare_sqlite(snapshot_conn)
+    try:
+        return sync_table(
+            sqlite_conn,
+            oracle_conn,
+            table,
+            columns,
+            device_id,
+            snapshot_conn=snapshot_conn,
+            metrics=metrics,
+            **kw,
+        )
+    finally:
+        if own_snapshot is not None:
+            own_snapshot.close()
+        sqlite_conn.close()
+        oracle_conn.close()
 
 
-def sync_databases():
+def sync_databases(
+    batch_size=DEFAULT_BATCH_SIZE,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    queue_size=DEFAULT_QUEUE_SIZE,
+    parallelism=DEFAULT_PARALLELISM,
+    db_path=None,
+    modes=None,
+    initial_load=None,
+    checkpoint_rows=DEFAULT_CHECKPOINT_ROWS,
+    progress=None,
+    cancel=None,
+):
     """
     Perform synchronization from SQLite to Oracle DB.
+
+    When the local changelog is available only the rows changed since the
+    table's watermark are sent (including deletes), so the cost is
+    proportional to the number of changes rather than the table size.
+    Watermarks are kept per device and per table and only advance with
+    the Oracle commit of the rows they cover. Tables whose Oracle copy has
+    a ``row_hash`` column skip rows touched without being changed.
+
+    Tables are synced in foreign-key order. With ``parallelism`` above one,
+    independent tables run concurrently on separate pooled sessions and a
+    dependent table starts as soon as its parents have committed.
+
+    All tables are read from one WAL read transaction, so the run sends a
+    consistent snapshot of the local DB (watermarks included) while the
+    GUI keeps writing. If the SQLite library cannot share a connection
+    between threads, parallel tables each read from their own snapshot.
+
+    :param batch_size: Number of records bound per Oracle round trip
+    :param chunk_size: Number of rows read from SQLite per chunk
+    :param queue_size: Maximum number of chunks buffered per table
+    :param parallelism: Maximum number of tables synced concurrently
+    :param db_path: Path to the SQLite database file
+    :param modes: Dict mapping table names to a sync mode; tables not
+                  listed use :data:`MODE_AUTO`
+    :param initial_load: Force (True) or disable (False) the append-only
+                         initial load; None uses it for empty target tables
+    :param checkpoint_rows: Number of rows applied between commits; an
+                            interrupted sync resumes from the last one
+    :param progress: Callable receiving the table name and its
+                     :data:`TableSyncResult` (None if nothing had to be
+                     sent) after each table; called from worker threads
+                     when tables run in parallel
+    :param cancel: threading.Event, set from another thread to stop the
+                   run: tables stop at their next chunk, roll back to their
+                   last checkpoint and release their sessions, and the
+                   remaining tables are skipped
+    :return: Metrics report of the run, see
+             :meth:`~sync_layer.metrics.SyncMetrics.report`; it is also
+             written to :data:`~sync_layer.metrics.METRICS_DIR`
+    :raises ~sync_layer.pipeline.PipelineCancelled: If cancelled
     """
+    metrics = SyncMetrics()
+
     # Connect to databases
-    oracle_conn = get_oracle_connection()
-    sqlite_conn = get_sqlite_connection()
+    with metrics.phase(RUN, CONNECT):
+        oracle_conn = count_round_trips(
+            get_oracle_connection(), metrics.round_trips(RUN)
+        )
+        sqlite_conn = get_sqlite_connection(db_path)
 
     if not oracle_conn or not sqlite_conn:
         logger.error("Database connections failed. Exiting sync.")
         return
 
-    # Define tables to sync and their columns
-    tables = {
-        "sides": ["id", "side_name"],
-        "questions": ["id", "side_id", "question"],
-        "users": ["id", "username", "password"],
+    modes = modes or {}
+    options = {
+        "use_changelog": changelog_exists(sqlite_conn),
+        "batch_size": batch_size,
+        "chunk_size": chunk_size,
+        "queue_size": queue_size,
+        "initial_load": initial_load,
+        "checkpoint_rows": checkpoint_rows,
+        "metrics": metrics,
+        "cancel": cancel,
     }
+    hashes_recorded = row_hashes_exist(sqlite_conn)
 
-    last_sync_time = get_last_sync_time(oracle_conn)
-    logger.info(f"Last sync time: {last_sync_time}")
+    # One read transaction for the whole run; a serialized SQLite build
+    # lets the parallel workers share it
+    shared = parallelism > 1 and sqlite3.threadsafety == 3
+    snapshot_conn = None
+    status = "failed"
 
-    for table, columns in tables.items():
-        records = fetch_latest_records_sqlite(
-            sqlite_conn, table, last_sync_time
-        )
-        if records:
-            sync_table_to_oracle(oracle_conn, table, columns, records)
-        else:
-            logger.info(f"No new records to sync for table {table}.")
+    try:
+        try:
+            if parallelism <= 1 or shared:
+                with metrics.phase(RUN, CONNECT):
+                    snapshot_conn = get_sqlite_snapshot(db_path, shared=shared)
+                    prepare_sqlite(snapshot_conn)
+
+            device_id = get_device_id(sqlite_conn)
+            logger.info(f"Syncing as device: {device_id}")
+
+            # Tables to sync, their columns and foreign keys
+            catalog = get_catalog(sqlite_conn, oracle_conn)
+            tables = catalog.tables
+            dependencies = catalog.dependencies
 
-    # Update the last sync time to now
-    new_sync_time = datetime.datetime.now()
-    update_last_sync_time(oracle_conn, new_sync_time)
-    logger.info(f"Updated last sync time to: {new_sync_time}")
+            if parallelism <= 1:
+                for table in dependency_order(dependencies):
+                    result = sync_table(
+                        sqlite_conn,
+                        oracle_conn,
+                        table,
+                        tables[table],
+                        device_id,
+                        mode=modes.get(table, MODE_AUTO),
+                        hashed=hashes_recorded and table in catalog.hashed,
+                        snapshot_conn=snapshot_conn,
+                        **options,
+                    )
+                    if progress is not None:
+                        progress(table, result)
+        finally:
+            # Close connections (the Oracle session goes back to the pool)
+            sqlite_conn.close()
+            oracle_conn.close()
+
+        if parallelism > 1:
+
+            def sync_one(table):
+                result = _sync_table_on_own_connections(
+                    db_path,
+                    table,
+                    tables[table],
+                    device_id,
+                    snapshot_conn=snapshot_conn,
+                    mode=modes.get(table, MODE_AUTO),
+                    hashed=hashes_recorded and table in catalog.hashed,
+                    **options,
+                )
+                if progress is not None:
+                    progress(table, result)
+                return result
+
+            _, errors = run_in_dependency_order(
+                dependencies, sync_one, max_workers=parallelism
+            )
+            if errors:
+                check_cancelled(cancel)  # The tables stopped on purpose
+                table, error = next(iter(errors.items()))
+                raise RuntimeError(
+                    f"Sync failed for {len(errors)} table(s), "
+                    f"first: {table}: {error}"
+                ) from error
+        status = "succeeded"
+    finally:
+        if snapshot_conn is not None:
+            snapshot_conn.close()  # Ends the read transaction
+        metrics.finish(status)
+        try:
+            metrics.write()
+        except OSError as e:
+            logger.warning(f"Could not write the sync metrics: {e}")
 
-    # Close connections
-    sqlite_conn.close()
-    oracle_conn.close()
-    logger.info("Synchronization completed and connections closed.")
+    logger.info("Synchronization completed and connections released.")
+    return metrics.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+try:
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection, metrics
+    from sync_layer.setup_oracle import setup_oracle_db
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection, metrics
+    from sync_layer.setup_oracle import setup_oracle_db
+
+
+@pytest.fixture
+def central(tmp_path, monkeypatch):
+    """Empty central schema in a stand-in file, served by the pool."""
+    monkeypatch.setenv(db_connection.LOCAL_DB_VARIABLE, str(tmp_path / "c.db"))
+    monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+    db_connection.close_oracle_pool()
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup_oracle_db(seed_data=False)
+    yield str(tmp_path / "c.db")
+    db_connection.close_oracle_pool()
+
+
+@pytest.fixture
+def local_db(tmp_path):
+    """Local DB with the changelog and no rows."""
+    db_path = str(tmp_path / "local.db")
+    setup_database(db_path, seed_data=False)
+    yield db_path
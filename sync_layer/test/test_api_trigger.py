@@ -0,0 +1,112 @@
+import os
+import sys
+
+import pytest
+
+try:
+    from sync_layer import api_trigger, sync_daemon
+    from sync_layer.sync_daemon import (
+        AUTHKEY_VARIABLE,
+        SUCCEEDED,
+        SyncDaemon,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import api_trigger, sync_daemon
+    from sync_layer.sync_daemon import (
+        AUTHKEY_VARIABLE,
+        SUCCEEDED,
+        SyncDaemon,
+    )
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    """
+    No daemon key file, so the API falls back to in-process workers; the
+    workers it starts run a stand-in sync and are returned in a list.
+    """
+    monkeypatch.delenv(AUTHKEY_VARIABLE, raising=False)
+    monkeypatch.setattr(
+        sync_daemon, "DAEMON_AUTHKEY_FILE", str(tmp_path / "no_key")
+    )
+    workers = []
+
+    def start_worker():
+        worker = SyncDaemon(sync=lambda progress: None)
+        workers.append(worker)
+        return worker
+
+    monkeypatch.setattr(api_trigger, "SyncDaemon", start_worker)
+    api_trigger._reset_daemon()
+    yield workers
+    api_trigger._reset_daemon()
+    for worker in workers:
+        worker.stop()
+
+
+@pytest.fixture
+def client():
+    """Flask test client of the trigger API."""
+    api_trigger.app.config["TESTING"] = True
+    return api_trigger.app.test_client()
+
+
+def test_without_daemon_a_worker_starts_in_process(workers):
+    assert api_trigger.get_daemon() is workers[0]
+    assert api_trigger.get_daemon() is workers[0]  # Started once
+    assert len(workers) == 1
+
+
+def test_short_key_fails_instead_of_falling_back(monkeypatch, workers):
+    monkeypatch.setenv(AUTHKEY_VARIABLE, "sync-daemon")
+
+    with pytest.raises(ValueError):
+        api_trigger.get_daemon()
+    assert workers == []
+
+
+def test_trigger_answers_with_a_job(client, workers):
+    response = client.post("/trigger-sync")
+
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert response.get_json()["status_url"] == f"/sync-status/{job_id}"
+    assert workers[0].wait(job_id, timeout=5)["state"] == SUCCEEDED
+
+
+def test_trigger_only_accepts_post(client, workers):
+    response = client.get("/trigger-sync")
+
+    assert response.status_code == 200
+    assert workers == []  # No job, no worker
+
+
+def test_status_reports_the_job(client, workers):
+    status_url = client.post("/trigger-sync").get_json()["status_url"]
+    job_id = status_url.rsplit("/", 1)[1]
+    workers[0].wait(job_id, timeout=5)
+
+    response = client.get(status_url)
+
+    assert response.status_code == 200
+    assert response.get_json()["id"] == job_id
+    assert response.get_json()["state"] == SUCCEEDED
+
+
+def test_status_of_unknown_job(client, workers):
+    assert client.get("/sync-status/unknown").status_code == 404
+
+
+def test_unavailable_daemon_answers_503(client, monkeypatch, workers):
+    class GoneDaemon:
+        def submit(self):
+            raise EOFError("daemon went away")
+
+    monkeypatch.setattr(api_trigger, "_daemon", GoneDaemon())
+
+    response = client.post("/trigger-sync")
+
+    assert response.status_code == 503
+    assert "daemon went away" in response.get_data(as_text=True)
+    assert api_trigger._daemon is None  # Reconnects on the next request
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import sys
+
+try:
+    from sync_layer import db_connection
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        acknowledge_changes,
+        fetch_changes_sqlite,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import db_connection
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        acknowledge_changes,
+        fetch_changes_sqlite,
+        sync_databases,
+    )
+
+COLUMNS = ["id", "side_name"]
+
+
+def changelog(conn, table="sides"):
+    return conn.execute(
+        f"SELECT row_id, op FROM {CHANGELOG_TABLE} "
+        f"WHERE table_name = ? ORDER BY seq",
+        (table,),
+    ).fetchall()
+
+
+def test_triggers_log_every_change(local_db):
+    conn = sqlite3.connect(local_db)
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (1, 'A')")
+    conn.execute("UPDATE sides SET side_name = 'B' WHERE id = 1")
+    conn.execute("UPDATE sides SET id = 5 WHERE id = 1")
+    conn.execute("DELETE FROM sides WHERE id = 5")
+    conn.commit()
+
+    assert changelog(conn) == [
+        (1, "I"),
+        (1, "U"),
+        (1, "D"),  # A key change deletes the old key
+        (5, "U"),
+        (5, "D"),
+    ]
+    conn.close()
+
+
+def test_repeated_edits_are_coalesced(local_db):
+    conn = sqlite3.connect(local_db)
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (1, 'A')")
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (2, 'B')")
+    for name in ("A1", "A2", "A3"):
+        conn.execute("UPDATE sides SET side_name = ? WHERE id = 1", (name,))
+    conn.execute("DELETE FROM sides WHERE id = 2")
+    conn.commit()
+
+    batches = list(fetch_changes_sqlite(conn, "sides", COLUMNS))
+
+    assert len(batches) == 1
+    assert batches[0].upserts == [(1, "A3")]
+    assert batches[0].deletes == [(2,)]
+    assert batches[0].last_seq == 6
+    assert list(fetch_changes_sqlite(conn, "sides", COLUMNS, 6)) == []
+    conn.close()
+
+
+def test_acknowledge_prunes_and_logs_rejected_rows_again(local_db):
+    conn = sqlite3.connect(local_db)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(1, "A"), (2, "B"), (3, "C")],
+    )
+    conn.commit()
+    conn.execute("UPDATE sides SET side_name = 'D' WHERE id = 3")
+    conn.commit()
+
+    acknowledge_changes(conn, "sides", 3, failed_keys=[2])
+
+    # The update of side 3 came after the acknowledged sequence
+    assert changelog(conn) == [(3, "U"), (2, "U")]
+    batch = next(fetch_changes_sqlite(conn, "sides", COLUMNS, 3))
+    assert batch.upserts == [(3, "D"), (2, "B")]
+    conn.close()
+
+
+def test_second_sync_sends_only_the_changes(local_db, central):
+    conn = sqlite3.connect(local_db)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(1, 101)],
+    )
+    conn.commit()
+    sync_databases(db_path=local_db, parallelism=1)
+    assert changelog(conn) == []
+
+    conn.execute("UPDATE sides SET side_name = 'X' WHERE id = 7")
+    conn.execute("UPDATE sides SET side_name = 'Y' WHERE id = 7")
+    conn.execute("DELETE FROM sides WHERE id = 8")
+    conn.commit()
+    report = sync_databases(db_path=local_db, parallelism=1)
+
+    assert report["tables"]["sides"]["rows"] == 2  # One upsert, one delete
+    assert changelog(conn) == []
+    conn.close()
+
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute("SELECT side_name FROM SYSTEM.sides WHERE id IN (7, 8)")
+    assert cursor.fetchall() == [("Y",)]
+    cursor.close()
+    oracle.close()
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import sys
+import threading
+
+import cx_Oracle
+import pytest
+
+try:
+    from sync_layer import db_connection, sync_db
+    from sync_layer.pipeline import PipelineCancelled
+    from sync_layer.sync_db import (
+        MODE_ROW,
+        get_sync_state,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import db_connection, sync_db
+    from sync_layer.pipeline import PipelineCancelled
+    from sync_layer.sync_db import (
+        MODE_ROW,
+        get_sync_state,
+        sync_databases,
+    )
+
+SIDES = 1000
+
+# Small batches and checkpoints, so a failure leaves some committed
+OPTIONS = {
+    "parallelism": 1,
+    "initial_load": False,
+    "modes": {"sides": MODE_ROW},
+    "batch_size": 100,
+    "chunk_size": 100,
+    "checkpoint_rows": 200,
+}
+
+
+@pytest.fixture
+def central(central, monkeypatch):
+    """Empty central schema, synced to as the device ``device``."""
+    monkeypatch.setenv("SYNC_DEVICE_ID", "device")
+    yield central
+
+
+@pytest.fixture
+def local_db(local_db):
+    """Local DB with pending sides and no questions."""
+    conn = sqlite3.connect(local_db)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(1, SIDES + 1)],
+    )
+    conn.commit()
+    conn.close()
+    yield local_db
+
+
+def central_state():
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute("SELECT COUNT(*) FROM SYSTEM.sides")
+    rows = cursor.fetchone()[0]
+    cursor.close()
+    state = get_sync_state(oracle, "device", "sides")
+    oracle.close()
+    return rows, state
+
+
+def interrupted_sync(local_db, monkeypatch):
+    execute_batch = sync_db.execute_batch
+    calls = []
+
+    def flaky_execute_batch(*args):
+        calls.append(args)
+        if len(calls) == 5:  # The link drops during the fifth batch
+            raise cx_Oracle.DatabaseError("ORA-03113: end-of-file")
+        return execute_batch(*args)
+
+    monkeypatch.setattr(sync_db, "execute_batch", flaky_execute_batch)
+    with pytest.raises(cx_Oracle.DatabaseError):
+        sync_databases(db_path=local_db, **OPTIONS)
+    monkeypatch.setattr(sync_db, "execute_batch", execute_batch)
+
+
+def test_changelog_sync_resumes_from_last_checkpoint(
+    local_db, central, monkeypatch
+):
+    interrupted_sync(local_db, monkeypatch)
+
+    # Two checkpoints of 200 rows were committed with their watermark
+    rows, (watermark, checkpoint) = central_state()
+    assert rows == 400
+    assert watermark == 400
+    assert checkpoint is None
+
+    report = sync_databases(db_path=local_db, **OPTIONS)
+
+    assert report["tables"]["sides"]["rows"] == SIDES - 400
+    assert central_state() == (SIDES, (SIDES, None))
+
+
+def test_full_scan_resumes_after_last_committed_key(
+    local_db, central, monkeypatch
+):
+    conn = sqlite3.connect(local_db)
+    for event in ("insert", "update", "delete"):
+        conn.execute(f"DROP TRIGGER sides_changelog_{event}")
+    conn.execute("DROP TABLE sync_changelog")  # Scanned in key order
+    conn.commit()
+    conn.close()
+
+    interrupted_sync(local_db, monkeypatch)
+
+    rows, (_, checkpoint) = central_state()
+    assert rows == 400
+    assert checkpoint == (MODE_ROW, 400, None)
+
+    report = sync_databases(db_path=local_db, **OPTIONS)
+
+    assert report["tables"]["sides"]["rows"] == SIDES - 400
+    rows, (_, checkpoint) = central_state()
+    assert rows == SIDES
+    assert checkpoint is None  # Cleared once the scan completed
+
+
+@pytest.mark.parametrize("parallelism", [1, 2])
+def test_cancelled_sync_keeps_last_checkpoint_and_sessions(
+    local_db, central, monkeypatch, parallelism
+):
+    cancel = threading.Event()
+    execute_batch = sync_db.execute_batch
+    calls = []
+
+    def cancelling_execute_batch(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            cancel.set()  # e.g. the GUI's sync timed out
+        return execute_batch(*args)
+
+    monkeypatch.setattr(sync_db, "execute_batch", cancelling_execute_batch)
+    options = dict(OPTIONS, parallelism=parallelism)
+    with pytest.raises(PipelineCancelled):
+        sync_databases(db_path=local_db, cancel=cancel, **options)
+    monkeypatch.setattr(sync_db, "execute_batch", execute_batch)
+
+    # The third batch was rolled back, no session is left checked out
+    assert db_connection.get_oracle_pool().busy == 0
+    rows, (watermark, _) = central_state()
+    assert (rows, watermark) == (200, 200)
+
+    report = sync_databases(db_path=local_db, **OPTIONS)
+    assert report["tables"]["sides"]["rows"] == SIDES - 200
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+try:
+    from local_db_layer import repository
+    from local_db_layer.repository import LocalRepository
+    from sync_layer import db_connection
+    from sync_layer.db_connection import (
+        get_sqlite_connection,
+        get_sqlite_snapshot,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer import repository
+    from local_db_layer.repository import LocalRepository
+    from sync_layer import db_connection
+    from sync_layer.db_connection import (
+        get_sqlite_connection,
+        get_sqlite_snapshot,
+    )
+
+
+@pytest.fixture
+def gui(local_db, monkeypatch):
+    """GUI repository that fails at once instead of waiting for a lock."""
+    monkeypatch.setattr(repository, "BUSY_TIMEOUT", 0)
+    monkeypatch.setattr(
+        repository,
+        "PRAGMAS",
+        tuple(
+            (name, 0 if name == "busy_timeout" else value)
+            for name, value in repository.PRAGMAS
+        ),
+    )
+    gui = LocalRepository(local_db)
+    yield gui
+    gui.close()
+
+
+def side_count(conn):
+    return conn.execute("SELECT COUNT(*) FROM sides").fetchone()[0]
+
+
+def test_connection_switches_to_wal(tmp_path):
+    db_path = str(tmp_path / "plain.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+
+    conn = get_sqlite_connection(db_path)
+    conn.close()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_connection_waits_for_locks(local_db):
+    conn = get_sqlite_connection(local_db)
+
+    (timeout,) = conn.execute("PRAGMA busy_timeout").fetchone()
+    conn.close()
+
+    assert timeout == db_connection.SQLITE_BUSY_TIMEOUT * 1000
+
+
+def test_snapshot_does_not_see_later_writes(local_db, gui):
+    gui.add_side("Before")
+    snapshot = get_sqlite_snapshot(local_db)
+
+    gui.add_side("After")
+    gui.rename_side(1, "Renamed")
+
+    assert side_count(snapshot) == 1
+    assert snapshot.execute("SELECT side_name FROM sides").fetchone() == (
+        "Before",
+    )
+    snapshot.close()
+    snapshot = get_sqlite_snapshot(local_db)
+    assert side_count(snapshot) == 2
+    snapshot.close()
+
+
+def test_gui_write_does_not_wait_for_a_snapshot(local_db, gui):
+    snapshot = get_sqlite_snapshot(local_db)
+
+    # With a zero busy timeout, any lock held by the snapshot would raise
+    # "database is locked" here
+    side_id = gui.add_side("Written while syncing")
+    gui.delete_side(side_id)
+    gui.add_side("Second write")
+
+    assert side_count(gui.connection()) == 1
+    snapshot.close()
+
+
+def test_snapshot_shared_across_threads(local_db):
+    snapshot = get_sqlite_snapshot(local_db, shared=True)
+    counts = []
+
+    thread = threading.Thread(
+        target=lambda: counts.append(side_count(snapshot))
+    )
+    thread.start()
+    thread.join()
+    snapshot.close()
+
+    assert counts == [0]
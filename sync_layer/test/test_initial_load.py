@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from sync_layer import db_connection, sync_db
+    from sync_layer.sync_db import (
+        MODE_INITIAL,
+        MODE_ROW,
+        get_sync_state,
+        oracle_table_is_empty,
+        reset_identity,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import db_connection, sync_db
+    from sync_layer.sync_db import (
+        MODE_INITIAL,
+        MODE_ROW,
+        get_sync_state,
+        oracle_table_is_empty,
+        reset_identity,
+        sync_databases,
+    )
+
+
+@pytest.fixture
+def modes(monkeypatch):
+    """Record the modes each table is streamed in, run after run."""
+    modes = {}
+    stream = sync_db.stream_table_to_oracle
+
+    def recording(oracle_conn, table, *args, **kwargs):
+        modes.setdefault(table, []).append(kwargs["mode"])
+        return stream(oracle_conn, table, *args, **kwargs)
+
+    monkeypatch.setattr(sync_db, "stream_table_to_oracle", recording)
+    return modes
+
+
+class RecordingCursor:
+    """Cursor answering the identity column query with ``columns``."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.statements = []
+
+    def execute(self, statement, binds=None):
+        self.statements.append((" ".join(statement.split()), binds))
+
+    def fetchall(self):
+        return [(column,) for column in self.columns]
+
+
+def add_sides(local_db, first_id, count):
+    conn = sqlite3.connect(local_db)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(first_id, first_id + count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def execute_central(statement):
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute(statement)
+    oracle.commit()
+    cursor.close()
+    oracle.close()
+
+
+def central_state(table="sides"):
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM SYSTEM.{table}")
+    rows = cursor.fetchone()[0]
+    cursor.close()
+    state = get_sync_state(oracle, "device", table)
+    oracle.close()
+    return rows, state
+
+
+def test_empty_table_detection(central):
+    oracle = db_connection.get_oracle_connection()
+    assert oracle_table_is_empty(oracle, "SYSTEM.sides")
+
+    execute_central("INSERT INTO SYSTEM.sides (id, side_name) VALUES (1, 'A')")
+
+    assert not oracle_table_is_empty(oracle, "SYSTEM.sides")
+    oracle.close()
+
+
+def test_first_sync_into_empty_table_is_an_initial_load(
+    local_db, central, modes
+):
+    add_sides(local_db, 1, 50)
+    sync_databases(db_path=local_db, parallelism=1)
+    add_sides(local_db, 51, 5)
+    sync_databases(db_path=local_db, parallelism=1)
+
+    assert modes["sides"] == [MODE_INITIAL, MODE_ROW]
+    assert central_state("sides")[0] == 55
+
+
+def test_table_with_rows_of_another_device_is_merged(
+    local_db, central, modes
+):
+    execute_central(
+        "INSERT INTO SYSTEM.sides (id, side_name) VALUES (1000, 'Other')"
+    )
+    add_sides(local_db, 1, 50)
+
+    sync_databases(db_path=local_db, parallelism=1)
+
+    assert modes["sides"] == [MODE_ROW]
+    assert central_state("sides")[0] == 51
+
+
+@pytest.mark.parametrize(
+    "initial_load, mode", [(True, MODE_INITIAL), (False, MODE_ROW)]
+)
+def test_initial_load_can_be_forced_or_disabled(
+    local_db, central, modes, initial_load, mode
+):
+    add_sides(local_db, 1, 5)
+
+    sync_databases(
+        db_path=local_db, parallelism=1, initial_load=initial_load
+    )
+
+    assert modes["sides"] == [mode]
+    assert central_state("sides")[0] == 5
+
+
+def test_identity_reset_moves_past_the_loaded_keys():
+    cursor = RecordingCursor(["ID"])
+
+    reset_identity(cursor, "SYSTEM", "sides")
+
+    query, binds = cursor.statements[0]
+    assert "all_tab_identity_cols" in query
+    assert binds == ("SYSTEM", "SIDES")
+    assert cursor.statements[1] == (
+        "ALTER TABLE SYSTEM.sides MODIFY ID GENERATED BY DEFAULT ON NULL "
+        "AS IDENTITY (START WITH LIMIT VALUE)",
+        None,
+    )
+
+
+def test_table_without_identity_is_left_alone():
+    cursor = RecordingCursor([])
+
+    reset_identity(cursor, "SYSTEM", "sync_watermark")
+
+    assert len(cursor.statements) == 1  # Only the dictionary query
+
+
+def test_identity_reset_runs_after_the_load_is_committed(
+    local_db, central, monkeypatch
+):
+    monkeypatch.setenv("SYNC_DEVICE_ID", "device")
+    add_sides(local_db, 1, 50)
+    seen = []
+
+    def check_committed(cursor, schema, table):
+        # The DDL would commit whatever is still pending
+        seen.append((table, central_state(table)))
+
+    monkeypatch.setattr(sync_db, "reset_identity", check_committed)
+
+    sync_databases(db_path=local_db, parallelism=1)
+
+    sides = dict(seen)["sides"]
+    assert sides[0] == 50
+    assert sides[1][1] is None  # Checkpoint cleared in the same commit
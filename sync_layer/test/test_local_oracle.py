@@ -0,0 +1,151 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pytest
+
+try:
+    from sync_layer import local_oracle
+    from sync_layer.benchmark import create_fixture
+    from sync_layer.round_trips import assert_round_trip_budget
+    from sync_layer.sync_db import (
+        MODE_INITIAL,
+        MODE_ROW,
+        MODE_STAGING,
+        build_staging_queries,
+        execute_batch,
+        merge_staged,
+        sync_databases,
+    )
+    from sync_layer.verify_sync import verify_sync_stream
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import local_oracle
+    from sync_layer.benchmark import create_fixture
+    from sync_layer.round_trips import assert_round_trip_budget
+    from sync_layer.sync_db import (
+        MODE_INITIAL,
+        MODE_ROW,
+        MODE_STAGING,
+        build_staging_queries,
+        execute_batch,
+        merge_staged,
+        sync_databases,
+    )
+    from sync_layer.verify_sync import verify_sync_stream
+
+
+def test_merge_from_dual_becomes_upsert():
+    translation = local_oracle.translate(
+        """
+        MERGE INTO SYSTEM.sides d
+        USING (SELECT :1 AS id, :2 AS side_name FROM dual) s
+        ON (d.id = s.id)
+        WHEN MATCHED THEN
+            UPDATE SET d.side_name = s.side_name
+        WHEN NOT MATCHED THEN
+            INSERT (id, side_name) VALUES (s.id, s.side_name)
+        """
+    )
+
+    assert translation.kind == local_oracle.DML
+    assert "ON CONFLICT (id) DO UPDATE SET side_name = excluded.side_name" in (
+        translation.sql
+    )
+
+
+@pytest.mark.parametrize("mode", [MODE_ROW, MODE_STAGING, MODE_INITIAL])
+def test_sync_into_stand_in(tmp_path, central, mode):
+    """
+    Every sync mode leaves both copies identical, within the round-trip
+    budget of its batching.
+    """
+    local_db = str(tmp_path / "local.db")
+    create_fixture(local_db, 3000)
+    options = {"initial_load": mode == MODE_INITIAL}
+    if mode != MODE_INITIAL:
+        options["modes"] = {"sides": mode, "questions": mode}
+
+    report = sync_databases(db_path=local_db, parallelism=1, **options)
+
+    assert report["rows"] == 3000
+    assert report["tables"]["questions"]["oracle"]["round_trips"] <= 10
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = verify_sync_stream(local_db)
+    assert not any(summary.values())
+
+
+def test_batch_errors_report_rejected_rows(central):
+    conn = local_oracle.connect(central)
+    cursor = conn.cursor()
+    columns = ["id", "side_name"]
+    query = "INSERT INTO SYSTEM.sides (id, side_name) VALUES (:1, :2)"
+
+    failures = execute_batch(
+        cursor, query, columns, [(1, "A"), (2, ""), (3, "C")]
+    )
+
+    assert [key for key, _ in failures] == [2]  # '' is NULL, as in Oracle
+    assert "ORA-01400" in failures[0][1]
+    cursor.execute("SELECT COUNT(*) FROM SYSTEM.sides")
+    assert cursor.fetchone() == (2,)
+    conn.close()
+
+
+def test_staging_merge_logs_errors(central):
+    conn = local_oracle.connect(central)
+    cursor = conn.cursor()
+    columns = ["id", "side_name"]
+    insert_query, merge_query, error_table = build_staging_queries(
+        "SYSTEM.sides", columns, "SYSTEM", "sides"
+    )
+    cursor.executemany(insert_query, [(1, "A"), (2, None), (3, "C")])
+
+    failures = merge_staged(cursor, merge_query, error_table, "id")
+    conn.commit()
+
+    assert [key for key, _ in failures] == ["2"]
+    cursor.execute("SELECT id FROM SYSTEM.sides ORDER BY id")
+    assert cursor.fetchall() == [(1,), (3,)]
+    cursor.execute("SELECT COUNT(*) FROM SYSTEM.sync_stage_sides")
+    assert cursor.fetchone() == (0,)  # ON COMMIT DELETE ROWS
+    conn.close()
+
+
+def test_latency_is_added_per_round_trip(central):
+    conn = local_oracle.connect(central, latency=0.01)
+    cursor = conn.cursor()
+    cursor.arraysize = 10
+    cursor.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (:1, :2)",
+        [(i, f"Side {i}") for i in range(1, 31)],
+    )
+
+    start = time.perf_counter()
+    cursor.execute("SELECT id FROM sides")
+    rows = cursor.fetchall()  # 2 prefetched, then 3 fetch round trips
+    elapsed = time.perf_counter() - start
+
+    assert len(rows) == 30
+    assert elapsed >= 0.04
+    conn.close()
+
+
+def test_round_trip_budget_of_large_sync(tmp_path, central):
+    local_db = str(tmp_path / "local.db")
+    create_fixture(local_db, 20000)
+
+    report = sync_databases(
+        db_path=local_db,
+        parallelism=1,
+        initial_load=False,
+        batch_size=5000,
+        chunk_size=5000,
+        modes={"sides": MODE_ROW, "questions": MODE_ROW},
+    )
+
+    questions = report["tables"]["questions"]
+    assert questions["rows"] == 18000
+    assert_round_trip_budget(questions["oracle"], 18000, per_block=5)
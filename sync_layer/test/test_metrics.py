@@ -0,0 +1,186 @@
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from local_db_layer.setup_db import setup_database
+    from sync_layer.metrics import (
+        COMMIT,
+        JSON_REPORT,
+        LATENCY_BUCKETS,
+        PROMETHEUS_REPORT,
+        READ,
+        RUN,
+        WRITE,
+        SyncMetrics,
+        payload_size,
+    )
+    from sync_layer.sync_db import sync_databases
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.setup_db import setup_database
+    from sync_layer.metrics import (
+        COMMIT,
+        JSON_REPORT,
+        LATENCY_BUCKETS,
+        PROMETHEUS_REPORT,
+        READ,
+        RUN,
+        WRITE,
+        SyncMetrics,
+        payload_size,
+    )
+    from sync_layer.sync_db import sync_databases
+
+
+@pytest.fixture
+def run():
+    """Finished run: two sides batches, one questions batch, a commit."""
+    run = SyncMetrics()
+    run.add_time(RUN, READ, 0.5)
+    run.round_trips(RUN).add(round_trips=2, executes=2)
+    run.observe_batch("sides", 0.004, [(1, "ab"), (2, None)])
+    run.observe_batch("sides", 0.3, [(3, "é")])
+    run.observe_batch("questions", 60, [(1, "Q", 1)])
+    run.add_time("sides", COMMIT, 0.1)
+    run.round_trips("sides").add(round_trips=3, executes=2, commits=1)
+    run.table_finished("sides", 2.0)
+    run.finish("succeeded")
+    return run
+
+
+def samples(text):
+    """Sample lines of a Prometheus exposition, as a dict."""
+    return dict(
+        line.rsplit(" ", 1)
+        for line in text.splitlines()
+        if not line.startswith("#")
+    )
+
+
+def test_payload_size_counts_text_bytes_and_numbers():
+    assert payload_size([(1, "ab", None), (2.5, "é", b"xyz")]) == 23
+
+
+def test_batches_fill_the_latency_histogram(run):
+    sides = run.report()["tables"]["sides"]
+
+    assert sides["rows"] == 3
+    assert sides["bytes"] == (8 + 2) + 8 + (8 + 2)
+    assert sides["batches"] == 2
+    assert sides["rows_per_sec"] == 1.5
+    assert sides["phases"][WRITE] == pytest.approx(0.304)
+    assert sides["phases"][COMMIT] == pytest.approx(0.1)
+    latency = sides["batch_latency"]
+    assert latency["count"] == 2
+    assert latency["sum"] == pytest.approx(0.304)
+    buckets = list(latency["buckets"].values())
+    assert list(latency["buckets"]) == [
+        str(bound) for bound in LATENCY_BUCKETS + ("+Inf",)
+    ]
+    assert buckets == sorted(buckets)  # Cumulative
+    assert latency["buckets"]["0.005"] == 1
+    assert latency["buckets"]["0.25"] == 1
+    assert latency["buckets"]["0.5"] == 2
+    questions = run.report()["tables"]["questions"]["batch_latency"]
+    assert questions["buckets"]["10"] == 0
+    assert questions["buckets"]["+Inf"] == 1
+
+
+def test_report_totals_tables_and_run(run):
+    report = run.report()
+
+    assert report["status"] == "succeeded"
+    assert set(report["tables"]) == {"sides", "questions"}
+    assert report["phases"][READ] == 0.5
+    assert report["rows"] == 4
+    assert report["oracle"] == {
+        "round_trips": 5,
+        "executes": 4,
+        "fetches": 0,
+        "commits": 1,
+    }
+
+
+def test_timed_adds_the_time_of_each_item():
+    run = SyncMetrics()
+
+    assert list(run.timed("sides", READ, iter([1, 2]))) == [1, 2]
+    with run.phase("sides", COMMIT):
+        pass
+
+    phases = run.report()["tables"]["sides"]["phases"]
+    assert phases[READ] > 0
+    assert phases[COMMIT] > 0
+
+
+def test_prometheus_exposition(run):
+    text = run.prometheus()
+    values = samples(text)
+
+    assert values["sync_run_success"] == "1"
+    assert values['sync_table_rows{table="sides"}'] == "3"
+    assert values['sync_phase_seconds{table="_run",phase="read"}'] == "0.5"
+    assert values['sync_oracle_calls{table="sides",kind="commits"}'] == "1"
+    name = "sync_batch_latency_seconds"
+    assert values[f'{name}_bucket{{table="sides",le="0.5"}}'] == "2"
+    assert values[f'{name}_bucket{{table="questions",le="+Inf"}}'] == "1"
+    assert values[f'{name}_count{{table="sides"}}'] == "2"
+    # Every sample belongs to a declared family
+    families = {
+        line.split()[2]
+        for line in text.splitlines()
+        if line.startswith("# TYPE")
+    }
+    for sample in values:
+        family = sample.split("{")[0]
+        for suffix in ("_bucket", "_sum", "_count"):
+            if family.endswith(suffix) and family not in families:
+                family = family[: -len(suffix)]
+        assert family in families
+
+
+def test_failed_run_reports_no_success():
+    run = SyncMetrics()
+    run.finish("failed")
+
+    assert samples(run.prometheus())["sync_run_success"] == "0"
+
+
+def test_write_replaces_both_reports(tmp_path, run):
+    json_path, prom_path = run.write(str(tmp_path))
+
+    assert json_path == str(tmp_path / JSON_REPORT)
+    assert prom_path == str(tmp_path / PROMETHEUS_REPORT)
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f) == run.report()
+    with open(prom_path, encoding="utf-8") as f:
+        assert f.read() == run.prometheus()
+    assert sorted(os.listdir(tmp_path)) == [JSON_REPORT, PROMETHEUS_REPORT]
+
+
+def test_sync_writes_its_metrics(tmp_path, central):
+    db_path = str(tmp_path / "local.db")
+    setup_database(db_path, seed_data=False)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(1, 51)],
+    )
+    conn.commit()
+    conn.close()
+
+    sync_databases(db_path=db_path, parallelism=1)
+
+    with open(tmp_path / JSON_REPORT, encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["status"] == "succeeded"
+    assert report["tables"]["sides"]["rows"] == 50
+    assert report["tables"]["sides"]["batch_latency"]["count"] >= 1
+    assert report["oracle"]["commits"] >= 1
+    with open(tmp_path / PROMETHEUS_REPORT, encoding="utf-8") as f:
+        values = samples(f.read())
+    assert values['sync_table_rows{table="sides"}'] == "50"
@@ -0,0 +1,116 @@
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+try:
+    from local_db_layer.setup_db import setup_database
+    from sync_layer.benchmark import create_fixture
+    from sync_layer.parallel_sync import (
+        DependencyFailed,
+        dependency_order,
+        get_table_dependencies,
+        run_in_dependency_order,
+    )
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_sync import verify_sync_stream
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.setup_db import setup_database
+    from sync_layer.benchmark import create_fixture
+    from sync_layer.parallel_sync import (
+        DependencyFailed,
+        dependency_order,
+        get_table_dependencies,
+        run_in_dependency_order,
+    )
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_sync import verify_sync_stream
+
+# answers -> questions -> sides, users independent
+DEPENDENCIES = {
+    "answers": {"questions"},
+    "questions": {"sides"},
+    "sides": set(),
+    "users": set(),
+}
+
+
+def test_dependencies_of_the_local_schema(tmp_path):
+    db_path = str(tmp_path / "local.db")
+    setup_database(db_path, seed_data=False)
+    conn = sqlite3.connect(db_path)
+
+    dependencies = get_table_dependencies(conn, ["questions", "sides"])
+    conn.close()
+
+    assert dependencies == {"questions": {"sides"}, "sides": set()}
+
+
+def test_dependency_order():
+    order = dependency_order(DEPENDENCIES)
+
+    assert order.index("sides") < order.index("questions")
+    assert order.index("questions") < order.index("answers")
+    with pytest.raises(ValueError):
+        dependency_order({"a": {"b"}, "b": {"a"}})
+
+
+def test_independent_tables_run_concurrently():
+    # Both roots wait for each other, which only works in parallel
+    both_started = threading.Barrier(2, timeout=5)
+    finished = []
+
+    def work(table):
+        if table in ("sides", "users"):
+            both_started.wait()
+        finished.append(table)
+        return table.upper()
+
+    results, errors = run_in_dependency_order(
+        DEPENDENCIES, work, max_workers=4
+    )
+
+    assert errors == {}
+    assert results["answers"] == "ANSWERS"
+    assert finished.index("sides") < finished.index("questions")
+    assert finished.index("questions") < finished.index("answers")
+
+
+def test_failed_table_skips_its_descendants():
+    def work(table):
+        if table == "sides":
+            raise RuntimeError("ORA-12541")
+        return table
+
+    results, errors = run_in_dependency_order(
+        DEPENDENCIES, work, max_workers=2
+    )
+
+    assert results == {"users": "users"}
+    assert isinstance(errors["sides"], RuntimeError)
+    assert isinstance(errors["questions"], DependencyFailed)
+    assert isinstance(errors["answers"], DependencyFailed)
+
+
+def test_parallel_sync_into_stand_in(tmp_path, central):
+    local_db = str(tmp_path / "local.db")
+    create_fixture(local_db, 2000)
+    synced = []
+
+    report = sync_databases(
+        db_path=local_db,
+        parallelism=4,
+        progress=lambda table, result: synced.append(table),
+    )
+
+    assert report["status"] == "succeeded"
+    assert report["rows"] == 2000
+    assert synced.index("sides") < synced.index("questions")
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = verify_sync_stream(local_db)
+    assert not any(summary.values())
@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+
+import pytest
+
+try:
+    from sync_layer.pipeline import (
+        PipelineAborted,
+        PipelineCancelled,
+        run_pipeline,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer.pipeline import (
+        PipelineAborted,
+        PipelineCancelled,
+        run_pipeline,
+    )
+
+
+def reader(closed_in, chunks=100):
+    """Chunks of one number, recording the thread that closed it."""
+    try:
+        for i in range(chunks):
+            yield [i]
+    finally:
+        closed_in.append(threading.current_thread())
+
+
+def test_writer_receives_every_chunk():
+    closed_in = []
+
+    total = run_pipeline(
+        reader(closed_in), lambda batches: sum(sum(b) for b in batches)
+    )
+
+    assert total == sum(range(100))
+    assert closed_in == [threading.current_thread()]
+
+
+def test_writer_failure_closes_reader_in_its_thread():
+    closed_in = []
+
+    def consume(batches):
+        next(batches)
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        run_pipeline(reader(closed_in), consume, queue_size=1)
+
+    assert closed_in == [threading.current_thread()]
+
+
+def test_reader_failure_aborts_writer():
+    def failing_reader():
+        yield [1]
+        raise OSError("disk")
+
+    seen = []
+
+    def consume(batches):
+        try:
+            for _ in batches:
+                pass
+        except PipelineAborted as e:
+            seen.append(e)
+            raise
+
+    with pytest.raises(OSError):
+        run_pipeline(failing_reader(), consume)
+
+    assert len(seen) == 1
+
+
+def test_cancel_stops_reader_and_writer():
+    cancel = threading.Event()
+    closed_in = []
+    consumed = []
+
+    def consume(batches):
+        for batch in batches:
+            consumed.append(batch)
+            cancel.set()  # e.g. the GUI's sync timed out
+
+    with pytest.raises(PipelineCancelled):
+        run_pipeline(reader(closed_in), consume, queue_size=1, cancel=cancel)
+
+    assert len(consumed) == 1
+    assert closed_in == [threading.current_thread()]
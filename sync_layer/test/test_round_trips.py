@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from sync_layer.metrics import SyncMetrics
+    from sync_layer.round_trips import (
+        RoundTripCounter,
+        assert_round_trip_budget,
+        count_round_trips,
+    )
+    from sync_layer.sync_db import MODE_ROW, sync_table
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer.metrics import SyncMetrics
+    from sync_layer.round_trips import (
+        RoundTripCounter,
+        assert_round_trip_budget,
+        count_round_trips,
+    )
+    from sync_layer.sync_db import MODE_ROW, sync_table
+
+
+class FakeOracleCursor:
+    """Cursor accepting any statement; queries return ``rows``."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.description = None
+        self.arraysize = 100
+        self.prefetchrows = 2
+
+    def execute(self, statement, *args, **kwargs):
+        is_query = statement.lstrip().upper().startswith("SELECT")
+        self.description = [("COLUMN",)] if is_query else None
+        self._result = list(self.rows) if is_query else []
+        return self if is_query else None
+
+    def executemany(self, statement, parameters, **kwargs):
+        self.description = None
+
+    def getbatcherrors(self):
+        return []
+
+    def fetchone(self):
+        return self._result.pop(0) if self._result else None
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows, self._result = self._result[:size], self._result[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._result = self._result, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeOracleConnection:
+    def cursor(self):
+        return FakeOracleCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def sqlite_conn(tmp_path):
+    """Local DB with a SIDES table and an empty changelog."""
+    conn = sqlite3.connect(tmp_path / "inspection_data.db")
+    conn.execute("CREATE TABLE SIDES (side_id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute(
+        """CREATE TABLE sync_changelog (
+             seq INTEGER PRIMARY KEY AUTOINCREMENT,
+             table_name TEXT NOT NULL,
+             row_id INTEGER NOT NULL,
+             op TEXT NOT NULL,
+             changed_at TEXT DEFAULT CURRENT_TIMESTAMP)"""
+    )
+    yield conn
+    conn.close()
+
+
+def insert_sides(conn, rows):
+    conn.executemany(
+        "INSERT INTO SIDES VALUES (?, ?)",
+        ((i, f"Side {i}") for i in range(1, rows + 1)),
+    )
+    conn.execute(
+        """INSERT INTO sync_changelog (table_name, row_id, op)
+           SELECT 'SIDES', side_id, 'I' FROM SIDES"""
+    )
+    conn.commit()
+
+
+def test_fetch_round_trips_follow_array_size():
+    """
+    Rows beyond the prefetched ones cost a round trip per ``arraysize``.
+    """
+    counter = RoundTripCounter()
+    cursor = count_round_trips(FakeOracleConnection(), counter).cursor()
+    cursor._cursor.rows = [(i,) for i in range(250)]
+
+    cursor.execute("SELECT id FROM t")
+    assert cursor.fetchone() == (0,)  # Prefetched with the execute
+    assert counter.round_trips == 1
+    assert len(cursor.fetchall()) == 249  # 1 prefetched + 248 in 3 trips
+    assert counter.as_dict() == {
+        "round_trips": 4,
+        "executes": 1,
+        "fetches": 2,
+        "commits": 0,
+    }
+
+
+def test_rewrapped_connection_counts_once():
+    outer, inner = RoundTripCounter(), RoundTripCounter()
+    connection = count_round_trips(FakeOracleConnection(), outer)
+    count_round_trips(connection, inner).commit()
+
+    assert outer.round_trips == 0
+    assert inner.commits == 1
+
+
+@pytest.mark.parametrize("rows", [10000, 100000])
+def test_sync_table_round_trip_budget(sqlite_conn, rows):
+    """
+    A changelog sync binds whole batches: at most 5 round trips per table
+    per 10k rows with 5000-row batches.
+    """
+    insert_sides(sqlite_conn, rows)
+    metrics = SyncMetrics()
+
+    result = sync_table(
+        sqlite_conn,
+        FakeOracleConnection(),
+        "SIDES",
+        ["side_id", "name"],
+        "device",
+        batch_size=5000,
+        chunk_size=5000,
+        mode=MODE_ROW,
+        initial_load=False,
+        metrics=metrics,
+    )
+
+    assert result.upserted == rows
+    assert_round_trip_budget(metrics.round_trips("SIDES"), rows, per_block=5)
+    report = metrics.report()
+    assert report["tables"]["SIDES"]["oracle"]["executes"] > 0
+    assert report["oracle"]["commits"] == rows // 10000
+
+
+def test_budget_assertion_reports_overrun():
+    counter = RoundTripCounter()
+    counter.add(round_trips=6)
+
+    with pytest.raises(AssertionError, match="budget 5"):
+        assert_round_trip_budget(counter, 10000, per_block=5)
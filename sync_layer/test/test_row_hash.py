@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection, local_oracle
+    from sync_layer.row_hash import (
+        ROW_HASH_TABLE,
+        content_hash,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        build_merge_query,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection, local_oracle
+    from sync_layer.row_hash import (
+        ROW_HASH_TABLE,
+        content_hash,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        build_merge_query,
+        sync_databases,
+    )
+
+COLUMNS = ["id", "side_name"]
+
+
+@pytest.fixture
+def synced(tmp_path, central):
+    """Local DB of 100 sides, synced to the stand-in."""
+    db_path = str(tmp_path / "local.db")
+    setup_database(db_path, seed_data=False)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(1, 101)],
+    )
+    conn.commit()
+    conn.close()
+    sync_databases(db_path=db_path, parallelism=1)
+    yield db_path
+
+
+def test_sqlite_and_python_hash_agree():
+    conn = sqlite3.connect(":memory:")
+    prepare_sqlite(conn)
+
+    text = sqlite_row_text(["1", "NULL", "'x'"])
+    (digest,) = conn.execute(f"SELECT sync_content_hash({text})").fetchone()
+
+    assert digest == content_hash("#1\x1f\x1fx")
+    conn.close()
+
+
+def test_synced_rows_record_their_hash(synced):
+    conn = sqlite3.connect(synced)
+    prepare_sqlite(conn)
+    recorded = dict(
+        conn.execute(
+            f"SELECT row_id, row_hash FROM {ROW_HASH_TABLE} "
+            f"WHERE table_name = 'sides'"
+        )
+    )
+    expected = dict(
+        conn.execute(
+            f"SELECT id, sync_content_hash({sqlite_row_text(COLUMNS)}) "
+            f"FROM sides"
+        )
+    )
+    conn.close()
+
+    assert len(recorded) == 100
+    assert recorded == expected
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute("SELECT id, row_hash FROM SYSTEM.sides")
+    assert dict(cursor.fetchall()) == expected
+    cursor.close()
+    oracle.close()
+
+
+def test_rows_touched_without_changes_are_not_sent(synced):
+    conn = sqlite3.connect(synced)
+    conn.execute("UPDATE sides SET side_name = side_name WHERE id <= 10")
+    conn.execute("UPDATE sides SET side_name = 'Edited' WHERE id = 20")
+    conn.execute("UPDATE sides SET side_name = 'Side 20' WHERE id = 20")
+    conn.execute("UPDATE sides SET side_name = 'Renamed' WHERE id = 30")
+    conn.commit()
+
+    report = sync_databases(db_path=synced, parallelism=1)
+
+    assert report["tables"]["sides"]["rows"] == 1  # Only side 30
+    pending = conn.execute(
+        f"SELECT COUNT(*) FROM {CHANGELOG_TABLE}"
+    ).fetchone()[0]
+    assert pending == 0  # The skipped rows are acknowledged too
+    conn.close()
+
+
+def test_merge_leaves_rows_with_the_same_hash(central):
+    conn = local_oracle.connect(central)
+    cursor = conn.cursor()
+    columns = COLUMNS + ["row_hash"]
+    cursor.execute(
+        "INSERT INTO SYSTEM.sides (id, side_name, row_hash) "
+        "VALUES (1, 'Oracle', 'h1')"
+    )
+
+    merge = build_merge_query("SYSTEM.sides", columns)
+    cursor.executemany(merge, [(1, "Same hash", "h1")])
+    cursor.execute("SELECT side_name FROM SYSTEM.sides WHERE id = 1")
+    assert cursor.fetchone() == ("Oracle",)
+
+    cursor.executemany(merge, [(1, "New hash", "h2")])
+    cursor.execute("SELECT side_name FROM SYSTEM.sides WHERE id = 1")
+    assert cursor.fetchone() == ("New hash",)
+    conn.close()
@@ -0,0 +1,147 @@
+import os
+import sqlite3
+import sys
+import threading
+
+try:
+    from sync_layer.scheduler import SyncScheduler, get_pending_changes
+    from sync_layer.sync_db import CHANGELOG_TABLE
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer.scheduler import SyncScheduler, get_pending_changes
+    from sync_layer.sync_db import CHANGELOG_TABLE
+
+POLL = 5.0
+
+
+def add_sides(db_path, count, start=1):
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(start, start + count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def age_changes(db_path, seconds):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        f"UPDATE {CHANGELOG_TABLE} "
+        f"SET changed_at = datetime('now', '-{seconds} seconds')"
+    )
+    conn.commit()
+    conn.close()
+
+
+class Sync:
+    """Stand-in for the sync, counting runs and failing on demand."""
+
+    def __init__(self, failures=0):
+        self.runs = 0
+        self.failures = failures
+
+    def __call__(self):
+        self.runs += 1
+        if self.runs <= self.failures:
+            raise RuntimeError("ORA-12170: TNS:Connect timeout occurred")
+
+
+def scheduler(db_path, sync, **options):
+    options = {
+        "poll_interval": POLL,
+        "volume_threshold": 10,
+        "max_age": 60,
+        "backoff_base": 10,
+        "backoff_max": 50,
+        **options,
+    }
+    return SyncScheduler(run_sync=sync, db_path=db_path, **options)
+
+
+def test_pending_changes_count_and_age(local_db):
+    conn = sqlite3.connect(local_db)
+    assert get_pending_changes(conn) == (0, 0)
+
+    add_sides(local_db, 3)
+    age_changes(local_db, 120)
+    count, age = get_pending_changes(conn)
+    conn.close()
+
+    assert count == 3
+    assert 119 <= age <= 125
+
+
+def test_nothing_pending_skips_the_cycle(local_db):
+    sync = Sync()
+
+    assert scheduler(local_db, sync).run_once() == POLL
+    assert sync.runs == 0
+
+
+def test_few_recent_changes_wait(local_db):
+    sync = Sync()
+    add_sides(local_db, 9)
+
+    assert scheduler(local_db, sync).run_once() == POLL
+    assert sync.runs == 0
+
+
+def test_volume_threshold_triggers_a_sync(local_db):
+    sync = Sync()
+    add_sides(local_db, 10)
+
+    assert scheduler(local_db, sync).run_once() == POLL
+    assert sync.runs == 1
+
+
+def test_old_change_triggers_a_sync(local_db):
+    sync = Sync()
+    add_sides(local_db, 1)
+    age_changes(local_db, 61)
+
+    scheduler(local_db, sync).run_once()
+
+    assert sync.runs == 1
+
+
+def test_failures_back_off_exponentially_up_to_the_cap(local_db):
+    sync = Sync(failures=4)
+    schedule = scheduler(local_db, sync)
+    add_sides(local_db, 10)
+
+    delays = [schedule.run_once() for _ in range(5)]
+
+    assert delays == [10, 20, 40, 50, POLL]  # The last run succeeds
+    assert sync.runs == 5
+    assert schedule.failures == 0
+
+
+def test_without_changelog_syncs_every_max_age(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "plain.db")
+    sqlite3.connect(db_path).close()
+    sync = Sync()
+    schedule = scheduler(db_path, sync)
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+
+    schedule.run_once()  # First cycle: never synced yet
+    now[0] += 59
+    schedule.run_once()
+    assert sync.runs == 1
+
+    now[0] += 1
+    schedule.run_once()
+    assert sync.runs == 2
+
+
+def test_run_forever_stops_on_the_event(local_db):
+    stop = threading.Event()
+    add_sides(local_db, 10)
+
+    def sync():
+        stop.set()
+
+    scheduler(local_db, sync).run_forever(stop)
+
+    assert stop.is_set()
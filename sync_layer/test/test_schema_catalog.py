@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from sync_layer import db_connection, schema_catalog
+    from sync_layer.schema_catalog import cached_statement, get_catalog
+    from sync_layer.sync_db import sync_databases
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import db_connection, schema_catalog
+    from sync_layer.schema_catalog import cached_statement, get_catalog
+    from sync_layer.sync_db import sync_databases
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Count the introspection queries run on each database."""
+    loads = {"sqlite": 0, "oracle": 0}
+
+    def counted(name, load):
+        def wrapper(*args):
+            loads[name] += 1
+            return load(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(
+        schema_catalog,
+        "load_sqlite_tables",
+        counted("sqlite", schema_catalog.load_sqlite_tables),
+    )
+    monkeypatch.setattr(
+        schema_catalog,
+        "load_oracle_columns",
+        counted("oracle", schema_catalog.load_oracle_columns),
+    )
+    return loads
+
+
+def catalog_of(local_db):
+    sqlite_conn = sqlite3.connect(local_db)
+    oracle_conn = db_connection.get_oracle_connection()
+    try:
+        return get_catalog(sqlite_conn, oracle_conn)
+    finally:
+        oracle_conn.close()
+        sqlite_conn.close()
+
+
+def execute_central(statement):
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute(statement)
+    cursor.close()
+    oracle.close()
+
+
+def test_catalog_describes_the_shared_tables(local_db, central):
+    catalog = catalog_of(local_db)
+
+    assert catalog.columns("sides") == ["id", "side_name"]
+    assert catalog.primary_key("questions") == "id"
+    assert catalog.dependencies["questions"] == {"sides"}
+    assert "sides" in catalog.hashed
+    assert not any(table.startswith("sync_") for table in catalog.tables)
+
+
+def test_catalog_is_loaded_once(local_db, central, loads):
+    first = catalog_of(local_db)
+    second = catalog_of(local_db)
+
+    assert second is first
+    assert loads == {"sqlite": 1, "oracle": 1}
+
+
+def test_schema_change_reloads_the_catalog(local_db, central, loads):
+    catalog_of(local_db)
+    conn = sqlite3.connect(local_db)
+    conn.execute("ALTER TABLE sides ADD COLUMN notes TEXT")
+    conn.close()
+
+    catalog = catalog_of(local_db)
+
+    assert loads == {"sqlite": 2, "oracle": 2}
+    assert "notes" not in catalog.columns("sides")  # Not in Oracle yet
+
+    execute_central("ALTER TABLE SYSTEM.sides ADD notes VARCHAR2(4000)")
+    catalog = catalog_of(local_db)
+
+    assert loads == {"sqlite": 3, "oracle": 3}
+    assert catalog.columns("sides") == ["id", "side_name", "notes"]
+    assert catalog_of(local_db) is catalog
+
+
+def test_statement_is_built_once_per_columns():
+    built = []
+
+    def build():
+        built.append(len(built))
+        return f"statement {len(built)}"
+
+    first = cached_statement("test", "sides", ["id", "side_name"], build)
+    again = cached_statement("test", "sides", ("id", "side_name"), build)
+    other = cached_statement("test", "sides", ["id", "notes"], build)
+
+    assert first == again == "statement 1"
+    assert other == "statement 2"
+    assert len(built) == 2
+
+
+def test_sync_reuses_its_statements(local_db, central):
+    conn = sqlite3.connect(local_db)
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (1, 'Side 1')")
+    conn.commit()
+    sync_databases(db_path=local_db, parallelism=1, initial_load=False)
+    statements = dict(schema_catalog._statements)
+    assert any(kind == "merge" for kind, _, _ in statements)
+
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (2, 'Side 2')")
+    conn.commit()
+    conn.close()
+    sync_databases(db_path=local_db, parallelism=1, initial_load=False)
+
+    assert schema_catalog._statements.keys() == statements.keys()
+    for key, statement in statements.items():
+        assert schema_catalog._statements[key] is statement
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from sync_layer import db_connection, sync_db
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        MODE_ROW,
+        MODE_STAGING,
+        ChangeBatch,
+        apply_changes_to_oracle,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import db_connection, sync_db
+    from sync_layer.sync_db import (
+        CHANGELOG_TABLE,
+        MODE_ROW,
+        MODE_STAGING,
+        ChangeBatch,
+        apply_changes_to_oracle,
+        sync_databases,
+    )
+
+COLUMNS = ["id", "side_name"]
+
+
+@pytest.fixture
+def modes(monkeypatch):
+    """Record the mode each table is streamed in."""
+    modes = {}
+    stream = sync_db.stream_table_to_oracle
+
+    def recording(oracle_conn, table, *args, **kwargs):
+        modes[table] = kwargs["mode"]
+        return stream(oracle_conn, table, *args, **kwargs)
+
+    monkeypatch.setattr(sync_db, "stream_table_to_oracle", recording)
+    return modes
+
+
+def add_sides(local_db, names):
+    conn = sqlite3.connect(local_db)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        list(enumerate(names, start=1)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def central_sides():
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute("SELECT id, side_name FROM SYSTEM.sides ORDER BY id")
+    rows = cursor.fetchall()
+    cursor.execute("SELECT COUNT(*) FROM SYSTEM.sync_err_sides")
+    errors = cursor.fetchone()[0]
+    cursor.close()
+    oracle.close()
+    return rows, errors
+
+
+def test_staged_rows_are_merged_and_rejects_reported(central):
+    oracle = db_connection.get_oracle_connection()
+    batches = [
+        ChangeBatch([(1, "A"), (2, None), (3, "C")], [], 1),
+        ChangeBatch([(4, "D"), (5, None)], [], 2),
+    ]
+
+    result = apply_changes_to_oracle(
+        oracle, "sides", COLUMNS, batches, batch_size=2, mode=MODE_STAGING
+    )
+    oracle.close()
+
+    assert result.upserted == 5
+    assert sorted(int(key) for key, _ in result.failures) == [2, 5]
+    assert all("ORA-01400" in message for _, message in result.failures)
+    # The error log is cleared once read back
+    assert central_sides() == ([(1, "A"), (3, "C"), (4, "D")], 0)
+
+
+def test_staging_updates_and_deletes(central):
+    oracle = db_connection.get_oracle_connection()
+    apply_changes_to_oracle(
+        oracle,
+        "sides",
+        COLUMNS,
+        [ChangeBatch([(1, "A"), (2, "B"), (3, "C")], [], None)],
+        mode=MODE_STAGING,
+    )
+
+    result = apply_changes_to_oracle(
+        oracle,
+        "sides",
+        COLUMNS,
+        [ChangeBatch([(1, "A2"), (4, "D")], [(2,)], None)],
+        mode=MODE_STAGING,
+    )
+    oracle.close()
+
+    assert (result.upserted, result.deleted, result.failures) == (2, 1, [])
+    assert central_sides() == ([(1, "A2"), (3, "C"), (4, "D")], 0)
+
+
+def test_rejected_rows_stay_pending(local_db, central):
+    add_sides(local_db, ["A", None, "C"])
+
+    sync_databases(
+        db_path=local_db,
+        parallelism=1,
+        initial_load=False,
+        modes={"sides": MODE_STAGING},
+    )
+
+    assert central_sides() == ([(1, "A"), (3, "C")], 0)
+    conn = sqlite3.connect(local_db)
+    pending = conn.execute(
+        f"SELECT row_id FROM {CHANGELOG_TABLE} WHERE table_name = 'sides'"
+    ).fetchall()
+    conn.close()
+    assert pending == [(2,)]  # Retried by the next sync
+
+
+@pytest.mark.parametrize("threshold, mode", [(3, MODE_STAGING), (4, MODE_ROW)])
+def test_auto_mode_stages_large_change_sets(
+    local_db, central, modes, monkeypatch, threshold, mode
+):
+    monkeypatch.setattr(sync_db, "STAGING_THRESHOLD", threshold)
+    add_sides(local_db, ["A", "B", "C"])
+
+    sync_databases(db_path=local_db, parallelism=1, initial_load=False)
+
+    assert modes["sides"] == mode
+    assert central_sides() == ([(1, "A"), (2, "B"), (3, "C")], 0)
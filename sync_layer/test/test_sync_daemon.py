@@ -0,0 +1,214 @@
+import os
+import stat
+import sys
+import threading
+from multiprocessing import AuthenticationError
+
+import pytest
+
+try:
+    from sync_layer import sync_daemon
+    from sync_layer.sync_daemon import (
+        AUTHKEY_VARIABLE,
+        FAILED,
+        MIN_AUTHKEY_LENGTH,
+        QUEUED,
+        RUNNING,
+        SUCCEEDED,
+        SyncDaemon,
+        connect,
+        load_authkey,
+    )
+    from sync_layer.sync_db import TableSyncResult
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import sync_daemon
+    from sync_layer.sync_daemon import (
+        AUTHKEY_VARIABLE,
+        FAILED,
+        MIN_AUTHKEY_LENGTH,
+        QUEUED,
+        RUNNING,
+        SUCCEEDED,
+        SyncDaemon,
+        connect,
+        load_authkey,
+    )
+    from sync_layer.sync_db import TableSyncResult
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX modes")
+
+
+class GatedSync:
+    """Stand-in for the sync, running until released."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.runs = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, progress):
+        self.runs += 1
+        self.started.set()
+        assert self.release.wait(5)
+        progress("sides", TableSyncResult(10, 2, [(7, "ORA-01400")], 12))
+        if self.error:
+            raise RuntimeError(self.error)
+
+
+@pytest.fixture
+def gated():
+    """Worker running a :class:`GatedSync`."""
+    sync = GatedSync()
+    daemon = SyncDaemon(sync=sync)
+    daemon.start()
+    yield daemon, sync
+    sync.release.set()
+    daemon.stop()
+
+
+@pytest.fixture
+def key_file(tmp_path, monkeypatch):
+    """Key file path in a temporary directory, no key in the environment."""
+    monkeypatch.delenv(AUTHKEY_VARIABLE, raising=False)
+    path = str(tmp_path / "sync_daemon_key")
+    monkeypatch.setattr(sync_daemon, "DAEMON_AUTHKEY_FILE", path)
+    return path
+
+
+@pytest.fixture
+def served(key_file):
+    """Worker served on a free local port with the generated key."""
+    key = load_authkey(create=True)
+    daemon = SyncDaemon(sync=lambda progress: None)
+    daemon.start()
+    sync_daemon._DaemonServer.register("daemon", callable=lambda: daemon)
+    server = sync_daemon._DaemonServer(
+        address=("127.0.0.1", 0), authkey=key
+    ).get_server()
+
+    def serve():
+        try:
+            server.serve_forever()
+        except SystemExit:  # How serve_forever returns once stopped
+            pass
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield server.address[1]
+    server.stop_event.set()
+    daemon.stop()
+
+
+@posix_only
+def test_worker_generates_a_private_key(key_file):
+    key = load_authkey(create=True)
+
+    assert len(key) >= MIN_AUTHKEY_LENGTH
+    assert stat.S_IMODE(os.stat(key_file).st_mode) == 0o600
+    assert load_authkey() == key  # Clients read the same key
+    assert load_authkey(create=True) == key  # Restarts keep it
+
+
+def test_keys_differ_between_installations(tmp_path, key_file):
+    other = str(tmp_path / "other_key")
+
+    assert load_authkey(create=True) != load_authkey(other, create=True)
+
+
+def test_client_without_key_file_fails(key_file):
+    with pytest.raises(FileNotFoundError):
+        connect()
+
+
+@posix_only
+def test_key_file_readable_by_others_is_refused(key_file):
+    load_authkey(create=True)
+    os.chmod(key_file, 0o644)
+
+    with pytest.raises(PermissionError):
+        load_authkey(create=True)
+
+
+def test_short_key_is_refused(monkeypatch, key_file):
+    monkeypatch.setenv(AUTHKEY_VARIABLE, "sync-daemon")
+
+    with pytest.raises(ValueError):
+        load_authkey(create=True)
+    assert not os.path.exists(key_file)
+
+
+def test_configured_key_takes_precedence(monkeypatch, key_file):
+    monkeypatch.setenv(AUTHKEY_VARIABLE, "k" * MIN_AUTHKEY_LENGTH)
+
+    assert load_authkey(create=True) == b"k" * MIN_AUTHKEY_LENGTH
+    assert not os.path.exists(key_file)
+
+
+def test_only_clients_with_the_key_connect(served):
+    daemon = connect(port=served)
+    job = daemon.status(daemon.submit())
+    assert job["triggers"] == 1
+
+    with pytest.raises(AuthenticationError):
+        connect(port=served, authkey=b"sync-daemon")
+
+
+def test_job_runs_through_its_states(gated):
+    daemon, sync = gated
+
+    job_id = daemon.submit()
+    assert sync.started.wait(5)
+    assert daemon.status(job_id)["state"] == RUNNING
+    sync.release.set()
+    job = daemon.wait(job_id, timeout=5)
+
+    assert job["state"] == SUCCEEDED
+    assert job["error"] is None
+    assert job["submitted"] <= job["started"] <= job["finished"]
+    assert job["tables"] == {
+        "sides": {"upserted": 10, "deleted": 2, "rejected": 1}
+    }
+
+
+def test_failed_job_reports_its_error():
+    sync = GatedSync(error="ORA-12170: TNS:Connect timeout occurred")
+    sync.release.set()
+    daemon = SyncDaemon(sync=sync)
+    daemon.start()
+
+    job = daemon.wait(daemon.submit(), timeout=5)
+    with pytest.raises(RuntimeError, match="ORA-12170"):
+        daemon.run_job()
+    daemon.stop()
+
+    assert job["state"] == FAILED
+    assert job["error"] == "ORA-12170: TNS:Connect timeout occurred"
+
+
+def test_triggers_coalesce_into_the_queued_job(gated):
+    daemon, sync = gated
+
+    running = daemon.submit()
+    assert sync.started.wait(5)
+    follow_up = daemon.submit()  # Changes made during the running job
+    assert daemon.submit() == follow_up
+    assert daemon.submit() == follow_up
+
+    assert daemon.status(follow_up)["state"] == QUEUED
+    assert daemon.status(follow_up)["triggers"] == 3
+    sync.release.set()
+    assert daemon.wait(follow_up, timeout=5)["state"] == SUCCEEDED
+    assert daemon.status(running)["triggers"] == 1
+    assert sync.runs == 2
+    assert daemon.submit() not in (running, follow_up)  # Nothing queued
+
+
+def test_old_jobs_are_forgotten():
+    daemon = SyncDaemon(sync=lambda progress: None, history=2)
+    daemon.start()
+    job_ids = [daemon.wait(daemon.submit(), timeout=5)["id"] for _ in "abc"]
+    daemon.stop()
+
+    assert daemon.status(job_ids[0]) is None
+    assert [job["id"] for job in daemon.jobs()] == job_ids[1:]
@@ -0,0 +1,114 @@
+import os
+import re
+import sqlite3
+import sys
+
+import cx_Oracle
+import pytest
+
+try:
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection, local_oracle
+    from sync_layer.row_hash import prepare_sqlite
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_ranges import _Side, compare_table
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection, local_oracle
+    from sync_layer.row_hash import prepare_sqlite
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_ranges import _Side, compare_table
+
+COLUMNS = ["id", "side_name"]
+
+
+class RecordingCursor:
+    """Cursor remembering the binds of each statement."""
+
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, statement, parameters):
+        self.executed.append((statement, parameters))
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return RecordingCursor(self.executed)
+
+
+def bind_names(statement):
+    return re.findall(r"(?<!:):(\w+)", statement)
+
+
+def test_oracle_range_queries_bind_by_name():
+    conn = RecordingConnection()
+    central = _Side(conn, "sides", COLUMNS, oracle=True)
+
+    central.checksums(1, 1025, 16)
+    central.row_hashes(1, 17)
+
+    (range_query, range_binds), (leaf_query, leaf_binds) = conn.executed
+    for query, binds in ((range_query, range_binds), (leaf_query, leaf_binds)):
+        names = bind_names(query)
+        assert all(not name.isdigit() for name in names)  # No positional
+        assert set(names) == set(binds)
+    assert range_binds == {"low": 1, "width": 16, "high": 1025}
+    assert leaf_binds == {"low": 1, "high": 17}
+    # Oracle rejects binds in a GROUP BY expression (ORA-00979)
+    assert bind_names(range_query.split("GROUP BY")[1]) == []
+
+
+def test_stand_in_rejects_repeated_positional_binds(central):
+    conn = local_oracle.connect(central)
+    cursor = conn.cursor()
+
+    with pytest.raises(cx_Oracle.DatabaseError, match="ORA-01008"):
+        cursor.execute(
+            "SELECT FLOOR((id - :1) / :2) FROM sides "
+            "WHERE id >= :1 GROUP BY FLOOR((id - :1) / :2)",
+            (1, 2, 1),
+        )
+    conn.close()
+
+
+def test_compare_table_finds_the_differing_keys(tmp_path, central):
+    local_db = str(tmp_path / "local.db")
+    setup_database(local_db, seed_data=False)
+    conn = sqlite3.connect(local_db)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"Side {i}") for i in range(1, 5001)],
+    )
+    conn.commit()
+    sync_databases(db_path=local_db, parallelism=1)
+
+    conn.execute("INSERT INTO sides (id, side_name) VALUES (7000, 'New')")
+    conn.execute("UPDATE sides SET side_name = 'Renamed' WHERE id = 1234")
+    conn.commit()
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute("DELETE FROM SYSTEM.sides WHERE id = 4321")
+    oracle.commit()
+    cursor.close()
+    prepare_sqlite(conn)
+
+    diff = compare_table(
+        conn, oracle, "sides", COLUMNS, fanout=8, leaf_size=16
+    )
+
+    assert diff.missing == [4321, 7000]
+    assert diff.extra == []
+    assert diff.changed == [1234]
+    oracle.close()
+    conn.close()
@@ -0,0 +1,160 @@
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+
+import pytest
+
+try:
+    from sync_layer import db_connection
+    from sync_layer.benchmark import create_fixture
+    from sync_layer.row_hash import prepare_sqlite, sqlite_row_text
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_sync import (
+        CHANGED,
+        EXTRA,
+        MISSING,
+        REJECTED,
+        verify_sync_stream,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from sync_layer import db_connection
+    from sync_layer.benchmark import create_fixture
+    from sync_layer.row_hash import prepare_sqlite, sqlite_row_text
+    from sync_layer.sync_db import sync_databases
+    from sync_layer.verify_sync import (
+        CHANGED,
+        EXTRA,
+        MISSING,
+        REJECTED,
+        verify_sync_stream,
+    )
+
+
+@pytest.fixture
+def synced(tmp_path, central):
+    """Local DB of 30 sides and 270 questions, synced to the stand-in."""
+    local_db = str(tmp_path / "local.db")
+    create_fixture(local_db, 300)
+    sync_databases(db_path=local_db, parallelism=1)
+    yield local_db
+
+
+def execute_central(*statements):
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    for statement in statements:
+        cursor.execute(statement)
+    oracle.commit()
+    cursor.close()
+    oracle.close()
+
+
+def central_row(query):
+    oracle = db_connection.get_oracle_connection()
+    cursor = oracle.cursor()
+    cursor.execute(query)
+    row = cursor.fetchone()
+    cursor.close()
+    oracle.close()
+    return row
+
+
+def verify(local_db, repair=False):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        summary = verify_sync_stream(local_db, repair=repair)
+    return summary, output.getvalue()
+
+
+def test_repair_restores_parents_before_children(synced):
+    execute_central(
+        "DELETE FROM SYSTEM.questions WHERE side_id = 1",
+        "DELETE FROM SYSTEM.sides WHERE id = 1",
+    )
+    conn = sqlite3.connect(synced)
+    questions = conn.execute(
+        "SELECT COUNT(*) FROM questions WHERE side_id = 1"
+    ).fetchone()[0]
+    conn.close()
+
+    summary, _ = verify(synced, repair=True)
+
+    assert summary["sides"][MISSING] == 1
+    assert summary["questions"][MISSING] == questions
+    assert summary["questions"][REJECTED] == 0
+    summary, _ = verify(synced)
+    assert not any(summary.values())
+
+
+def test_repair_reports_rejected_rows(synced):
+    conn = sqlite3.connect(synced)
+    conn.execute(
+        "INSERT INTO questions (id, side_id, question) "
+        "VALUES (10000, 9999, 'Orphan?')"
+    )
+    conn.commit()
+    conn.close()
+
+    summary, output = verify(synced, repair=True)
+
+    assert summary["questions"][MISSING] == 1
+    assert summary["questions"][REJECTED] == 1
+    assert "not repaired id=10000: ORA-02291" in output
+    assert "0 repaired, 1 rejected" in output
+    summary, _ = verify(synced)
+    assert summary["questions"][MISSING] == 1  # Still missing
+
+
+def test_repaired_rows_carry_their_content_hash(synced):
+    conn = sqlite3.connect(synced)
+    prepare_sqlite(conn)
+    text = sqlite_row_text(["id", "side_name"])
+    hashes = dict(
+        conn.execute(
+            f"SELECT id, sync_content_hash({text}) FROM sides WHERE id < 4"
+        )
+    )
+    conn.close()
+    # Content changed in Oracle behind the sync, its hash left as it was
+    execute_central(
+        "DELETE FROM SYSTEM.sides WHERE id = 3",
+        "UPDATE SYSTEM.sides SET side_name = 'Wrong' WHERE id = 2",
+    )
+    assert central_row("SELECT row_hash FROM SYSTEM.sides WHERE id = 2") == (
+        hashes[2],
+    )
+
+    summary, _ = verify(synced, repair=True)
+
+    assert summary["sides"][CHANGED] == 1
+    assert summary["sides"][MISSING] == 1
+    summary, _ = verify(synced)
+    assert not any(summary.values())
+    assert central_row("SELECT row_hash FROM SYSTEM.sides WHERE id = 3") == (
+        hashes[3],
+    )
+
+
+def test_repair_keeps_rows_only_in_oracle(synced):
+    # E.g. a side and its question synced by another device
+    execute_central(
+        "INSERT INTO SYSTEM.sides (id, side_name) VALUES (5000, 'Other')",
+        "INSERT INTO SYSTEM.questions (id, side_id, question) "
+        "VALUES (5000, 5000, 'Other?')",
+    )
+
+    summary, output = verify(synced, repair=True)
+
+    assert summary["sides"][EXTRA] == 1
+    assert summary["questions"][EXTRA] == 1
+    assert summary["questions"][REJECTED] == 0
+    assert "1 extra, 0 changed rows found, 0 repaired." in output
+    assert central_row(
+        "SELECT COUNT(*) FROM SYSTEM.questions WHERE id = 5000"
+    ) == (1,)
+    assert central_row(
+        "SELECT COUNT(*) FROM SYSTEM.sides WHERE id = 5000"
+    ) == (1,)
@@ -0,0 +1,89 @@
+import os
+import sqlite3
+import sys
+
+try:
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection
+    from sync_layer.sync_db import (
+        get_changelog_seq,
+        get_table_watermark,
+        sync_databases,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    from local_db_layer.setup_db import setup_database
+    from sync_layer import db_connection
+    from sync_layer.sync_db import (
+        get_changelog_seq,
+        get_table_watermark,
+        sync_databases,
+    )
+
+
+def device_db(tmp_path, name, first_id, sides):
+    """Local DB holding ``sides`` sides numbered from ``first_id``."""
+    db_path = str(tmp_path / f"{name}.db")
+    setup_database(db_path, seed_data=False)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO sides (id, side_name) VALUES (?, ?)",
+        [(i, f"{name} {i}") for i in range(first_id, first_id + sides)],
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def watermarks(device_id):
+    oracle = db_connection.get_oracle_connection()
+    marks = {
+        table: get_table_watermark(oracle, device_id, table)
+        for table in ("sides", "questions", "users")
+    }
+    oracle.close()
+    return marks
+
+
+def test_watermarks_are_kept_per_device_and_table(
+    tmp_path, central, monkeypatch
+):
+    first = device_db(tmp_path, "first", 1, 5)
+    second = device_db(tmp_path, "second", 1001, 3)
+
+    monkeypatch.setenv("SYNC_DEVICE_ID", "first")
+    sync_databases(db_path=first, parallelism=1)
+    assert watermarks("first") == {"sides": 5, "questions": 0, "users": 0}
+    assert watermarks("second") == {"sides": 0, "questions": 0, "users": 0}
+
+    monkeypatch.setenv("SYNC_DEVICE_ID", "second")
+    report = sync_databases(db_path=second, parallelism=1)
+
+    # The central table was no longer empty: only this device's changes
+    assert report["tables"]["sides"]["rows"] == 3
+    assert watermarks("second")["sides"] == 3
+    assert watermarks("first")["sides"] == 5
+
+
+def test_watermark_follows_the_acknowledged_changes(
+    tmp_path, central, monkeypatch
+):
+    monkeypatch.setenv("SYNC_DEVICE_ID", "device")
+    local_db = device_db(tmp_path, "device", 1, 5)
+    sync_databases(db_path=local_db, parallelism=1)
+
+    conn = sqlite3.connect(local_db)
+    conn.execute("UPDATE sides SET side_name = 'Renamed' WHERE id = 2")
+    conn.commit()
+    seq = get_changelog_seq(conn, "sides")
+    conn.close()
+    assert seq > watermarks("device")["sides"]
+
+    report = sync_databases(db_path=local_db, parallelism=1)
+    assert report["tables"]["sides"]["rows"] == 1
+    assert watermarks("device")["sides"] == seq
+
+    # Nothing new: the table is skipped and its watermark stays
+    report = sync_databases(db_path=local_db, parallelism=1)
+    assert report["rows"] == 0
+    assert watermarks("device")["sides"] == seq
@@ -0,0 +1,239 @@
+"""
+Range-checksum verification of SQLite against Oracle.
+
+Each table's primary-key space is cut into ranges and both databases
+compute a row count and a checksum per range. Only ranges whose checksums
+differ are split further, down to ranges small enough to compare key by
+key. Matching tables therefore move a few kilobytes of checksums instead
+of their rows, and differing tables yield the exact keys that differ.
+
+Rows are hashed as described in :mod:`sync_layer.row_hash`.
+"""
+
+import collections
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.db_connection import (
+        get_oracle_connection,
+        get_sqlite_connection,
+    )
+    from sync_layer.row_hash import (
+        oracle_row_text,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from core_functionalities.app_logging import get_logger
+    from sync_layer.db_connection import (
+        get_oracle_connection,
+        get_sqlite_connection,
+    )
+    from sync_layer.row_hash import (
+        oracle_row_text,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+
+logger = get_logger(__name__)
+
+# Number of sub-ranges a differing range is split into
+DEFAULT_FANOUT = 64
+
+# Ranges at most this wide are compared key by key
+DEFAULT_LEAF_SIZE = 256
+
+# Keys that differ between SQLite and Oracle for one table
+TableDiff = collections.namedtuple(
+    "TableDiff", ["table", "missing", "extra", "changed"]
+)
+
+
+def _sqlite_hash_expr(columns):
+    return f"sync_checksum({sqlite_row_text(columns)})"
+
+
+def _oracle_hash_expr(columns):
+    return (
+        f"TO_NUMBER(SUBSTR(RAWTOHEX(STANDARD_HASH({oracle_row_text(columns)}, "
+        f"'MD5')), 1, 8), 'XXXXXXXX')"
+    )
+
+
+class _Side:
+    """
+    Range queries against one database.
+
+    SQLite and Oracle differ only in their integer division and hash
+    expression, so both sides share this class. Binds are named, as Oracle
+    binds positional placeholders by occurrence, and the bucket is computed
+    in an inline view because Oracle rejects bind variables in a GROUP BY
+    expression (ORA-00979).
+    """
+
+    def __init__(self, conn, table, columns, oracle):
+        self.conn = conn
+        pk = columns[0]
+        if oracle:
+            hash_expr = _oracle_hash_expr(columns)
+            bucket = f"FLOOR(({pk} - :low) / :width)"
+        else:
+            hash_expr = _sqlite_hash_expr(columns)
+            bucket = f"(({pk} - :low) / :width)"
+
+        self.bounds_query = f"SELECT MIN({pk}), MAX({pk}) FROM {table}"
+        self.range_query = f"""
+            SELECT b, COUNT(*), SUM(h)
+            FROM (
+                SELECT {bucket} AS b, {hash_expr} AS h
+                FROM {table}
+                WHERE {pk} >= :low AND {pk} < :high
+            )
+            GROUP BY b
+        """
+        self.leaf_query = f"""
+            SELECT {pk}, {hash_expr}
+            FROM {table}
+            WHERE {pk} >= :low AND {pk} < :high
+        """
+
+    def bounds(self):
+        cursor = self.conn.cursor()
+        cursor.execute(self.bounds_query)
+        result = cursor.fetchone()
+        cursor.close()
+        return result
+
+    def checksums(self, low, high, width):
+        """Return ``{bucket: (count, checksum)}`` for ``[low, high)``."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            self.range_query, {"low": low, "width": width, "high": high}
+        )
+        result = {
+            int(bucket): (int(count), int(total))
+            for bucket, count, total in cursor.fetchall()
+        }
+        cursor.close()
+        return result
+
+    def row_hashes(self, low, high):
+        """Return ``{key: hash}`` for the rows in ``[low, high)``."""
+        cursor = self.conn.cursor()
+        cursor.execute(self.leaf_query, {"low": low, "high": high})
+        result = {key: int(value) for key, value in cursor.fetchall()}
+        cursor.close()
+        return result
+
+
+def compare_table(
+    sqlite_conn,
+    oracle_conn,
+    table,
+    columns,
+    fanout=DEFAULT_FANOUT,
+    leaf_size=DEFAULT_LEAF_SIZE,
+):
+    """
+    Find the keys that differ between the SQLite and Oracle copies of a
+    table by comparing range checksums and drilling into differing ranges.
+
+    :param sqlite_conn: SQLite connection object, see
+                        :func:`~sync_layer.row_hash.prepare_sqlite`
+    :param oracle_conn: Oracle connection object
+    :param table: Table name
+    :param columns: List of column names, primary key first
+    :param fanout: Number of sub-ranges a differing range is split into
+    :param leaf_size: Width under which ranges are compared key by key
+    :return: :data:`TableDiff` for the table
+    """
+    local = _Side(sqlite_conn, table, columns, oracle=False)
+    central = _Side(oracle_conn, table, columns, oracle=True)
+
+    bounds = [b for b in (local.bounds(), central.bounds()) if b[0] is not None]
+    missing, extra, changed = [], [], []
+    if not bounds:
+        return TableDiff(table, missing, extra, changed)
+
+    pending = [
+        (min(b[0] for b in bounds), max(b[1] for b in bounds) + 1)
+    ]
+    while pending:
+        low, high = pending.pop()
+        if high - low <= leaf_size:
+            local_rows = local.row_hashes(low, high)
+            central_rows = central.row_hashes(low, high)
+            for key, value in local_rows.items():
+                if key not in central_rows:
+                    missing.append(key)
+                elif central_rows[key] != value:
+                    changed.append(key)
+            extra.extend(key for key in central_rows if key not in local_rows)
+            continue
+
+        width = -(-(high - low) // fanout)  # Ceiling division
+        local_sums = local.checksums(low, high, width)
+        central_sums = central.checksums(low, high, width)
+        for bucket in set(local_sums) | set(central_sums):
+            if local_sums.get(bucket) != central_sums.get(bucket):
+                start = low + bucket * width
+                pending.append((start, min(start + width, high)))
+
+    return TableDiff(table, sorted(missing), sorted(extra), sorted(changed))
+
+
+def _compare_table_worker(db_path, table, columns, fanout, leaf_size):
+    """
+    Compare one table on connections owned by a worker process.
+    """
+    sqlite_conn = get_sqlite_connection(db_path)
+    prepare_sqlite(sqlite_conn)
+    oracle_conn = get_oracle_connection()
+    try:
+        return compare_table(
+            sqlite_conn, oracle_conn, table, columns, fanout, leaf_size
+        )
+    finally:
+        sqlite_conn.close()
+        oracle_conn.close()
+
+
+def verify_tables(
+    tables,
+    db_path=None,
+    max_workers=None,
+    fanout=DEFAULT_FANOUT,
+    leaf_size=DEFAULT_LEAF_SIZE,
+):
+    """
+    Compare several tables in parallel, one worker process per table.
+
+    :param tables: Dict mapping table names to columns, primary key first
+    :param db_path: Path to the SQLite database file
+    :param max_workers: Maximum number of worker processes
+    :param fanout: Number of sub-ranges a differing range is split into
+    :param leaf_size: Width under which ranges are compared key by key
+    :return: List of :data:`TableDiff`, one per table
+    """
+    # Spawned workers do not inherit the parent's Oracle sessions
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=context
+    ) as executor:
+        futures = [
+            executor.submit(
+                _compare_table_worker,
+                db_path,
+                table,
+                columns,
+                fanout,
+                leaf_size,
+            )
+            for table, columns in tables.items()
+        ]
+        return [future.result() for future in futures]
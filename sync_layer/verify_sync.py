@@ -1,4 +1,5 @@
-import datetime
+import argparse
+import collections
 import os
 import sys
 
@@ -11,6 +12,19 @@ try:
         get_oracle_connection,
         get_sqlite_connection,
     )
+    from sync_layer.parallel_sync import dependency_order
+    from sync_layer.row_hash import (
+        ROW_HASH_COLUMN,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+    from sync_layer.schema_catalog import cached_statement, get_catalog
+    from sync_layer.sync_db import (
+        DEFAULT_BATCH_SIZE,
+        ChangeBatch,
+        apply_changes_to_oracle,
+    )
+    from sync_layer.verify_ranges import verify_tables
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     from core_functionalities.app_logging import get_logger
@@ -18,9 +32,57 @@ except ModuleNotFoundError:
         get_oracle_connection,
         get_sqlite_connection,
     )
+    from sync_layer.parallel_sync import dependency_order
+    from sync_layer.row_hash import (
+        ROW_HASH_COLUMN,
+        prepare_sqlite,
+        sqlite_row_text,
+    )
+    from sync_layer.schema_catalog import cached_statement, get_catalog
+    from sync_layer.sync_db import (
+        DEFAULT_BATCH_SIZE,
+        ChangeBatch,
+        apply_changes_to_oracle,
+    )
+    from sync_layer.verify_ranges import verify_tables
 
 logger = get_logger(__name__)
 
+# Rows fetched per round trip by the streaming diff
+FETCH_ARRAY_SIZE = 5000
+
+# Kinds of differences reported by the streaming diff
+MISSING = "missing"  # Row only in SQLite
+EXTRA = "extra"  # Row only in Oracle
+CHANGED = "changed"  # Row in both with different values
+REJECTED = "rejected"  # Differing row Oracle refused to repair
+
+# One differing row; ``row`` holds the SQLite values (followed by the
+# content hash when repairing a hashed table), or the Oracle values for
+# an extra row
+RowDiff = collections.namedtuple("RowDiff", ["kind", "key", "row"])
+
+
+def _select_query(table, columns):
+    return cached_statement(
+        "select",
+        table,
+        columns,
+        lambda: f"SELECT {', '.join(columns)} FROM {table} "
+        f"ORDER BY {columns[0]}",
+    )
+
+
+def _hashed_select_query(table, columns):
+    return cached_statement(
+        "select_hashed",
+        table,
+        columns,
+        lambda: f"SELECT {', '.join(columns)}, "
+        f"sync_content_hash({sqlite_row_text(columns)}) FROM {table} "
+        f"ORDER BY {columns[0]}",
+    )
+
 
 def verify_sync():
     """
@@ -45,20 +107,18 @@ def verify_sync():
         print("Error connecting to SQLite DB:", e)
         return
 
-    # Define tables to verify
-    tables = {
-        "sides": ["id", "side_name"],
-        "questions": ["id", "side_id", "question"],
-        "users": ["id", "username", "password"],
-    }
+    # Tables to verify, shared with the sync
+    tables = get_catalog(sqlite_conn, oracle_conn).tables
 
     for table, columns in tables.items():
+        query = _select_query(table, columns)
+
         # Fetch from SQLite
-        sqlite_cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        sqlite_cursor.execute(query)
         sqlite_records = sqlite_cursor.fetchall()
 
         # Fetch from Oracle
-        oracle_cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        oracle_cursor.execute(query)
         oracle_records = oracle_cursor.fetchall()
 
         # Compare
@@ -80,5 +140,235 @@ def verify_sync():
     print("Verification completed.")
 
 
+def iter_rows(cursor, query, arraysize=FETCH_ARRAY_SIZE):
+    """
+    Execute a query and yield its rows, fetching ``arraysize`` rows per
+    round trip.
+
+    :param cursor: SQLite or Oracle cursor object
+    :param query: SELECT statement
+    :param arraysize: Number of rows fetched per round trip
+    :return: Generator of row tuples
+    """
+    cursor.arraysize = arraysize
+    cursor.execute(query)
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            return
+        yield from rows
+
+
+def _normalise(row):
+    # Oracle stores empty strings as NULL
+    return tuple(None if value == "" else value for value in row)
+
+
+def diff_sorted(local_rows, central_rows, width=None):
+    """
+    Merge-join two row streams ordered by primary key and yield the rows
+    that differ. Only the current row of each stream is held in memory.
+
+    :param local_rows: Iterable of SQLite rows, primary key first
+    :param central_rows: Iterable of Oracle rows, primary key first
+    :param width: Number of leading values compared; values after them
+                  (e.g. a content hash) are only carried along
+    :return: Generator of :data:`RowDiff` tuples in primary key order
+    """
+    local_rows = iter(local_rows)
+    central_rows = iter(central_rows)
+    local = next(local_rows, None)
+    central = next(central_rows, None)
+    while local is not None or central is not None:
+        if central is None or (local is not None and local[0] < central[0]):
+            yield RowDiff(MISSING, local[0], local)
+            local = next(local_rows, None)
+        elif local is None or central[0] < local[0]:
+            yield RowDiff(EXTRA, central[0], central)
+            central = next(central_rows, None)
+        else:
+            if _normalise(local[:width]) != _normalise(central[:width]):
+                yield RowDiff(CHANGED, local[0], local)
+            local = next(local_rows, None)
+            central = next(central_rows, None)
+
+
+def repair_batches(diffs, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Turn differing rows into change batches for the sync path: rows
+    missing or changed in Oracle are upserted. Extra rows are left alone,
+    as they are typically rows synced by other devices.
+
+    :param diffs: Iterable of :data:`RowDiff` tuples
+    :param batch_size: Number of rows per batch
+    :return: Generator of :data:`~sync_layer.sync_db.ChangeBatch` tuples
+    """
+    upserts = []
+    for diff in diffs:
+        if diff.kind == EXTRA:
+            continue
+        upserts.append(diff.row)
+        if len(upserts) >= batch_size:
+            yield ChangeBatch(upserts, [], None)
+            upserts = []
+    if upserts:
+        yield ChangeBatch(upserts, [], None)
+
+
+def verify_sync_stream(
+    db_path=None, repair=False, batch_size=DEFAULT_BATCH_SIZE
+):
+    """
+    Verify the sync with a streaming merge-join of both copies of every
+    table, printing each differing row. Memory use does not depend on the
+    table size.
+
+    With ``repair``, the rows missing or changed in Oracle are pushed back
+    through the sync path as they are found, without touching the sync
+    watermarks. Rows only in Oracle are reported, never deleted. Tables
+    are repaired in foreign-key order, rows of hashed tables are sent with
+    their content hash, and rows Oracle rejects are reported (and counted
+    as :data:`REJECTED`) rather than repaired.
+
+    :param db_path: Path to the SQLite database file
+    :param repair: Write the differing rows to Oracle
+    :param batch_size: Number of rows bound per repair round trip
+    :return: Dict mapping table names to counters of difference kinds
+    """
+    sqlite_conn = get_sqlite_connection(db_path)
+    oracle_conn = get_oracle_connection()
+    summary = {}
+    try:
+        catalog = get_catalog(sqlite_conn, oracle_conn)
+        if repair:
+            prepare_sqlite(sqlite_conn)
+        for table in dependency_order(catalog.dependencies):
+            columns = catalog.tables[table]
+            hashed = repair and table in catalog.hashed
+            counts = collections.Counter()
+
+            def report(diffs):
+                for diff in diffs:
+                    counts[diff.kind] += 1
+                    print(f"{table}: {diff.kind} {columns[0]}={diff.key}")
+                    yield diff
+
+            query = _select_query(table, columns)
+            local_query = query
+            if hashed:
+                local_query = _hashed_select_query(table, columns)
+            sqlite_cursor = sqlite_conn.cursor()
+            oracle_cursor = oracle_conn.cursor()
+            diffs = report(
+                diff_sorted(
+                    iter_rows(sqlite_cursor, local_query),
+                    iter_rows(oracle_cursor, query),
+                    width=len(columns),
+                )
+            )
+            try:
+                if repair:
+                    result = apply_changes_to_oracle(
+                        oracle_conn,
+                        table,
+                        columns + [ROW_HASH_COLUMN] if hashed else columns,
+                        repair_batches(diffs, batch_size),
+                        batch_size=batch_size,
+                        overwrite=True,
+                    )
+                    for key, message in result.failures:
+                        print(
+                            f"{table}: not repaired {columns[0]}={key}: "
+                            f"{message}"
+                        )
+                    if result.failures:
+                        counts[REJECTED] = len(result.failures)
+                else:
+                    collections.deque(diffs, maxlen=0)  # Consume
+            finally:
+                sqlite_cursor.close()
+                oracle_cursor.close()
+
+            if counts:
+                found = (
+                    f"{counts[MISSING]} missing, {counts[EXTRA]} extra, "
+                    f"{counts[CHANGED]} changed rows found"
+                )
+                if repair:
+                    repaired = (
+                        counts[MISSING] + counts[CHANGED] - counts[REJECTED]
+                    )
+                    found += f", {repaired} repaired"
+                    if counts[REJECTED]:
+                        found += f", {counts[REJECTED]} rejected"
+                print(f"Table '{table}' synchronization mismatch: {found}.")
+            else:
+                print(f"Table '{table}' is synchronized correctly.")
+            summary[table] = counts
+    finally:
+        oracle_conn.close()
+        sqlite_conn.close()
+    print("Verification completed.")
+    return summary
+
+
+def verify_sync_ranges(db_path=None, max_workers=None):
+    """
+    Verify the sync by comparing range checksums, one worker process per
+    table, and report the keys that differ.
+
+    :param db_path: Path to the SQLite database file
+    :param max_workers: Maximum number of worker processes
+    :return: List of :data:`~sync_layer.verify_ranges.TableDiff`
+    """
+    sqlite_conn = get_sqlite_connection(db_path)
+    oracle_conn = get_oracle_connection()
+    try:
+        tables = get_catalog(sqlite_conn, oracle_conn).tables
+    finally:
+        oracle_conn.close()
+        sqlite_conn.close()
+
+    diffs = verify_tables(tables, db_path=db_path, max_workers=max_workers)
+    for diff in diffs:
+        if not (diff.missing or diff.extra or diff.changed):
+            print(f"Table '{diff.table}' is synchronized correctly.")
+            continue
+        print(f"Table '{diff.table}' synchronization mismatch.")
+        print(f"Missing in Oracle: {diff.missing}")
+        print(f"Only in Oracle: {diff.extra}")
+        print(f"Changed: {diff.changed}")
+    print("Verification completed.")
+    return diffs
+
+
 if __name__ == "__main__":
-    verify_sync()
+    parser = argparse.ArgumentParser(description="Verify the Oracle sync.")
+    parser.add_argument(
+        "--mode",
+        choices=["ranges", "stream", "full"],
+        default="ranges",
+        help="Compare range checksums (default), merge-join both copies "
+        "row by row, or load both copies.",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="With --mode stream, write the rows missing or changed in "
+        "Oracle; rows only in Oracle are reported, not deleted.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for range comparison.",
+    )
+    args = parser.parse_args()
+    if args.repair and args.mode != "stream":
+        parser.error("--repair requires --mode stream")
+    if args.mode == "stream":
+        verify_sync_stream(repair=args.repair)
+    elif args.mode == "ranges":
+        verify_sync_ranges(max_workers=args.workers)
+    else:
+        verify_sync()